@@ -0,0 +1,202 @@
+"""
+Benchmark cases for the gate hot path.
+
+Each case is a (name, factory) pair. The factory performs the setup
+(scenario files, ledgers) and returns the zero-argument callable to time,
+so deselected cases cost nothing.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Tuple
+
+from benchmarks.synthetic import make_ledger, make_scenario, write_scenario
+
+Case = Tuple[str, Callable[[], Callable[[], Any]]]
+
+
+def core_cases() -> Iterator[Case]:
+    from epgs.core.crypto import canonical_json, chained_hash
+    from epgs.orchestrator.replay import GENESIS_HASH
+
+    payload = {
+        "scenario": "S-STABLE-SAFE",
+        "run_id": "00000000-0000-4000-8000-000000000000",
+        "rblock_id": "00000000-0000-4000-8000-000000000001",
+        "permission": "ALLOW",
+        "stop_issued": False,
+        "terminal_stop": False,
+        "final_state": "EXECUTED",
+        "neuropause": {"enabled": False, "tau_ms_observed": 0},
+    }
+
+    yield "crypto.canonical_json", lambda: lambda: canonical_json(payload)
+    yield "crypto.chained_hash", lambda: lambda: chained_hash(payload, GENESIS_HASH)
+
+
+def metrics_cases() -> Iterator[Case]:
+    from epgs.core.metrics import Counter, Histogram, stage_clock
+
+    # Private instruments shaped like the gate's: five stage marks, the
+    # total, and two counter updates is what one instrumented decision costs.
+    stages = Histogram("bench_stage_seconds", "", ("stage",))
+    marks = [stages.labels(s) for s in ("load", "profile", "ledger_reset", "hash", "ledger_write")]
+    total = stages.labels("total")
+    decisions = Counter("bench_decisions_total", "", ("permission", "final_state"))
+    written = Counter("bench_ledger_bytes_written_total", "")
+
+    def decision():
+        clock = stage_clock()
+        for child in marks:
+            clock.mark(child)
+        written.inc(amount=400)
+        clock.total(total)
+        decisions.inc("ALLOW", "EXECUTED")
+
+    yield "metrics.decision_overhead", lambda: decision
+
+
+def module_cases(steps: List[int]) -> Iterator[Case]:
+    from epgs.modules.aegixa import precheck
+    from epgs.modules.neuropause import evaluate_temporal
+    from epgs.modules.ube import classify
+    from epgs.profiles.base import BaseProfile
+    from epgs.scenarios.schema import Scenario
+
+    profile = BaseProfile()
+
+    def temporal(n: int):
+        s = Scenario.model_validate(make_scenario(n, seed=n))
+        return lambda: evaluate_temporal(s.temporal)
+
+    for n in steps:
+        yield f"neuropause.evaluate_temporal[{n}]", lambda n=n: temporal(n)
+
+    s = Scenario.model_validate(make_scenario(1))
+    vector = s.ube_vectors[0]
+    np_out = evaluate_temporal(s.temporal)
+    ube_out = classify(vector, profile)
+
+    yield "ube.classify", lambda: lambda: classify(vector, profile)
+    yield "aegixa.precheck", lambda: lambda: precheck(np_out, ube_out)
+
+
+def load_cases(workdir: Path, steps: List[int]) -> Iterator[Case]:
+    from epgs.scenarios.load import content_hash, load_trusted, validate_scenario
+    from epgs.scenarios.schema import Scenario
+
+    def full(n: int):
+        raw = write_scenario(workdir / f"load-{n}.json", n, seed=n).read_bytes()
+        return lambda: Scenario.model_validate_json(raw)
+
+    def cached(n: int):
+        raw = write_scenario(workdir / f"load-{n}.json", n, seed=n).read_bytes()
+        validate_scenario(raw)
+        return lambda: validate_scenario(raw)
+
+    def trusted(n: int):
+        path = write_scenario(workdir / f"load-{n}.json", n, seed=n)
+        sha = content_hash(path.read_bytes())
+        load_trusted(path, sha)
+        return lambda: load_trusted(path, sha)
+
+    for n in steps:
+        yield f"scenarios.validate_full[{n}]", lambda n=n: full(n)
+        yield f"scenarios.validate_cached[{n}]", lambda n=n: cached(n)
+        yield f"scenarios.load_trusted[{n}]", lambda n=n: trusted(n)
+
+
+def columnar_cases(workdir: Path, steps: List[int]) -> Iterator[Case]:
+    from epgs.modules.neuropause import evaluate_temporal, evaluate_temporal_columns
+    from epgs.scenarios.columnar import open_columnar, write_columnar
+    from epgs.scenarios.schema import Scenario
+
+    def json_path(n: int):
+        raw = write_scenario(workdir / f"columnar-{n}.json", n, seed=n).read_bytes()
+        return lambda: evaluate_temporal(Scenario.model_validate_json(raw).temporal)
+
+    def columnar_path(n: int):
+        path = write_columnar(make_scenario(n, seed=n), workdir / f"columnar-{n}.epgsc")
+
+        def fn():
+            with open_columnar(path) as cs:
+                return evaluate_temporal_columns(*cs.temporal)
+
+        return fn
+
+    for n in steps:
+        yield f"columnar.json_temporal[{n}]", lambda n=n: json_path(n)
+        yield f"columnar.mmap_temporal[{n}]", lambda n=n: columnar_path(n)
+
+
+def run_cases(workdir: Path, steps: List[int]) -> Iterator[Case]:
+    from epgs.orchestrator.decision import DecisionCache
+    from epgs.orchestrator.run import run_scenario
+
+    def run(n: int):
+        path = str(write_scenario(workdir / f"scenario-{n}.json", n, seed=n))
+        out = str(workdir / f"run-{n}")
+        return lambda: run_scenario(path, out)
+
+    def cached(n: int):
+        path = str(write_scenario(workdir / f"scenario-{n}.json", n, seed=n))
+        out = str(workdir / f"run-cached-{n}")
+        cache = DecisionCache()
+        return lambda: run_scenario(path, out, decision_cache=cache)
+
+    for n in steps:
+        yield f"orchestrator.run_scenario[{n}]", lambda n=n: run(n)
+        yield f"orchestrator.run_scenario_cached[{n}]", lambda n=n: cached(n)
+
+
+def verify_cases(workdir: Path, sizes: List[int]) -> Iterator[Case]:
+    from epgs.orchestrator.replay import verify_chain
+
+    def verify(n: int):
+        ledger = workdir / f"ledger-{n}"
+        make_ledger(ledger, n)
+        return lambda: verify_chain(str(ledger))
+
+    for n in sizes:
+        yield f"replay.verify_chain[{n}]", lambda n=n: verify(n)
+
+
+def api_cases(workdir: Path, steps: List[int]) -> Iterator[Case]:
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError:  # httpx missing: API cases are skipped
+        return
+
+    from epgs.main import app
+
+    client = TestClient(app)
+
+    def body(n: int) -> dict:
+        path = write_scenario(workdir / f"api-scenario-{n}.json", n, seed=n)
+        return {"scenario_path": str(path), "output_root": str(workdir / f"api-run-{n}")}
+
+    def run(n: int):
+        b = body(n)
+        return lambda: client.post("/run", json=b)
+
+    def verify(n: int):
+        b = body(n)
+        client.post("/run", json=b)
+        params = {"ledger_dir": str(Path(b["output_root"]) / "ledger")}
+        return lambda: client.get("/verify", params=params)
+
+    for n in steps:
+        yield f"api.run[{n}]", lambda n=n: run(n)
+        yield f"api.verify[{n}]", lambda n=n: verify(n)
+
+
+def collect(workdir: Path, steps: List[int], verify_sizes: List[int]) -> Iterator[Case]:
+    yield from core_cases()
+    yield from metrics_cases()
+    yield from module_cases(steps)
+    yield from load_cases(workdir, steps)
+    yield from columnar_cases(workdir, steps)
+    yield from run_cases(workdir, steps)
+    yield from verify_cases(workdir, verify_sizes)
+    yield from api_cases(workdir, steps)
@@ -0,0 +1,188 @@
+"""
+Closed-loop load generator: gate latency over HTTP versus the Unix socket.
+
+    python -m benchmarks.gate_latency --requests 2000 --concurrency 4
+
+Starts ``epgs serve`` and ``epgs daemon`` as subprocesses, drives the same
+``run`` call through each (keep-alive HTTP connection per worker versus a
+pooled ``GateClient``) and reports p50/p99 per transport. Each worker
+writes to its own output root so runs never race on a ledger.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from epgs.daemon.client import GateClient
+
+SCENARIO = "src/epgs/scenarios/S-STABLE-SAFE.json"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait(probe: Callable[[], None], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            probe()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _spawn(*args: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "epgs.cli", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def percentiles(samples_ns: List[int]) -> Dict[str, float]:
+    s = sorted(samples_ns)
+    n = len(s)
+
+    def pct(q: float) -> float:
+        return s[min(n - 1, int(q * n))] / 1000.0
+
+    return {
+        "requests": n,
+        "p50_us": pct(0.50),
+        "p90_us": pct(0.90),
+        "p99_us": pct(0.99),
+        "max_us": s[-1] / 1000.0,
+        "mean_us": sum(s) / n / 1000.0,
+    }
+
+
+def drive(
+    make_call: Callable[[int], Callable[[], None]],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict[str, float]:
+    """
+    Run ``requests`` calls split over ``concurrency`` closed-loop workers.
+    ``make_call(worker)`` returns that worker's zero-argument call.
+    """
+    per_worker = max(1, requests // concurrency)
+    results: List[List[int]] = [[] for _ in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker(k: int) -> None:
+        call = make_call(k)
+        for _ in range(warmup):
+            call()
+        barrier.wait()
+        out = results[k]
+        clock = time.perf_counter_ns
+        for _ in range(per_worker):
+            t0 = clock()
+            call()
+            out.append(clock() - t0)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    stats = percentiles([x for r in results for x in r])
+    stats["throughput_rps"] = stats["requests"] / elapsed
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Gate latency: HTTP vs Unix socket")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--scenario", default=SCENARIO)
+    parser.add_argument("--out", help="Write results JSON here")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="epgs-latency-"))
+    sock_path = str(tmp / "gate.sock")
+    port = _free_port()
+    procs = [
+        _spawn("serve", "--port", str(port)),
+        _spawn("daemon", "--socket", sock_path),
+    ]
+    results = {}
+    try:
+        def http_probe() -> None:
+            c = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            c.request("GET", "/metrics")
+            c.getresponse().read()
+            c.close()
+
+        _wait(http_probe)
+        gate = GateClient(sock_path, max_idle=args.concurrency)
+        _wait(gate.ping)
+
+        def http_call(k: int) -> Callable[[], None]:
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            body = json.dumps({
+                "scenario_path": args.scenario,
+                "output_root": str(tmp / f"http{k}"),
+            })
+            headers = {"Content-Type": "application/json"}
+
+            def call() -> None:
+                conn.request("POST", "/run", body, headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    raise RuntimeError(f"HTTP {resp.status}")
+
+            return call
+
+        def socket_call(k: int) -> Callable[[], None]:
+            out = str(tmp / f"sock{k}")
+            return lambda: gate.run(args.scenario, out)
+
+        for name, make_call in (("http", http_call), ("unix_socket", socket_call)):
+            results[name] = drive(make_call, args.requests, args.concurrency, args.warmup)
+            r = results[name]
+            print(
+                f"{name:<12} p50 {r['p50_us']:>9.1f} us   p99 {r['p99_us']:>9.1f} us   "
+                f"{r['throughput_rps']:>8.0f} req/s"
+            )
+        gate.close()
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    results["speedup_p50"] = results["http"]["p50_us"] / results["unix_socket"]["p50_us"]
+    results["speedup_p99"] = results["http"]["p99_us"] / results["unix_socket"]["p99_us"]
+    print(f"speedup      p50 x{results['speedup_p50']:.2f}   p99 x{results['speedup_p99']:.2f}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Timing, result storage and baseline comparison for the benchmark suite.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5) -> Dict[str, Any]:
+    """
+    Time ``fn`` with timeit: autorange picks a loop count worth ~0.2s,
+    then ``repeat`` samples are taken. Reported figures are per call.
+    """
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    samples = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "median_us": statistics.median(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+        "stdev_us": (statistics.stdev(samples) if len(samples) > 1 else 0.0) * 1e6,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def save(path: Path, results: Dict[str, Dict[str, Any]]) -> None:
+    path.write_text(
+        json.dumps({"env": environment(), "results": results}, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+
+
+def load(path: Path) -> Dict[str, Dict[str, Any]]:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    Compare median per-call times. A case regresses when it is slower than
+    its baseline by more than ``threshold`` (0.10 == 10%).
+    """
+    rows = []
+    for name, res in current.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append({"name": name, "status": "new", "current_us": res["median_us"]})
+            continue
+
+        ratio = res["median_us"] / base["median_us"] if base["median_us"] else float("inf")
+        rows.append({
+            "name": name,
+            "status": "regressed" if ratio > 1.0 + threshold else "ok",
+            "baseline_us": base["median_us"],
+            "current_us": res["median_us"],
+            "ratio": ratio,
+        })
+    return rows
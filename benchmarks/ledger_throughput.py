@@ -0,0 +1,67 @@
+"""
+Append throughput of a sharded ledger as the shard count grows.
+
+    python -m benchmarks.ledger_throughput --writers 4 --blocks 2000 --shards 1,4,8
+
+Each writer is a separate process appending R-Blocks with ``run_id``
+routing; with one shard every append serialises on the same lock, with
+more shards writers mostly hold different locks. Throughput only scales
+with shards when there are cores (and disk) for the writers to use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from epgs.ledger.sharded import ShardedLedger, verify_sharded
+
+
+def _sizes(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _writer(root: str, shards: int, worker: int, blocks: int) -> None:
+    ledger = ShardedLedger(root, shards=shards, key="run_id")
+    for i in range(blocks):
+        ledger.append(
+            {
+                "scenario": "S-STABLE-SAFE",
+                "run_id": f"w{worker}-{i}",
+                "permission": "ALLOW",
+                "final_state": "EXECUTED",
+            }
+        )
+
+
+def measure(shards: int, writers: int, blocks: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        ShardedLedger(tmp, shards=shards, key="run_id")
+        with ProcessPoolExecutor(max_workers=writers) as pool:
+            start = time.perf_counter()
+            args = ([tmp] * writers, [shards] * writers, range(writers), [blocks] * writers)
+            list(pool.map(_writer, *args))
+            elapsed = time.perf_counter() - start
+        ShardedLedger(tmp, shards=shards, key="run_id").seal_epoch()
+        assert verify_sharded(tmp)["ok"]
+    return writers * blocks / elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--blocks", type=int, default=2000, help="Appends per writer")
+    parser.add_argument("--shards", type=_sizes, default=[1, 4, 8])
+    args = parser.parse_args(argv)
+
+    for n in args.shards:
+        rate = measure(n, args.writers, args.blocks)
+        print(f"shards={n:<4d} writers={args.writers:<3d} {rate:10.0f} blocks/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
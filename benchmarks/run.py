@@ -0,0 +1,68 @@
+"""
+Gate hot-path benchmarks.
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --out new.json --compare bench.json --threshold 0.10
+
+Exits non-zero when ``--compare`` finds a case slower than its baseline by
+more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.cases import collect
+from benchmarks.harness import compare, load, measure, save
+
+
+def _sizes(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="EPGS gate benchmarks")
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--steps", type=_sizes, default=[3, 1000], help="Synthetic trace lengths")
+    parser.add_argument("--verify-sizes", type=_sizes, default=[1, 1000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Run only cases whose name contains this")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="epgs-bench-") as tmp:
+        for name, factory in collect(Path(tmp), args.steps, args.verify_sizes):
+            if args.only and args.only not in name:
+                continue
+            res = measure(factory(), repeat=args.repeat)
+            results[name] = res
+            print(f"{name:<40} {res['median_us']:>14.2f} us  (+/- {res['stdev_us']:.2f})")
+
+    if args.out:
+        save(Path(args.out), results)
+
+    if not args.compare:
+        return 0
+
+    rows = compare(results, load(Path(args.compare)), args.threshold)
+    print("-" * 80)
+    for row in rows:
+        if row["status"] == "new":
+            print(f"{row['name']:<40} NEW")
+        else:
+            print(f"{row['name']:<40} x{row['ratio']:.2f}  {row['status'].upper()}")
+
+    regressed = [r for r in rows if r["status"] == "regressed"]
+    if regressed:
+        print(f"{len(regressed)} regression(s) past {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
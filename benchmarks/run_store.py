@@ -0,0 +1,87 @@
+"""
+Page latency of the run-result store as it grows.
+
+    python -m benchmarks.run_store --rows 1000000 --pages 200
+
+Fills a store with synthetic runs (10% BLOCK, 50 scenarios, 4 sectors)
+and times /runs-style queries: the newest page, filtered pages walked
+by cursor, and a time window.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from epgs.ledger.runs import RunStore
+
+SECTORS = ("AEROSPACE_DEFENSE", "ENERGY", "MOBILITY", "ROBOTICS")
+
+
+def _records(start: int, n: int):
+    for i in range(start, start + n):
+        block = i % 10 == 0
+        yield (
+            {
+                "run_id": f"RUN-{i}",
+                "rblock_id": f"RB-{i}",
+                "permission": "BLOCK" if block else "ALLOW",
+                "final_state": "TERMINATED" if block else "EXECUTED",
+                "execution_hash": f"{i:064x}",
+            },
+            f"S-{i % 50}",
+            SECTORS[i % 4],
+        )
+
+
+def _walk(store: RunStore, pages: int, **kw) -> list:
+    times, cursor = [], None
+    for _ in range(pages):
+        t0 = time.perf_counter()
+        page = store.query(cursor=cursor, **kw)
+        times.append((time.perf_counter() - t0) * 1000)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    return times
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = iter(range(10**12))
+        store = RunStore(Path(tmp) / "runs.sqlite3", clock=lambda: float(next(clock)))
+        t0 = time.perf_counter()
+        for start in range(0, args.rows, 100_000):
+            store.append_many(_records(start, min(100_000, args.rows - start)))
+        print(f"filled {args.rows} rows in {time.perf_counter() - t0:.1f}s")
+
+        cases = {
+            "newest": {},
+            "permission=BLOCK": {"permission": "BLOCK"},
+            "scenario=S-7": {"scenario": "S-7"},
+            "sector+final_state": {
+                "sector_label": "AEROSPACE_DEFENSE",
+                "final_state": "TERMINATED",
+            },
+            "last 10% of time": {"since": args.rows * 0.9},
+        }
+        for name, kw in cases.items():
+            ms = _walk(store, args.pages, limit=args.limit, **kw)
+            print(
+                f"{name:<22s} pages={len(ms):<5d} "
+                f"p50={statistics.median(ms):7.3f}ms max={max(ms):7.3f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""
+Synthetic inputs of configurable size for the benchmark suite.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from epgs.core.crypto import chained_hash
+from epgs.orchestrator.replay import GENESIS_HASH
+from epgs.scenarios.generate import GeneratorConfig
+from epgs.scenarios.generate import make_scenario as generate_one
+
+
+def make_scenario(steps: int, seed: int = 0) -> Dict[str, Any]:
+    return generate_one(GeneratorConfig(seed=seed, steps=steps), 0)
+
+
+def write_scenario(path: Path, steps: int, seed: int = 0) -> Path:
+    path.write_text(json.dumps(make_scenario(steps, seed)), encoding="utf-8")
+    return path
+
+
+def make_ledger(ledger_dir: Path, blocks: int) -> str:
+    """
+    Write a valid chain of ``blocks`` R-Blocks whose file names sort in
+    chain order. Returns the final hash.
+    """
+    ledger_dir.mkdir(parents=True, exist_ok=True)
+    prev = GENESIS_HASH
+
+    for i in range(blocks):
+        rblock_id = f"{i:08x}-0000-4000-8000-000000000000"
+        payload = {
+            "scenario": "S-STABLE-SAFE",
+            "run_id": rblock_id,
+            "rblock_id": rblock_id,
+            "permission": "ALLOW",
+            "stop_issued": False,
+            "terminal_stop": False,
+            "final_state": "EXECUTED",
+            "neuropause": {"enabled": False, "tau_ms_observed": 0},
+        }
+        h = chained_hash(payload, prev)
+        (ledger_dir / f"{rblock_id}.json").write_text(
+            json.dumps(
+                {**payload, "previous_hash": prev, "rblock_hash": h},
+                sort_keys=True,
+                separators=(",", ":"),
+                ensure_ascii=True,
+            ),
+            encoding="utf-8",
+        )
+        prev = h
+
+    return prev
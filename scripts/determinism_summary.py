@@ -1,96 +1,71 @@
 #!/usr/bin/env python3
 
 import argparse
+import json
 import sys
 from pathlib import Path
-import uuid
 
-from epgs.orchestrator.run import run_scenario
-
-
-def run_once(scenario_path: Path, base_out: Path, run_id: str):
-    """
-    Run a scenario once with full isolation by output directory.
-    """
-    out_dir = base_out / run_id
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    result = run_scenario(
-        scenario_path=scenario_path,
-        output_root=str(out_dir),
-    )
-
-    return result
-
-
-def extract_hash(result):
-    """
-    Normalize hash extraction across implementations.
-    """
-    if isinstance(result, dict):
-        return (
-            result.get("rblock_hash")
-            or result.get("hash")
-            or result.get("final_hash")
-        )
-    return None
+from epgs.orchestrator.determinism import prove, to_junit
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--out", required=True)
+    parser.add_argument("--scenarios", default="src/epgs/scenarios")
+    parser.add_argument(
+        "--repeats", type=int, default=2, help="Runs per scenario in the process pool"
+    )
+    parser.add_argument(
+        "--interpreters", type=int, default=1, help="Runs per scenario in fresh interpreters"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", help="Write the JSON report here")
+    parser.add_argument("--junit", help="Write a JUnit XML report here")
     args = parser.parse_args()
 
     base_out = Path(args.out).resolve()
     base_out.mkdir(parents=True, exist_ok=True)
 
-    scenarios_dir = Path("src/epgs/scenarios")
+    scenarios_dir = Path(args.scenarios)
     scenarios = sorted(scenarios_dir.glob("*.json"))
 
     if not scenarios:
         print("No scenarios found.")
         return 0
 
+    report = prove(
+        scenarios,
+        base_out,
+        repeats=args.repeats,
+        interpreters=args.interpreters,
+        workers=args.workers,
+    )
+
     print("\n=== Determinism Proof Summary (UGS-2027 EPGS) ===")
     print("Format:")
-    print("[#] SCENARIO | HASH_RUN1 | HASH_RUN2 | MATCH")
+    print("[#] SCENARIO | REFERENCE_HASH | RUNS | MATCH")
     print("-" * 80)
 
-    ok = True
-
-    for i, scenario in enumerate(scenarios, 1):
-        name = scenario.stem
-
-        # Stable seed for deterministic paths
-        seed = uuid.UUID("12345678-1234-5678-1234-567812345678")
-
-        r1 = run_once(
-            scenario,
-            base_out,
-            f"{name}_run1_{seed.hex[:8]}",
-        )
-
-        r2 = run_once(
-            scenario,
-            base_out,
-            f"{name}_run2_{seed.hex[:8]}",
-        )
-
-        h1 = extract_hash(r1)
-        h2 = extract_hash(r2)
-
-        match = h1 == h2
-        ok = ok and match
-
+    for i, s in enumerate(report["scenarios"], 1):
         print(
-            f"[{i}] {name} | "
-            f"{str(h1)[:12]} | {str(h2)[:12]} | "
-            f"{'OK' if match else 'FAIL'}"
+            f"[{i}] {s['scenario']} | "
+            f"{str(s['reference_hash'])[:12]} | {len(s['runs'])} | "
+            f"{'OK' if s['ok'] else 'FAIL'}"
         )
+        for d in s["divergences"]:
+            print(
+                f"    {d['mode']} run {d['rep']}: hash_match={d['hash_match']} "
+                f"file={d.get('file')} offset={d.get('offset')}"
+            )
 
     print("-" * 80)
 
-    if not ok:
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    if args.junit:
+        Path(args.junit).write_text(to_junit(report), encoding="utf-8")
+
+    if not report["ok"]:
         print("Determinism check FAILED")
         return 1
 
@@ -1,4 +1,11 @@
-# Placeholder script for evidence bundling
-# Not executed by CI
+#!/usr/bin/env python3
 
-print("Export EPGS evidence bundle")
+# Thin wrapper kept for existing tooling: same as `epgs bundle ...`
+
+import sys
+
+from epgs.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main(["bundle", *sys.argv[1:]]))
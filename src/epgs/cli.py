@@ -0,0 +1,282 @@
+"""
+Lightweight ``epgs`` command line.
+
+Each subcommand imports only what it needs, inside the command: ``epgs
+verify`` loads hashlib/json and the replay module, never FastAPI or
+pydantic, so scripted verification starts as fast as the interpreter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+
+def _print(obj) -> None:
+    sys.stdout.write(json.dumps(obj, sort_keys=True) + "\n")
+
+
+def parse_time(value: str) -> float:
+    """
+    Accept epoch seconds or an ISO-8601 timestamp.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+# ------------------------------------------------------------
+# Commands
+# ------------------------------------------------------------
+def _cmd_run(args) -> int:
+    from epgs.orchestrator.run import run_scenario
+
+    result = run_scenario(
+        args.scenario_path, output_root=args.out, seq=args.seq, deadline_ms=args.deadline_ms
+    )
+    _print(result)
+    return 0
+
+
+def _cmd_verify(args) -> int:
+    from epgs.orchestrator.replay import normalize_ledger_dir, verify_chain
+
+    result = verify_chain(str(normalize_ledger_dir(args.ledger_dir)))
+    _print(result)
+    return 0 if result["ok"] else 1
+
+
+def _cmd_verify_many(args) -> int:
+    from epgs.orchestrator.replay import verify_many
+
+    for rec in verify_many(args.root, args.pattern, args.workers):
+        sys.stdout.write(json.dumps(rec) + "\n")
+        sys.stdout.flush()
+    return 0 if rec["ok"] else 1
+
+
+def _cmd_replay(args) -> int:
+    from epgs.orchestrator.replay import replay_decisions
+
+    for rec in replay_decisions(args.root, args.pattern, args.workers, args.store):
+        sys.stdout.write(json.dumps(rec) + "\n")
+        sys.stdout.flush()
+    return 0 if rec["ok"] else 1
+
+
+def _cmd_shadow(args) -> int:
+    from epgs.orchestrator.shadow import load_candidate, shadow_corpus
+
+    for rec in shadow_corpus(args.stores, load_candidate(args.candidate), args.workers, args.log):
+        sys.stdout.write(json.dumps(rec, sort_keys=True) + "\n")
+        sys.stdout.flush()
+    return 0 if rec["ok"] else 1
+
+
+def _cmd_runs(args) -> int:
+    from epgs.ledger.runs import RunStore, run_store, store_path
+
+    if args.reconcile:
+        from epgs.orchestrator.run import reconcile
+
+        runs = run_store(args.out)
+        if runs is None:
+            sys.stderr.write("epgs runs: the run store is disabled (EPGS_RUN_STORE=0)\n")
+            return 1
+        _print({"reconciled": reconcile(runs, args.out)})
+        return 0
+
+    path = store_path(args.out)
+    if path is None or not path.is_file():
+        sys.stderr.write(f"epgs runs: no run store under {args.out}\n")
+        return 1
+    _print(
+        RunStore(path).query(
+            cursor=args.cursor,
+            limit=args.limit,
+            since=args.since,
+            until=args.until,
+            scenario=args.scenario,
+            sector_label=args.sector,
+            permission=args.permission,
+            final_state=args.final_state,
+        )
+    )
+    return 0
+
+
+def _cmd_verify_sharded(args) -> int:
+    from epgs.ledger.sharded import verify_sharded
+
+    result = verify_sharded(args.root, workers=args.workers)
+    _print(result)
+    return 0 if result["ok"] else 1
+
+
+def _cmd_convert(args) -> int:
+    from pathlib import Path
+
+    from epgs.scenarios.columnar import columnar_to_json, is_columnar, json_to_columnar
+
+    if is_columnar(args.src):
+        dst = columnar_to_json(args.src, args.dst)
+    elif Path(args.dst).suffix == ".epgsc":
+        dst = json_to_columnar(args.src, args.dst)
+    else:
+        sys.stderr.write("epgs convert: DST must end in .epgsc when SRC is JSON\n")
+        return 2
+    _print({"src": str(args.src), "dst": str(dst)})
+    return 0
+
+
+def _cmd_bundle(args) -> int:
+    from epgs.ledger.bundle import export_bundle, verify_bundle
+
+    if args.verify:
+        result = verify_bundle(args.verify)
+        _print(result)
+        return 0 if result["ok"] else 1
+
+    if not args.root or not args.out:
+        sys.stderr.write("epgs bundle: root and --out are required for export\n")
+        return 2
+
+    manifest = export_bundle(
+        args.root,
+        args.out,
+        fmt=args.format,
+        scenario=args.scenario,
+        since=args.since,
+        until=args.until,
+    )
+    sys.stderr.write(
+        f"Exported {len(manifest['ledgers'])} ledgers, "
+        f"{manifest['block_count']} R-Blocks\n"
+    )
+    return 0
+
+
+def _cmd_serve(args) -> int:
+    import uvicorn
+
+    uvicorn.run("epgs.main:app", host=args.host, port=args.port)
+    return 0
+
+
+def _cmd_daemon(args) -> int:
+    from epgs.daemon.server import DEFAULT_SOCKET, serve
+
+    serve(args.socket or DEFAULT_SOCKET)
+    return 0
+
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="epgs", description="Execution Permission Gate Simulator")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="Run a scenario and write its R-Block")
+    p.add_argument("scenario_path")
+    p.add_argument("--out", default=".", help="Output root (ledger is written to <out>/ledger)")
+    p.add_argument(
+        "--seq", type=int, default=None, help="Sequence number (default: next from <out>/ids)"
+    )
+    p.add_argument(
+        "--deadline-ms",
+        type=float,
+        default=None,
+        help="Fail closed (BLOCK/TERMINATED) past this budget",
+    )
+    p.set_defaults(fn=_cmd_run)
+
+    p = sub.add_parser("verify", help="Verify a ledger hash chain")
+    p.add_argument("ledger_dir")
+    p.set_defaults(fn=_cmd_verify)
+
+    p = sub.add_parser("verify-many", help="Verify every ledger under a root (NDJSON)")
+    p.add_argument("root")
+    p.add_argument("--pattern", default="**", help="Glob selecting ledger directories")
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(fn=_cmd_verify_many)
+
+    p = sub.add_parser("replay", help="Re-derive recorded decisions with the current code (NDJSON)")
+    p.add_argument("root")
+    p.add_argument("--pattern", default="**", help="Glob selecting ledger directories")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--store", default=None, help="Input store (default: <ledger>/../inputs)")
+    p.set_defaults(fn=_cmd_replay)
+
+    p = sub.add_parser(
+        "shadow",
+        help="Compare a candidate profile with the active one over recorded inputs (NDJSON)",
+    )
+    p.add_argument("candidate", help="Candidate resolver as module:function")
+    p.add_argument("stores", nargs="+", help="Input store(s), e.g. <out>/inputs")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--log", default=None, help="Also append divergences to this diff log")
+    p.set_defaults(fn=_cmd_shadow)
+
+    p = sub.add_parser("runs", help="List recorded run results, newest first")
+    p.add_argument("--out", default=".", help="Output root the runs were written under")
+    p.add_argument("--scenario")
+    p.add_argument("--sector")
+    p.add_argument("--permission")
+    p.add_argument("--final-state")
+    p.add_argument("--since", type=parse_time, help="Only runs recorded at/after this time")
+    p.add_argument("--until", type=parse_time, help="Only runs recorded before this time")
+    p.add_argument("--cursor", type=int, default=None, help="next_cursor of the previous page")
+    p.add_argument("--limit", type=int, default=50)
+    p.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Record R-Blocks under <out>/ledger that have no row, then exit",
+    )
+    p.set_defaults(fn=_cmd_runs)
+
+    p = sub.add_parser("verify-sharded", help="Verify a sharded ledger and its epoch commitments")
+    p.add_argument("root")
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(fn=_cmd_verify_sharded)
+
+    p = sub.add_parser("convert", help="Convert a scenario between JSON and columnar (.epgsc)")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p.set_defaults(fn=_cmd_convert)
+
+    p = sub.add_parser("bundle", help="Export or verify an evidence bundle")
+    p.add_argument("root", nargs="?", help="Directory containing ledgers")
+    p.add_argument("--out", help="Bundle path ('-' for stdout)")
+    p.add_argument("--format", choices=("tar", "zip"), default="tar")
+    p.add_argument("--scenario", help="Only ledgers containing this scenario")
+    p.add_argument("--since", type=parse_time, help="Only ledgers written at/after this time")
+    p.add_argument("--until", type=parse_time, help="Only ledgers written at/before this time")
+    p.add_argument("--verify", metavar="BUNDLE", help="Verify a bundle instead of exporting")
+    p.set_defaults(fn=_cmd_bundle)
+
+    p = sub.add_parser("serve", help="Serve the HTTP API with uvicorn")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.set_defaults(fn=_cmd_serve)
+
+    p = sub.add_parser("daemon", help="Serve run/verify on a Unix socket")
+    p.add_argument(
+        "--socket", default=None, help="Socket path (default: $EPGS_SOCKET or <tmp>/epgs-gate.sock)"
+    )
+    p.set_defaults(fn=_cmd_daemon)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
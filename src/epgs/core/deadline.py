@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+from epgs.core.metrics import DEADLINES_EXCEEDED
+
+# ------------------------------------------------------------
+# Cooperative deadlines
+# ------------------------------------------------------------
+# A gate run is given a time budget; each stage calls check(stage) at its
+# boundary. Stages are never interrupted mid-way: the first boundary past
+# the budget marks the run as exceeded and later stages are skipped, so
+# the caller can fail closed and still write its R-Block.
+
+DEADLINE_EXCEEDED = "DEADLINE_EXCEEDED"
+
+
+class Deadline:
+    """
+    A time budget in milliseconds (None: unlimited) with per-stage
+    accounting of how much of it each stage used.
+    """
+
+    __slots__ = ("budget_ms", "_clock", "_start", "_last", "stages", "exceeded_at")
+
+    def __init__(
+        self, budget_ms: Optional[float] = None, clock: Callable[[], float] = time.monotonic
+    ):
+        self.budget_ms = budget_ms
+        self._clock = clock
+        self._start = self._last = clock() if budget_ms is not None else 0.0
+        self.stages: Dict[str, float] = {}
+        self.exceeded_at: Optional[str] = None
+
+    @property
+    def exceeded(self) -> bool:
+        return self.exceeded_at is not None
+
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self._start) * 1000.0
+
+    def remaining_ms(self) -> Optional[float]:
+        if self.budget_ms is None:
+            return None
+        return self.budget_ms - self.elapsed_ms()
+
+    def charge(self, stage: str) -> None:
+        """
+        Charge ``stage`` the time since the previous boundary without
+        deciding anything (for work that runs whatever the budget).
+        """
+        if self.budget_ms is None:
+            return
+        now = self._clock()
+        self.stages[stage] = (now - self._last) * 1000.0
+        self._last = now
+
+    def check(self, stage: str) -> bool:
+        """
+        Close ``stage``: charge it the time since the previous check and
+        return whether the run is still within budget. Once exceeded,
+        stays exceeded.
+        """
+        if self.budget_ms is None:
+            return True
+
+        self.charge(stage)
+        if self.exceeded_at is not None:
+            return False
+        if (self._last - self._start) * 1000.0 > self.budget_ms:
+            self.exceeded_at = stage
+            DEADLINES_EXCEEDED.inc(stage)
+            return False
+        return True
+
+    def report(self) -> Optional[Dict[str, Any]]:
+        """
+        Budget use per stage (ms and share of the budget); None when
+        unlimited.
+        """
+        if self.budget_ms is None:
+            return None
+        budget = self.budget_ms or float("inf")
+        return {
+            "budget_ms": self.budget_ms,
+            "elapsed_ms": round(self.elapsed_ms(), 3),
+            "exceeded": self.exceeded,
+            "exceeded_at": self.exceeded_at,
+            "stages": {
+                name: {"ms": round(ms, 3), "share": round(ms / budget, 4)}
+                for name, ms in self.stages.items()
+            },
+        }
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Dict, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+# ------------------------------------------------------------
+# Deterministic identifiers
+# ------------------------------------------------------------
+# run_id and rblock_id are name-based UUIDs of (scenario, seq, head):
+#   scenario  canonical scenario name
+#   seq       per-scenario sequence number under an output root
+#   head      hash of the chain head the block is appended to
+# All three are stored in the R-Block (scenario, seq, previous_hash), so
+# the ids can be regenerated from the ledger alone.
+
+NAMESPACE = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+
+def mint(scenario: str, seq: int, head: str) -> Tuple[str, str]:
+    """
+    (run_id, rblock_id) for one decision.
+    """
+    base = f"{scenario}::{seq}::{head}"
+    return (
+        str(uuid.uuid5(NAMESPACE, f"{base}::run")),
+        str(uuid.uuid5(NAMESPACE, f"{base}::rblock")),
+    )
+
+
+def regenerate(rblock: Dict) -> Tuple[str, str]:
+    """
+    Re-mint the ids of a stored R-Block from its own fields.
+    """
+    return mint(rblock["scenario"], rblock["seq"], rblock["previous_hash"])
+
+
+# ------------------------------------------------------------
+# Sequence numbers
+# ------------------------------------------------------------
+class SequenceAllocator:
+    """
+    Per-scenario sequence counters persisted under ``<output_root>/ids``.
+
+    ``reserve(scenario, n)`` hands out ``n`` consecutive numbers under an
+    exclusive file lock, so batch workers can each take a range once and
+    then mint ids without further coordination. Numbers are never reused;
+    a crashed worker only leaves a gap.
+    """
+
+    def __init__(self, output_root: str | Path):
+        self.dir = Path(output_root) / "ids"
+
+    def path(self, scenario: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", scenario)
+        if safe != scenario:
+            safe += "-" + hashlib.sha256(scenario.encode("utf-8")).hexdigest()[:12]
+        return self.dir / f"{safe}.seq"
+
+    def reserve(self, scenario: str, n: int = 1) -> range:
+        if n < 1:
+            raise ValueError("n must be >= 1")
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path(scenario), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, 32, 0).strip()
+            start = int(raw) if raw else 0
+            data = str(start + n).encode("ascii")
+            os.pwrite(fd, data, 0)
+            os.ftruncate(fd, len(data))
+        finally:
+            os.close(fd)  # releases the lock
+        return range(start, start + n)
+
+    def next(self, scenario: str) -> int:
+        return self.reserve(scenario, 1).start
+
+    def peek(self, scenario: str) -> int:
+        """
+        The next number that would be handed out.
+        """
+        try:
+            raw = self.path(scenario).read_bytes().strip()
+        except FileNotFoundError:
+            return 0
+        return int(raw) if raw else 0
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# ------------------------------------------------------------
+# Low-overhead in-process metrics (Prometheus text exposition)
+# ------------------------------------------------------------
+# Latencies are recorded in integer nanoseconds into HDR-style log-linear
+# buckets: values below 32 ns are exact, above that each power of two is
+# split into 16 sub-buckets (~6% relative precision). Recording is a few
+# integer operations and one list increment; coarse Prometheus ``le``
+# buckets are only derived at scrape time.
+#
+# Hot-path updates take no lock. Under the GIL a concurrent update can, in
+# rare interleavings, be lost; that is accepted for monitoring data (the
+# ledger, not metrics, is the record of truth) in exchange for keeping a
+# fully instrumented decision within a few microseconds.
+
+_SUB_BITS = 5
+_LINEAR = 1 << _SUB_BITS          # exact buckets 0..31
+_HALF = _LINEAR >> 1              # sub-buckets per power of two
+_NBUCKETS = _LINEAR + 59 * _HALF  # enough for any 64-bit value
+
+# Exported ``le`` boundaries, seconds (1-2-5 series, 1us .. 10s)
+_EXPORT_LE = [m * 10.0 ** e for e in range(-6, 1) for m in (1, 2, 5)] + [10.0]
+
+_enabled = os.environ.get("EPGS_METRICS", "1") != "0"
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    global _enabled
+    _enabled = value
+
+
+def _bucket_index(v: int) -> int:
+    if v < _LINEAR:
+        return v if v > 0 else 0
+    shift = v.bit_length() - _SUB_BITS
+    return _LINEAR + (shift - 1) * _HALF + ((v >> shift) - _HALF)
+
+
+def _bucket_upper(i: int) -> int:
+    if i < _LINEAR:
+        return i
+    j = i - _LINEAR
+    shift = j // _HALF + 1
+    top = j % _HALF + _HALF
+    return ((top + 1) << shift) - 1
+
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+# ------------------------------------------------------------
+# Counter
+# ------------------------------------------------------------
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        if not _enabled:
+            return
+        values = self._values
+        if labels in values:
+            values[labels] += amount
+        else:
+            with self._lock:
+                values[labels] = values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, v in sorted(self._values.items()):
+            lines.append(f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_value(v)}")
+        return lines
+
+
+# ------------------------------------------------------------
+# Histogram
+# ------------------------------------------------------------
+_clock = time.perf_counter_ns
+
+
+class _Span:
+    __slots__ = ("_h", "_t0")
+
+    def __init__(self, h: "HistogramChild"):
+        self._h = h
+        self._t0 = _clock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._h.observe_ns(_clock() - self._t0)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class HistogramChild:
+    __slots__ = ("counts", "count", "sum_ns")
+
+    def __init__(self):
+        self.counts = [0] * _NBUCKETS
+        self.count = 0
+        self.sum_ns = 0
+
+    def observe_ns(self, ns: int) -> None:
+        if not _enabled:
+            return
+        if ns < _LINEAR:
+            i = ns if ns > 0 else 0
+        else:
+            shift = ns.bit_length() - _SUB_BITS
+            i = _LINEAR + (shift - 1) * _HALF + ((ns >> shift) - _HALF)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum_ns += ns
+
+    def time(self):
+        """
+        Context manager timing its body on the monotonic clock.
+        """
+        return _Span(self) if _enabled else _NO_SPAN
+
+    def percentile(self, q: float) -> int:
+        """
+        Upper bound (ns) of the bucket holding the ``q`` quantile.
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return _bucket_upper(i)
+        return _bucket_upper(_NBUCKETS - 1)
+
+
+class StageClock:
+    """
+    Times consecutive stages with one clock read per stage boundary:
+    ``mark(child)`` charges the time since the previous mark to ``child``.
+    Cheaper than a context manager per stage on the decision hot path.
+    """
+
+    __slots__ = ("_start", "_last")
+
+    def __init__(self):
+        self._start = self._last = _clock()
+
+    def mark(self, child: HistogramChild) -> None:
+        now = _clock()
+        child.observe_ns(now - self._last)
+        self._last = now
+
+    def total(self, child: HistogramChild) -> None:
+        child.observe_ns(_clock() - self._start)
+
+
+class _NoClock:
+    __slots__ = ()
+
+    def mark(self, child: HistogramChild) -> None:
+        pass
+
+    def total(self, child: HistogramChild) -> None:
+        pass
+
+
+_NO_CLOCK = _NoClock()
+
+
+def stage_clock() -> StageClock | _NoClock:
+    return StageClock() if _enabled else _NO_CLOCK
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: Dict[Tuple[str, ...], HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, HistogramChild())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+
+        for labels, child in sorted(self._children.items()):
+            counts = list(child.counts)
+            cum = 0
+            i = 0
+            for le in _EXPORT_LE:
+                limit = int(le * 1e9)
+                while i < _NBUCKETS and _bucket_upper(i) <= limit:
+                    cum += counts[i]
+                    i += 1
+                lbl = _fmt_labels(self.labelnames, labels, f'le="{le:g}"')
+                lines.append(f"{self.name}_bucket{lbl} {cum}")
+
+            total = sum(counts)
+            lbl = _fmt_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{lbl} {total}")
+
+            base = _fmt_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{base} {child.sum_ns / 1e9!r}")
+            lines.append(f"{self.name}_count{base} {total}")
+
+        return lines
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labelnames))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ------------------------------------------------------------
+# Gate instruments
+# ------------------------------------------------------------
+STAGE_SECONDS = REGISTRY.histogram(
+    "epgs_stage_seconds",
+    "Wall time per gate stage.",
+    ("stage",),
+)
+DECISIONS = REGISTRY.counter(
+    "epgs_decisions_total",
+    "Gate decisions by outcome.",
+    ("permission", "final_state"),
+)
+LEDGER_BYTES = REGISTRY.counter(
+    "epgs_ledger_bytes_written_total",
+    "R-Block bytes written to ledgers.",
+)
+VERIFY_SECONDS = REGISTRY.histogram(
+    "epgs_verify_seconds",
+    "Wall time per ledger chain verification.",
+)
+VERIFICATIONS = REGISTRY.counter(
+    "epgs_verifications_total",
+    "Ledger chain verifications by result.",
+    ("ok",),
+)
+WATCH_BLOCKS_READ = REGISTRY.counter(
+    "epgs_watch_blocks_read_total",
+    "R-Blocks re-read by the background ledger watcher.",
+)
+TAMPER_ALARMS = REGISTRY.counter(
+    "epgs_tamper_alarms_total",
+    "Tamper alarms raised by the background ledger watcher.",
+)
+DECISION_CACHE = REGISTRY.counter(
+    "epgs_decision_cache_total",
+    "Decision cache lookups by result.",
+    ("result",),
+)
+DECISION_CACHE_SAVED = REGISTRY.counter(
+    "epgs_decision_cache_saved_seconds_total",
+    "Decision time skipped by decision cache hits (cost of the original miss).",
+)
+DEADLINES_EXCEEDED = REGISTRY.counter(
+    "epgs_deadlines_exceeded_total",
+    "Runs failed closed on their deadline, by the stage that overran.",
+    ("stage",),
+)
+ADMISSION_ADMITTED = REGISTRY.counter(
+    "epgs_admission_admitted_total",
+    "Gate requests admitted, by sector.",
+    ("sector",),
+)
+ADMISSION_SHED = REGISTRY.counter(
+    "epgs_admission_shed_total",
+    "Gate requests shed (failed closed) by admission control.",
+    ("sector", "reason"),
+)
+ADMISSION_WAIT_SECONDS = REGISTRY.histogram(
+    "epgs_admission_wait_seconds",
+    "Time from arrival to an execution slot, by sector.",
+    ("sector",),
+)
+SHADOW_EVALUATIONS = REGISTRY.counter(
+    "epgs_shadow_evaluations_total",
+    "Live runs re-decided by the shadow candidate profile, by outcome.",
+    ("outcome",),
+)
+
+
+def render() -> str:
+    return REGISTRY.render()
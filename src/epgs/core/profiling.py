@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import contextvars
+import functools
+import io
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ------------------------------------------------------------
+# Opt-in profiling of gate calls
+# ------------------------------------------------------------
+# A call is profiled when it is forced (``force_profiling()``, e.g. from an
+# X-EPGS-Profile request header) or when EPGS_PROFILE=1 and the call falls
+# in the EPGS_PROFILE_RATE sample. Sampling is counter-based, not random,
+# so a rate of 0.01 profiles exactly every 100th call.
+#
+#   EPGS_PROFILE          "1" enables sampled profiling
+#   EPGS_PROFILE_RATE     fraction of calls to profile (default 1.0)
+#   EPGS_PROFILE_BACKEND  "cprofile" (default) or "sampling"
+#   EPGS_PROFILE_KEEP     captures kept for /debug/profile (default 32)
+
+_force: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "epgs_profile_force", default=None
+)
+_active = threading.local()
+
+_lock = threading.Lock()
+_calls = 0
+
+_recent: collections.deque = collections.deque(
+    maxlen=int(os.environ.get("EPGS_PROFILE_KEEP", "32"))
+)
+
+
+# ------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------
+class CProfileBackend:
+    """
+    Deterministic tracing profiler; output loads with ``pstats``.
+    """
+
+    ext = "prof"
+
+    def start(self) -> None:
+        import cProfile
+
+        self._prof = cProfile.Profile()
+        self._prof.enable()
+
+    def stop(self) -> None:
+        self._prof.disable()
+
+    def dump(self, path: Path) -> None:
+        self._prof.dump_stats(str(path))
+
+    def summary(self, limit: int = 15) -> str:
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(self._prof, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+class SamplingBackend:
+    """
+    Wall-clock stack sampler for the calling thread. Cheaper than cProfile
+    on long calls; output is in collapsed-stack (flamegraph) format.
+    """
+
+    ext = "folded"
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+
+    def start(self) -> None:
+        self._tid = threading.get_ident()
+        self._stacks: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._tid)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path: Path) -> None:
+        path.write_text(
+            "".join(f"{stack} {n}\n" for stack, n in self._stacks.most_common()),
+            encoding="utf-8",
+        )
+
+    def summary(self, limit: int = 15) -> str:
+        leaves: collections.Counter[str] = collections.Counter()
+        for stack, n in self._stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += n
+        total = sum(leaves.values()) or 1
+        return "".join(
+            f"{n / total:6.1%}  {frame}\n" for frame, n in leaves.most_common(limit)
+        )
+
+
+_BACKENDS: Dict[str, Callable[[], Any]] = {
+    "cprofile": CProfileBackend,
+    "sampling": SamplingBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[[], Any]) -> None:
+    """
+    Register a profiler backend: an object with ``ext`` and
+    ``start()/stop()/dump(path)/summary(limit)``.
+    """
+    _BACKENDS[name] = factory
+
+
+# ------------------------------------------------------------
+# Triggering
+# ------------------------------------------------------------
+def force_profiling(backend: Optional[str] = None):
+    """
+    Context manager: profile every decorated call made inside the block.
+    Raises ValueError right away for an unknown backend.
+    """
+    backend = backend or os.environ.get("EPGS_PROFILE_BACKEND", "cprofile")
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown profiler backend: {backend}")
+    return _forced(backend)
+
+
+@contextlib.contextmanager
+def _forced(backend: str):
+    token = _force.set(backend)
+    try:
+        yield
+    finally:
+        _force.reset(token)
+
+
+def _select_backend() -> Optional[str]:
+    global _calls
+
+    forced = _force.get()
+    if forced is not None:
+        return forced
+
+    if os.environ.get("EPGS_PROFILE") != "1":
+        return None
+
+    rate = float(os.environ.get("EPGS_PROFILE_RATE", "1.0"))
+    with _lock:
+        n = _calls
+        _calls += 1
+    if int((n + 1) * rate) <= int(n * rate):
+        return None
+    return os.environ.get("EPGS_PROFILE_BACKEND", "cprofile")
+
+
+def profiled(kind: str, locate: Callable[..., Tuple[str, Path]]):
+    """
+    Decorate a gate call so it can be profiled on demand.
+
+    ``locate(result, *args, **kwargs)`` returns ``(key, directory)``: the
+    capture is written to ``directory/<key>/<kind>.<ext>``.
+    """
+
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Profilers cannot nest: an outer capture already covers us
+            if getattr(_active, "on", False):
+                return fn(*args, **kwargs)
+
+            name = _select_backend()
+            if name is None:
+                return fn(*args, **kwargs)
+
+            backend = _BACKENDS[name]()
+            t0 = time.perf_counter()
+            backend.start()  # may raise (e.g. another profiler is active)
+            _active.on = True
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                backend.stop()
+                _active.on = False
+            duration_ms = (time.perf_counter() - t0) * 1000.0
+
+            key, directory = locate(result, *args, **kwargs)
+            target = Path(directory) / key
+            target.mkdir(parents=True, exist_ok=True)
+            path = target / f"{kind}.{backend.ext}"
+            backend.dump(path)
+
+            _recent.append({
+                "kind": kind,
+                "key": key,
+                "backend": name,
+                "path": str(path),
+                "duration_ms": duration_ms,
+                "captured_at": time.time(),
+                "summary": backend.summary(),
+            })
+            return result
+
+        return wrapper
+
+    return deco
+
+
+def recent_profiles(n: int = 10) -> List[Dict[str, Any]]:
+    """
+    The last ``n`` captures, newest first.
+    """
+    return list(reversed(_recent))[:n]
@@ -0,0 +1,158 @@
+"""
+Python client for the gate daemon.
+
+    with GateClient("/run/epgs/gate.sock") as gate:
+        result = gate.run("src/epgs/scenarios/S-STABLE-SAFE.json")
+        assert gate.verify(result["ledger_dir"])["ok"]
+
+Connections are pooled: a call borrows an idle socket (or opens one),
+and returns it afterwards, so steady-state calls pay no connect cost.
+The client is safe to share between threads.
+
+A call on a pooled socket the daemon has dropped is retried once on a
+fresh connection when the request could not be sent at all. Once it was
+sent, only side-effect-free ops are retried: a run may already have
+executed, so a lost reply is raised to the caller, never re-sent.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+from typing import Any, Dict, List, Optional
+
+from epgs.daemon.protocol import DEFAULT_SOCKET, ProtocolError, recv_frame, send_frame
+
+
+# Ops that may be re-sent after a lost reply
+IDEMPOTENT = frozenset({"ping", "verify", "metrics"})
+
+
+class GateError(RuntimeError):
+    """
+    The daemon answered with ``{"ok": false}``. ``shed`` is the
+    fail-closed body when admission control rejected a run.
+    """
+
+    def __init__(self, message: str, shed: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.shed = shed
+
+
+class GateClient:
+    def __init__(
+        self,
+        path: str = DEFAULT_SOCKET,
+        max_idle: int = 8,
+        timeout: Optional[float] = 30.0,
+    ):
+        self.path = str(path)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self.connects = 0
+
+    # ------------------------------------------------------------
+    # Pool
+    # ------------------------------------------------------------
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self.connects += 1
+        return sock
+
+    def _acquire(self) -> tuple[socket.socket, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, sock: socket.socket) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(sock)
+                return
+        sock.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+    def __enter__(self) -> "GateClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------
+    def _reconnect(self, sock: socket.socket) -> socket.socket:
+        sock.close()
+        return self._connect()
+
+    def call(self, op: str, **args: Any) -> Any:
+        req = {"op": op, **args}
+        sock, pooled = self._acquire()
+        try:
+            try:
+                send_frame(sock, req)
+            except (BrokenPipeError, ConnectionResetError):
+                if not pooled:
+                    raise
+                # The daemon dropped this idle connection (e.g. restart)
+                # and got nothing: retry once on a fresh socket.
+                sock = self._reconnect(sock)
+                send_frame(sock, req)
+
+            try:
+                resp = recv_frame(sock)
+            except ConnectionResetError:
+                resp = None
+            if resp is None and pooled and op in IDEMPOTENT:
+                sock = self._reconnect(sock)
+                send_frame(sock, req)
+                resp = recv_frame(sock)
+            if resp is None:
+                raise ProtocolError(f"daemon closed the connection during {op!r}")
+        except BaseException:
+            sock.close()
+            raise
+        self._release(sock)
+
+        if not resp.get("ok"):
+            raise GateError(resp.get("error", "unknown error"), resp.get("shed"))
+        return resp["result"]
+
+    def ping(self) -> bool:
+        return self.call("ping") == "pong"
+
+    def run(
+        self,
+        scenario_path: str,
+        output_root: Optional[str] = None,
+        deadline_ms: Optional[float] = None,
+        scenario_sha256: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {"scenario_path": scenario_path}
+        if output_root is not None:
+            fields["output_root"] = output_root
+        if deadline_ms is not None:
+            fields["deadline_ms"] = deadline_ms
+        if scenario_sha256 is not None:
+            fields["scenario_sha256"] = scenario_sha256
+        return self.call("run", **fields)
+
+    def verify(self, ledger_dir: str) -> Dict[str, Any]:
+        return self.call("verify", ledger_dir=ledger_dir)
+
+    def metrics(self) -> str:
+        return self.call("metrics")
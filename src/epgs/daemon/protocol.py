@@ -0,0 +1,73 @@
+"""
+Wire format for the gate daemon.
+
+Every message is one frame: a 4-byte big-endian payload length followed by
+compact UTF-8 JSON. Requests are ``{"op": ..., **args}``; responses are
+``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``.
+A connection carries any number of request/response pairs, in order.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_SOCKET = os.environ.get(
+    "EPGS_SOCKET", str(Path(tempfile.gettempdir()) / "epgs-gate.sock")
+)
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode(obj: Dict[str, Any]) -> bytes:
+    payload = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(payload) > MAX_FRAME:
+        raise ProtocolError(f"frame too large: {len(payload)} bytes")
+    return _HEADER.pack(len(payload)) + payload
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if k == 0:
+            if got == 0:
+                return None
+            raise ProtocolError("connection closed mid-frame")
+        got += k
+    return bytes(buf)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    Read one frame. Returns None on a clean EOF between frames.
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"frame too large: {length} bytes")
+    payload = _recv_exact(sock, length) if length else b""
+    if payload is None:
+        raise ProtocolError("connection closed mid-frame")
+    try:
+        return json.loads(payload)
+    except ValueError as e:
+        raise ProtocolError(f"invalid frame payload: {e}")
+
+
+def send_frame(sock: socket.socket, obj: Dict[str, Any]) -> None:
+    sock.sendall(encode(obj))
@@ -0,0 +1,166 @@
+"""
+Long-lived gate process serving run/verify over a Unix domain socket.
+
+    epgs daemon --socket /run/epgs/gate.sock
+
+A run goes through the same gate entry point as HTTP ``/run`` (schema
+validation, admission control, shadow evaluation; EPGS_ADMISSION and
+EPGS_SHADOW configure them here too), and verify is ``verify_chain``;
+only the transport differs. Each connection is served by its own thread
+and may carry many requests.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import socketserver
+from typing import Any, Callable, Dict
+
+from pydantic import ValidationError
+
+from epgs.core import metrics
+from epgs.daemon.protocol import DEFAULT_SOCKET, ProtocolError, recv_frame, send_frame
+from epgs.orchestrator.admission import AdmissionController, Shed
+from epgs.orchestrator.gate import gate
+from epgs.orchestrator.replay import normalize_ledger_dir, verify_chain
+from epgs.orchestrator.run import reconcile_from_env
+from epgs.orchestrator.shadow import ShadowEvaluator
+
+# Sector-aware admission control for run (EPGS_ADMISSION=0 disables)
+admission = AdmissionController.from_env()
+
+# Shadow evaluation of a candidate profile for live runs (EPGS_SHADOW)
+shadow = ShadowEvaluator.from_env()
+
+
+# ------------------------------------------------------------
+# Operations
+# ------------------------------------------------------------
+def _op_ping(req: Dict[str, Any]) -> Any:
+    return "pong"
+
+
+def _op_run(req: Dict[str, Any]) -> Any:
+    deadline_ms = req.get("deadline_ms")
+    return gate(
+        req["scenario_path"],
+        req.get("output_root"),
+        float(deadline_ms) if deadline_ms is not None else None,
+        req.get("scenario_sha256"),
+        admission=admission,
+        shadow=shadow,
+    )
+
+
+def _op_verify(req: Dict[str, Any]) -> Any:
+    return verify_chain(str(normalize_ledger_dir(req["ledger_dir"])))
+
+
+def _op_metrics(req: Dict[str, Any]) -> Any:
+    return metrics.render()
+
+
+OPS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "ping": _op_ping,
+    "run": _op_run,
+    "verify": _op_verify,
+    "metrics": _op_metrics,
+}
+
+
+def handle(req: Dict[str, Any]) -> Dict[str, Any]:
+    name = req.get("op") if isinstance(req, dict) else req
+    op = OPS.get(name) if isinstance(name, str) else None
+    if op is None:
+        return {"ok": False, "error": f"unknown op: {name!r}"}
+    try:
+        return {"ok": True, "result": op(req)}
+    except KeyError as e:
+        return {"ok": False, "error": f"missing field: {e.args[0]}"}
+    except ValidationError as e:
+        return {"ok": False, "error": f"invalid scenario: {e.error_count()} validation errors"}
+    except Shed as e:
+        # Fail closed, as HTTP /run's 503: nothing was executed
+        return {
+            "ok": False,
+            "error": f"admission rejected: {e}",
+            "shed": e.response(),
+            "retry_after": e.retry_after,
+        }
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+# ------------------------------------------------------------
+# Server
+# ------------------------------------------------------------
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        sock = self.request
+        while True:
+            try:
+                req = recv_frame(sock)
+            except ProtocolError as e:
+                try:
+                    send_frame(sock, {"ok": False, "error": f"protocol error: {e}"})
+                except OSError:
+                    pass
+                return
+            except OSError:
+                return
+            if req is None:
+                return
+            try:
+                send_frame(sock, handle(req))
+            except OSError:
+                return
+
+
+class GateServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, path: str = DEFAULT_SOCKET, mode: int = 0o660):
+        self.path = str(path)
+        _remove_stale(self.path)
+        super().__init__(self.path, _Handler)
+        os.chmod(self.path, mode)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale(path: str) -> None:
+    """
+    Unlink a leftover socket file, refusing if a live daemon still owns it.
+    """
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"gate daemon already listening on {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: str = DEFAULT_SOCKET) -> None:
+    # Orphaned R-Blocks of a previous process, before any new run
+    reconcile_from_env()
+    with GateServer(path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if shadow is not None:
+                shadow.drain(5.0)
+                shadow.close()
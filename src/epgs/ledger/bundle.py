@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from epgs.orchestrator.replay import (
+    GENESIS_HASH,
+    check_rblock,
+    find_ledgers,
+    list_rblock_files,
+    verify_chain,
+)
+
+# ------------------------------------------------------------
+# Evidence bundle layout
+# ------------------------------------------------------------
+#   ledgers/<ledger path>/<rblock_id>.json   R-Blocks, in chain order
+#   MANIFEST.json                           written last
+#
+# Ledgers are selected whole, never block by block, so every chain in a
+# bundle still verifies from GENESIS.
+
+BUNDLE_FORMAT = "epgs-bundle/1"
+FORMATS = ("tar", "zip")
+MANIFEST_NAME = "MANIFEST.json"
+
+_LEDGERS_PREFIX = "ledgers"
+_CHUNK = 1024 * 1024
+
+
+# ------------------------------------------------------------
+# Zero-copy transfer
+# ------------------------------------------------------------
+# The manifest needs every member's SHA-256, which needs its bytes in
+# userspace, while the transfer itself stays in the kernel. So a tar
+# member is hashed through a read-only mapping and then sent: the file
+# is read from disk once (the copy is served from the page cache) and
+# never copied into a Python buffer, but its pages are visited twice.
+def _copy_fd(src_fd: int, dst_fd: int, size: int) -> None:
+    """
+    Copy ``size`` bytes from ``src_fd`` (offset 0) to the current position
+    of ``dst_fd``: sendfile, then copy_file_range, then a bounded
+    pread/write loop for platforms that support neither.
+    """
+    offset = 0
+
+    for name in ("sendfile", "copy_file_range"):
+        fn = getattr(os, name, None)
+        if fn is None:
+            continue
+        try:
+            while offset < size:
+                if name == "sendfile":
+                    n = fn(dst_fd, src_fd, offset, size - offset)
+                else:
+                    n = fn(src_fd, dst_fd, size - offset, offset)
+                if n == 0:
+                    break
+                offset += n
+        except OSError:
+            # Unsupported for this fd pair: retry with the next mechanism,
+            # but never after bytes have already been written.
+            if offset:
+                raise
+            continue
+        break
+
+    while offset < size:
+        chunk = os.pread(src_fd, min(_CHUNK, size - offset), offset)
+        if not chunk:
+            break
+        os.write(dst_fd, chunk)
+        offset += len(chunk)
+
+    if offset != size:
+        raise RuntimeError("Ledger file changed size during export")
+
+
+def _sha256_fd(fd: int, size: int) -> str:
+    """
+    SHA-256 of the first ``size`` bytes of ``fd``, through a read-only
+    mapping (no copy into userspace).
+    """
+    if not size:
+        return hashlib.sha256().hexdigest()
+    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as m:
+        return hashlib.sha256(m).hexdigest()
+
+
+# ------------------------------------------------------------
+# Selection
+# ------------------------------------------------------------
+def _block_scenario(path: Path) -> Optional[str]:
+    rb = json.loads(path.read_text(encoding="utf-8"))
+    return rb.get("scenario") or rb.get("scenario_id")
+
+
+def _ledger_selected(
+    files: List[Path],
+    scenario: Optional[str],
+    since: Optional[float],
+    until: Optional[float],
+) -> bool:
+    if scenario is not None and not any(_block_scenario(f) == scenario for f in files):
+        return False
+
+    # R-Blocks carry no wall-clock time (it would break determinism),
+    # so the time range applies to block file mtimes.
+    if since is not None or until is not None:
+        for f in files:
+            mtime = f.stat().st_mtime
+            if since is not None and mtime < since:
+                return False
+            if until is not None and mtime > until:
+                return False
+
+    return True
+
+
+def _arc_dir(root: Path, ledger: Path) -> str:
+    rel = ledger.relative_to(root).as_posix()
+    return f"{_LEDGERS_PREFIX}/{root.name if rel == '.' else rel}"
+
+
+# ------------------------------------------------------------
+# Writers
+# ------------------------------------------------------------
+class _TarWriter:
+    """
+    Minimal streaming tar writer: headers come from ``tarfile``, member
+    data goes straight from the ledger fd to the bundle fd.
+    """
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    def _header(self, name: str, size: int, mtime: float) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(mtime)
+        info.mode = 0o644
+        os.write(self.fd, info.tobuf(format=tarfile.PAX_FORMAT))
+
+    def _pad(self, size: int) -> None:
+        rem = size % tarfile.BLOCKSIZE
+        if rem:
+            os.write(self.fd, tarfile.NUL * (tarfile.BLOCKSIZE - rem))
+
+    def add_file(self, name: str, path: Path) -> str:
+        """
+        Append ``path`` as ``name``; returns its SHA-256 (hashed before the
+        kernel copy, see above).
+        """
+        with path.open("rb") as src:
+            st = os.fstat(src.fileno())
+            digest = _sha256_fd(src.fileno(), st.st_size)
+            self._header(name, st.st_size, st.st_mtime)
+            _copy_fd(src.fileno(), self.fd, st.st_size)
+        self._pad(st.st_size)
+        return digest
+
+    def add_bytes(self, name: str, data: bytes, mtime: float) -> None:
+        self._header(name, len(data), mtime)
+        os.write(self.fd, data)
+        self._pad(len(data))
+
+    def close(self) -> None:
+        os.write(self.fd, tarfile.NUL * (2 * tarfile.BLOCKSIZE))
+
+
+class _ZipWriter:
+    """
+    Stored (uncompressed) zip. Zip needs a CRC of every member, so data is
+    streamed through userspace in bounded chunks instead of sendfile.
+    """
+
+    def __init__(self, fd: int):
+        self.fp = os.fdopen(fd, "wb", closefd=False)
+        self.zf = zipfile.ZipFile(self.fp, "w", zipfile.ZIP_STORED)
+
+    def add_file(self, name: str, path: Path) -> str:
+        h = hashlib.sha256()
+        with path.open("rb") as src, self.zf.open(name, "w") as dst:
+            for chunk in iter(lambda: src.read(_CHUNK), b""):
+                h.update(chunk)
+                dst.write(chunk)
+        return h.hexdigest()
+
+    def add_bytes(self, name: str, data: bytes, mtime: float) -> None:
+        self.zf.writestr(name, data)
+
+    def close(self) -> None:
+        self.zf.close()
+        self.fp.close()
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+def export_bundle(
+    root: str | Path,
+    out: str | Path,
+    fmt: str = "tar",
+    scenario: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Stream every ledger under ``root`` into an evidence bundle at ``out``
+    ("-" for stdout). Returns the bundle manifest.
+
+    Memory stays constant in the number of blocks apart from the manifest
+    itself, and no temporary copies are made.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown bundle format: {fmt}")
+
+    root = Path(root).resolve()
+
+    manifest: Dict[str, Any] = {
+        "format": BUNDLE_FORMAT,
+        "filters": {"scenario": scenario, "since": since, "until": until},
+        "ledgers": [],
+        "block_count": 0,
+        "files": {},
+    }
+
+    fd = 1 if str(out) == "-" else os.open(out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    writer = _TarWriter(fd) if fmt == "tar" else _ZipWriter(fd)
+    last_mtime = 0.0
+
+    try:
+        for ledger in find_ledgers(root):
+            files = list_rblock_files(ledger)
+            if not _ledger_selected(files, scenario, since, until):
+                continue
+
+            arc_dir = _arc_dir(root, ledger)
+            proof = verify_chain(str(ledger))
+
+            for f in files:
+                name = f"{arc_dir}/{f.name}"
+                manifest["files"][name] = writer.add_file(name, f)
+                last_mtime = max(last_mtime, f.stat().st_mtime)
+
+            manifest["ledgers"].append({"path": arc_dir, **proof})
+            manifest["block_count"] += len(files)
+
+        data = json.dumps(manifest, sort_keys=True, indent=2).encode("utf-8")
+        writer.add_bytes(MANIFEST_NAME, data, last_mtime)
+        writer.close()
+    finally:
+        if fd != 1:
+            os.close(fd)
+
+    return manifest
+
+
+# ------------------------------------------------------------
+# Verification (no extraction)
+# ------------------------------------------------------------
+def _iter_members(path: Path):
+    """
+    Yield (name, binary stream) for every regular member, in archive order.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    with zf.open(info) as f:
+                        yield info.filename, f
+        return
+
+    with tarfile.open(path, mode="r|*") as tf:
+        for member in tf:
+            if member.isfile():
+                yield member.name, tf.extractfile(member)
+
+
+def _check_member(state: Dict[str, Any], fname: str, data: bytes) -> None:
+    try:
+        rb = json.loads(data)
+        reason = check_rblock(rb, state["prev"], fname)
+        prev = rb["rblock_hash"]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        reason, prev = f"unreadable block {fname}", None
+    state["reason"] = reason
+    state["prev"] = prev
+    state["count"] += 1
+
+
+def verify_bundle(path: str | Path) -> dict:
+    """
+    Verify an evidence bundle by streaming it once: per-file SHA-256
+    against the manifest, and every ledger's hash chain re-checked in
+    archive order. A malformed manifest or member fails verification
+    with its reason; it never raises.
+    """
+    path = Path(path)
+
+    digests: Dict[str, str] = {}
+    chains: Dict[str, Dict[str, Any]] = {}
+    manifest = None
+
+    try:
+        for name, f in _iter_members(path):
+            data = f.read()  # one member (an R-Block) at a time
+            if name == MANIFEST_NAME:
+                try:
+                    manifest = json.loads(data)
+                except ValueError as e:
+                    return {"ok": False, "reason": f"MANIFEST.json is not JSON: {e}"}
+                continue
+
+            digests[name] = hashlib.sha256(data).hexdigest()
+            arc_dir, _, fname = name.rpartition("/")
+            state = chains.setdefault(arc_dir, {"prev": GENESIS_HASH, "count": 0, "reason": None})
+            if state["reason"] is None:
+                _check_member(state, fname, data)
+    except (tarfile.TarError, zipfile.BadZipFile, EOFError) as e:
+        return {"ok": False, "reason": f"unreadable bundle: {e}"}
+
+    if manifest is None:
+        return {"ok": False, "reason": "MANIFEST.json missing"}
+
+    try:
+        files, ledgers = manifest["files"], manifest["ledgers"]
+        if set(digests) != set(files):
+            return {"ok": False, "reason": "bundle members do not match manifest"}
+
+        for name, digest in digests.items():
+            if files[name] != digest:
+                return {"ok": False, "reason": f"sha256 mismatch in {name}"}
+
+        for entry in ledgers:
+            state = chains.get(entry["path"])
+            if state is None:
+                return {"ok": False, "reason": f"ledger missing: {entry['path']}"}
+            if state["reason"] is not None:
+                return {"ok": False, "reason": state["reason"]}
+            if state["count"] != entry.get("count") or state["prev"] != entry.get("final_hash"):
+                return {"ok": False, "reason": f"final_hash mismatch in {entry['path']}"}
+
+        return {
+            "ok": True,
+            "ledgers": len(ledgers),
+            "block_count": manifest["block_count"],
+        }
+    except (KeyError, TypeError, AttributeError) as e:
+        return {"ok": False, "reason": f"MANIFEST.json malformed: {type(e).__name__}: {e}"}
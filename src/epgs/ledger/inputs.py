@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from epgs.core.crypto import canonical_json, sha256_hex
+
+# ------------------------------------------------------------
+# Content-addressed input store
+# ------------------------------------------------------------
+#   <output_root>/inputs/<hh>/<sha256>.json
+#
+# Holds the exact scenario input a decision was made on, as canonical
+# JSON, under the SHA-256 of those bytes. R-Blocks record the hash as
+# ``input_hash``, so the decision behind any block can be re-derived.
+# Identical inputs are stored once.
+
+
+def input_hash(scenario: Dict[str, Any]) -> str:
+    return sha256_hex(canonical_json(scenario))
+
+
+class InputStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path(digest).is_file()
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Hashes of all stored inputs, in a stable order.
+        """
+        for path in sorted(self.root.glob("??/*.json")):
+            yield path.stem
+
+    def put(self, scenario: Dict[str, Any]) -> str:
+        """
+        Store ``scenario`` (if not already present) and return its hash.
+        """
+        raw = canonical_json(scenario)
+        digest = sha256_hex(raw)
+        path = self.path(digest)
+        if path.exists():
+            return digest
+
+        # A private temp file per writer: concurrent puts of the same new
+        # input each rename their own complete copy, and since the store is
+        # content-addressed whichever lands last is identical
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{digest}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(raw)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            if not path.exists():
+                raise
+        return digest
+
+    def get(self, digest: str) -> Dict[str, Any]:
+        """
+        The stored input. Raises FileNotFoundError if absent and
+        ValueError if the stored bytes no longer match the hash.
+        """
+        raw = self.path(digest).read_text(encoding="utf-8")
+        if sha256_hex(raw) != digest:
+            raise ValueError(f"stored input does not match {digest}")
+        return json.loads(raw)
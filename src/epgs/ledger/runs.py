@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# ------------------------------------------------------------
+# Run-result store
+# ------------------------------------------------------------
+#   <output_root>/runs.sqlite3       (EPGS_RUN_STORE=<path> overrides,
+#                                     EPGS_RUN_STORE=0 disables)
+#
+# One append-only row per gate run: the result ``run_scenario`` returned,
+# plus indexed columns for scenario, sector, permission, final_state and
+# time. Unlike the ledger directory, which is reset on every run, rows
+# are never updated or deleted (triggers reject both).
+#
+# The R-Block is written first (temp file + rename), then its row is
+# inserted in a short transaction, so the SQLite write lock is never held
+# across file I/O. A crash between the two leaves an R-Block without a
+# row, never a row without its R-Block. A run records such an orphan in
+# the per-run ledger before clearing it; orphans in ledgers that are never
+# cleared (sharded) are recorded by ``reconcile`` at startup or on demand
+# (``epgs runs --reconcile``), which remembers in ``reconciled`` how much
+# of each ledger it has checked.
+#
+# ``id`` is the commit order and the pagination cursor. ``created_at`` is
+# clamped to be non-decreasing in ``id``, so a time range is an id range
+# and every query walks one (column, id) index backwards.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id             INTEGER PRIMARY KEY,
+    created_at     REAL    NOT NULL,
+    run_id         TEXT    NOT NULL,
+    rblock_id      TEXT    NOT NULL,
+    scenario       TEXT    NOT NULL,
+    sector_label   TEXT,
+    permission     TEXT    NOT NULL,
+    final_state    TEXT    NOT NULL,
+    reason_code    TEXT,
+    execution_hash TEXT    NOT NULL,
+    result         TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_scenario    ON runs (scenario, id);
+CREATE INDEX IF NOT EXISTS runs_sector      ON runs (sector_label, id);
+CREATE INDEX IF NOT EXISTS runs_permission  ON runs (permission, id);
+CREATE INDEX IF NOT EXISTS runs_final_state ON runs (final_state, id);
+CREATE INDEX IF NOT EXISTS runs_created_at  ON runs (created_at);
+CREATE INDEX IF NOT EXISTS runs_run_id      ON runs (run_id);
+CREATE INDEX IF NOT EXISTS runs_rblock_id   ON runs (rblock_id);
+CREATE TABLE IF NOT EXISTS reconciled (
+    ledger_dir TEXT    PRIMARY KEY,
+    count      INTEGER NOT NULL,
+    head       TEXT    NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS runs_no_update BEFORE UPDATE ON runs
+BEGIN SELECT RAISE(ABORT, 'runs is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS runs_no_delete BEFORE DELETE ON runs
+BEGIN SELECT RAISE(ABORT, 'runs is append-only'); END;
+"""
+
+_INSERT = """
+INSERT INTO runs (created_at, run_id, rblock_id, scenario, sector_label,
+                  permission, final_state, reason_code, execution_hash, result)
+VALUES (max(?, coalesce((SELECT max(created_at) FROM runs), 0)),
+        ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# As _INSERT, unless the same R-Block (id, hash and ledger) already has a
+# row: a run and a reconcile may race to record it
+_INSERT_NEW = """
+INSERT INTO runs (created_at, run_id, rblock_id, scenario, sector_label,
+                  permission, final_state, reason_code, execution_hash, result)
+SELECT max(?1, coalesce((SELECT max(created_at) FROM runs), 0)),
+       ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10
+WHERE NOT EXISTS (
+    SELECT 1 FROM runs
+    WHERE rblock_id = ?3 AND execution_hash = ?9
+      AND json_extract(result, '$.ledger_dir') IS json_extract(?10, '$.ledger_dir')
+)
+"""
+
+_RECORDED = """
+SELECT 1 FROM runs
+WHERE rblock_id = ? AND execution_hash = ?
+  AND json_extract(result, '$.ledger_dir') IS ?
+LIMIT 1
+"""
+
+# Equality filters accepted by ``query``
+FILTERS = ("scenario", "sector_label", "permission", "final_state", "run_id")
+
+MAX_LIMIT = 1000
+
+
+class RunStore:
+    """
+    Append-only, indexed store of run results in one SQLite file.
+
+    Safe to share between threads (one connection per thread) and
+    between processes (SQLite locking, WAL journal).
+    """
+
+    def __init__(self, path: str | Path, clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self._clock = clock
+        self._local = threading.local()
+        self._conn()  # create the schema eagerly
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    # --------------------------------------------------------
+    # Writes
+    # --------------------------------------------------------
+    @contextlib.contextmanager
+    def _writing(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def append(
+        self, result: Dict[str, Any], scenario: str, sector_label: Optional[str] = None
+    ) -> None:
+        with self._writing() as conn:
+            conn.execute(_INSERT, _row(self._clock(), result, scenario, sector_label))
+
+    def record(
+        self, result: Dict[str, Any], scenario: str, sector_label: Optional[str] = None
+    ) -> bool:
+        """
+        Append the row for a run whose R-Block is already on disk, unless
+        that block is recorded already. True if a row was inserted.
+        """
+        with self._writing() as conn:
+            row = _row(self._clock(), result, scenario, sector_label)
+            return conn.execute(_INSERT_NEW, row).rowcount == 1
+
+    def record_many(
+        self, records: Iterable[tuple], marks: Iterable[tuple] = ()
+    ) -> int:
+        """
+        ``record`` for ``(result, scenario, sector_label)`` records in one
+        transaction, together with ``(ledger_dir, count, head)`` reconcile
+        marks (see ``reconciled``). Returns the number of rows inserted.
+        """
+        with self._writing() as conn:
+            added = 0
+            for rec in records:
+                added += conn.execute(_INSERT_NEW, _row(self._clock(), *rec)).rowcount
+            conn.executemany("INSERT OR REPLACE INTO reconciled VALUES (?, ?, ?)", marks)
+            return added
+
+    def recorded(self, rblock_id: str, execution_hash: str, ledger_dir: str) -> bool:
+        """
+        Whether this R-Block of ``ledger_dir`` already has a row.
+        """
+        args = (rblock_id, execution_hash, ledger_dir)
+        return self._conn().execute(_RECORDED, args).fetchone() is not None
+
+    def reconciled(self, ledger_dir: str) -> tuple[int, Optional[str]]:
+        """
+        (block count, last block hash) of ``ledger_dir`` when it was last
+        reconciled; (0, None) if never.
+        """
+        row = self._conn().execute(
+            "SELECT count, head FROM reconciled WHERE ledger_dir = ?", (ledger_dir,)
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, None)
+
+    def append_many(self, records: Iterable[tuple]) -> int:
+        """
+        Insert ``(result, scenario, sector_label)`` records in one
+        transaction (imports, backfills). Returns the number inserted.
+        """
+        with self._writing() as conn:
+            rows = (_row(self._clock(), *rec) for rec in records)
+            return conn.executemany(_INSERT, rows).rowcount
+
+    # --------------------------------------------------------
+    # Reads
+    # --------------------------------------------------------
+    def _id_range(
+        self, since: Optional[float], until: Optional[float]
+    ) -> tuple[Optional[int], Optional[int]]:
+        # created_at is non-decreasing in id: each bound is one index probe
+        conn = self._conn()
+        lo = hi = None
+        if since is not None:
+            row = conn.execute(
+                "SELECT id FROM runs WHERE created_at >= ? ORDER BY created_at, id LIMIT 1",
+                (since,),
+            ).fetchone()
+            lo = row[0] if row else -1  # nothing that recent: empty range
+        if until is not None:
+            row = conn.execute(
+                "SELECT id FROM runs WHERE created_at < ? "
+                "ORDER BY created_at DESC, id DESC LIMIT 1",
+                (until,),
+            ).fetchone()
+            hi = row[0] if row else 0
+        if lo == -1:
+            lo, hi = 1, 0
+        return lo, hi
+
+    def query(
+        self,
+        cursor: Optional[int] = None,
+        limit: int = 50,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        **filters: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        One page of runs, newest first.
+
+        ``filters`` are equality matches on the ``FILTERS`` columns;
+        ``since``/``until`` bound ``created_at`` (unix seconds, until
+        exclusive). Pass the returned ``next_cursor`` back as ``cursor``
+        for the next page; it is None on the last page.
+        """
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"unknown filter(s): {', '.join(sorted(unknown))}")
+        limit = max(1, min(int(limit), MAX_LIMIT))
+
+        where: List[str] = []
+        args: List[Any] = []
+        for column in FILTERS:
+            value = filters.get(column)
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+
+        lo, hi = self._id_range(since, until)
+        if cursor is not None:
+            hi = cursor - 1 if hi is None else min(hi, cursor - 1)
+        if lo is not None:
+            where.append("id >= ?")
+            args.append(lo)
+        if hi is not None:
+            where.append("id <= ?")
+            args.append(hi)
+
+        sql = "SELECT id, created_at, scenario, sector_label, result FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        rows = self._conn().execute(sql, (*args, limit + 1)).fetchall()
+
+        runs = [
+            {
+                "id": id_,
+                "created_at": created_at,
+                "scenario": scenario,
+                "sector_label": sector_label,
+                **json.loads(result),
+            }
+            for id_, created_at, scenario, sector_label, result in rows[:limit]
+        ]
+        next_cursor = runs[-1]["id"] if len(rows) > limit else None
+        return {"runs": runs, "next_cursor": next_cursor}
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The most recent run with ``run_id``, or None.
+        """
+        page = self.query(limit=1, run_id=run_id)
+        return page["runs"][0] if page["runs"] else None
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT count(*) FROM runs").fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _row(
+    created_at: float, result: Dict[str, Any], scenario: str, sector_label: Optional[str]
+) -> tuple:
+    return (
+        created_at,
+        result["run_id"],
+        result["rblock_id"],
+        scenario,
+        sector_label,
+        result["permission"],
+        result["final_state"],
+        result.get("reason_code"),
+        result["execution_hash"],
+        json.dumps(result, sort_keys=True, separators=(",", ":")),
+    )
+
+
+# ------------------------------------------------------------
+# Store per output root
+# ------------------------------------------------------------
+_STORES: Dict[Path, RunStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def store_path(output_root: str | Path) -> Optional[Path]:
+    """
+    Where runs under ``output_root`` are recorded; None if disabled.
+    """
+    override = os.environ.get("EPGS_RUN_STORE")
+    if override == "0":
+        return None
+    if override:
+        return Path(override).resolve()
+    return Path(output_root).resolve() / "runs.sqlite3"
+
+
+def run_store(output_root: str | Path) -> Optional[RunStore]:
+    """
+    The shared ``RunStore`` for ``output_root`` (see ``store_path``).
+    """
+    path = store_path(output_root)
+    if path is None:
+        return None
+    store = _STORES.get(path)
+    if store is None:
+        with _STORES_LOCK:
+            store = _STORES.get(path)
+            if store is None:
+                store = _STORES[path] = RunStore(path)
+    return store
@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import lzma
+import os
+import re
+import struct
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from epgs.orchestrator.replay import (
+    GENESIS_HASH,
+    check_rblock,
+    list_rblock_files,
+)
+
+# ------------------------------------------------------------
+# Sealed segment layout
+# ------------------------------------------------------------
+#   segment-000000.seg            concatenated, independently compressed R-Blocks
+#   segment-000000.idx            little-endian uint64 offsets (count + 1 entries)
+#   segment-000000.manifest.json  boundary hashes, block count, checksums
+#   <dict_sha256>.zdict           optional shared zlib dictionary
+#
+# Blocks are compressed one by one so any block can be read back with a
+# single seek; the shared dictionary recovers most of the ratio that is lost
+# by not compressing the segment as one stream.
+
+SEGMENT_FORMAT = "epgs-segment/1"
+CODECS = ("zlib", "lzma")
+
+_SEGMENT_SUFFIX = ".seg"
+_INDEX_SUFFIX = ".idx"
+_MANIFEST_SUFFIX = ".manifest.json"
+_DICT_SUFFIX = ".zdict"
+
+_OFFSET = struct.Struct("<Q")
+_LZMA_FILTERS = [{"id": lzma.FILTER_LZMA2, "preset": 6}]
+
+# JSON tokens: quoted strings (with optional key colon), numbers, literals
+_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*":?|-?\d+(?:\.\d+)?|true|false|null')
+
+
+# ------------------------------------------------------------
+# Codecs
+# ------------------------------------------------------------
+def _compress(codec: str, raw: bytes, zdict: Optional[bytes]) -> bytes:
+    if codec == "zlib":
+        if zdict:
+            c = zlib.compressobj(
+                9, zlib.DEFLATED, zlib.MAX_WBITS, 9, zlib.Z_DEFAULT_STRATEGY, zdict
+            )
+        else:
+            c = zlib.compressobj(9)
+        return c.compress(raw) + c.flush()
+
+    return lzma.compress(raw, format=lzma.FORMAT_RAW, filters=_LZMA_FILTERS)
+
+
+def _decompress(codec: str, data: bytes, zdict: Optional[bytes]) -> bytes:
+    if codec == "zlib":
+        d = zlib.decompressobj(zlib.MAX_WBITS, zdict) if zdict else zlib.decompressobj()
+        return d.decompress(data) + d.flush()
+
+    return lzma.decompress(data, format=lzma.FORMAT_RAW, filters=_LZMA_FILTERS)
+
+
+def _check_codec(codec: str, zdict: Optional[bytes]) -> None:
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec: {codec}")
+    if zdict and codec != "zlib":
+        raise ValueError("Shared dictionaries are only supported by the zlib codec")
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = 16 * 1024) -> bytes:
+    """
+    Build a shared zlib dictionary from sample R-Blocks.
+
+    JSON tokens seen more than once (keys, enum values, flags) are packed
+    up to ``size`` bytes, most valuable last, since deflate prefers short
+    back-references. Unique tokens such as hashes drop out naturally.
+    """
+    counts: Counter[bytes] = Counter()
+    for raw in samples:
+        counts.update(_TOKEN_RE.findall(raw))
+
+    ranked = sorted(
+        (tok for tok, n in counts.items() if n > 1),
+        key=lambda tok: (counts[tok] * len(tok), tok),
+        reverse=True,
+    )
+
+    picked: List[bytes] = []
+    used = 0
+    for tok in ranked:
+        if used + len(tok) > size:
+            continue
+        picked.append(tok)
+        used += len(tok)
+
+    picked.reverse()
+    return b"".join(picked)
+
+
+def _sha256_file(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _write_dictionary(archive_dir: Path, zdict: bytes) -> str:
+    digest = hashlib.sha256(zdict).hexdigest()
+    path = archive_dir / f"{digest}{_DICT_SUFFIX}"
+    if not path.exists():
+        path.write_bytes(zdict)
+    return digest
+
+
+def _load_dictionary(archive_dir: Path, manifest: Dict[str, Any]) -> Optional[bytes]:
+    digest = manifest.get("dict_sha256")
+    if digest is None:
+        return None
+
+    zdict = (archive_dir / f"{digest}{_DICT_SUFFIX}").read_bytes()
+    if hashlib.sha256(zdict).hexdigest() != digest:
+        raise ValueError(f"Dictionary checksum mismatch: {digest}")
+    return zdict
+
+
+# ------------------------------------------------------------
+# Sealing
+# ------------------------------------------------------------
+def seal_segment(
+    block_files: List[Path],
+    archive_dir: str | Path,
+    name: str,
+    previous_hash: str = GENESIS_HASH,
+    codec: str = "zlib",
+    zdict: Optional[bytes] = None,
+) -> Dict[str, Any]:
+    """
+    Compress a run of consecutive R-Block files into one sealed segment.
+
+    The chain is re-verified while sealing: a broken chain is never sealed.
+    Returns the segment manifest.
+    """
+    _check_codec(codec, zdict)
+    if not block_files:
+        raise ValueError("Cannot seal an empty segment")
+
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    seg_path = archive_dir / f"{name}{_SEGMENT_SUFFIX}"
+    idx_path = archive_dir / f"{name}{_INDEX_SUFFIX}"
+    manifest_path = archive_dir / f"{name}{_MANIFEST_SUFFIX}"
+
+    if manifest_path.exists():
+        raise RuntimeError(f"Segment {name} already sealed. Immutability violation.")
+
+    # Verify and compress the whole run before anything touches the
+    # archive, so a broken chain leaves no files behind
+    prev = previous_hash
+    first_hash = None
+    raw_bytes = 0
+    chunks: List[bytes] = []
+    for f in block_files:
+        raw = f.read_bytes()
+        try:
+            rb = json.loads(raw)
+            reason = check_rblock(rb, prev, f.name)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            reason = f"unreadable block {f.name}"
+        if reason is not None:
+            raise ValueError(f"Refusing to seal broken chain: {reason}")
+
+        prev = rb["rblock_hash"]
+        if first_hash is None:
+            first_hash = prev
+        chunks.append(_compress(codec, raw, zdict))
+        raw_bytes += len(raw)
+
+    offsets = [0]
+    for data in chunks:
+        offsets.append(offsets[-1] + len(data))
+    index = b"".join(_OFFSET.pack(o) for o in offsets)
+
+    # Segment and index go in under temp names and are renamed into place
+    # only once both are complete; the manifest, written last, seals them
+    seg_tmp = seg_path.with_name(f".{seg_path.name}.tmp")
+    idx_tmp = idx_path.with_name(f".{idx_path.name}.tmp")
+    seg_hash = hashlib.sha256()
+    try:
+        with seg_tmp.open("wb") as seg:
+            for data in chunks:
+                seg.write(data)
+                seg_hash.update(data)
+        idx_tmp.write_bytes(index)
+        os.replace(seg_tmp, seg_path)
+        os.replace(idx_tmp, idx_path)
+    except BaseException:
+        seg_tmp.unlink(missing_ok=True)
+        idx_tmp.unlink(missing_ok=True)
+        raise
+
+    manifest = {
+        "format": SEGMENT_FORMAT,
+        "segment": name,
+        "codec": codec,
+        "dict_sha256": _write_dictionary(archive_dir, zdict) if zdict else None,
+        "count": len(block_files),
+        "first_previous_hash": previous_hash,
+        "first_hash": first_hash,
+        "last_hash": prev,
+        "raw_bytes": raw_bytes,
+        "stored_bytes": offsets[-1],
+        "segment_sha256": seg_hash.hexdigest(),
+        "index_sha256": hashlib.sha256(index).hexdigest(),
+    }
+
+    manifest_tmp = manifest_path.with_name(f".{manifest_path.name}.tmp")
+    manifest_tmp.write_text(
+        json.dumps(manifest, sort_keys=True, indent=2),
+        encoding="utf-8",
+    )
+    os.replace(manifest_tmp, manifest_path)
+    return manifest
+
+
+def archive_ledger(
+    ledger_dir: str | Path,
+    archive_dir: str | Path,
+    segment_size: int = 1000,
+    codec: str = "zlib",
+    zdict: Optional[bytes] = None,
+    train: bool = False,
+    remove: bool = False,
+) -> Dict[str, Any]:
+    """
+    Seal every R-Block of ``ledger_dir`` into cold segments of ``segment_size``.
+
+    Segments continue an existing archive: the first new segment chains onto
+    the last sealed hash. With ``train`` a dictionary is trained from the
+    blocks being sealed. With ``remove`` the raw block files are deleted once
+    the new segments pass a deep verification.
+    """
+    if segment_size < 1:
+        raise ValueError("segment_size must be >= 1")
+
+    archive_dir = Path(archive_dir)
+    files = list_rblock_files(ledger_dir)
+    if not files:
+        return {"ok": False, "reason": "No R-Blocks found"}
+
+    if train and zdict is None:
+        zdict = train_dictionary(f.read_bytes() for f in files[:1000])
+
+    existing = list_manifests(archive_dir)
+    prev = existing[-1]["last_hash"] if existing else GENESIS_HASH
+    start = len(existing)
+
+    sealed = []
+    for i in range(0, len(files), segment_size):
+        manifest = seal_segment(
+            files[i:i + segment_size],
+            archive_dir,
+            name=f"segment-{start + len(sealed):06d}",
+            previous_hash=prev,
+            codec=codec,
+            zdict=zdict,
+        )
+        prev = manifest["last_hash"]
+        sealed.append(manifest["segment"])
+
+    if remove:
+        v = verify_segments(archive_dir, deep=True)
+        if not v["ok"]:
+            return v
+        for f in files:
+            f.unlink()
+
+    return {
+        "ok": True,
+        "segments": sealed,
+        "count": len(files),
+        "final_hash": prev,
+    }
+
+
+# ------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------
+def list_manifests(archive_dir: str | Path) -> List[Dict[str, Any]]:
+    p = Path(archive_dir)
+    return [
+        json.loads(f.read_text(encoding="utf-8"))
+        for f in sorted(p.glob(f"segment-*{_MANIFEST_SUFFIX}"))
+    ]
+
+
+def _load_manifest(archive_dir: Path, name: str) -> Dict[str, Any]:
+    path = archive_dir / f"{name}{_MANIFEST_SUFFIX}"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def read_block(archive_dir: str | Path, name: str, index: int) -> dict:
+    """
+    Random access to one R-Block of a sealed segment.
+
+    Reads two index entries and one compressed block; nothing else is
+    decompressed.
+    """
+    archive_dir = Path(archive_dir)
+    manifest = _load_manifest(archive_dir, name)
+
+    if not 0 <= index < manifest["count"]:
+        raise IndexError(f"Block {index} out of range for {name}")
+
+    with (archive_dir / f"{name}{_INDEX_SUFFIX}").open("rb") as idx:
+        idx.seek(index * _OFFSET.size)
+        start, end = struct.unpack("<2Q", idx.read(2 * _OFFSET.size))
+
+    with (archive_dir / f"{name}{_SEGMENT_SUFFIX}").open("rb") as seg:
+        seg.seek(start)
+        data = seg.read(end - start)
+
+    zdict = _load_dictionary(archive_dir, manifest)
+    return json.loads(_decompress(manifest["codec"], data, zdict))
+
+
+def iter_segment_blocks(archive_dir: str | Path, name: str) -> Iterator[dict]:
+    archive_dir = Path(archive_dir)
+    manifest = _load_manifest(archive_dir, name)
+    zdict = _load_dictionary(archive_dir, manifest)
+
+    idx_raw = (archive_dir / f"{name}{_INDEX_SUFFIX}").read_bytes()
+    offsets = [o for (o,) in _OFFSET.iter_unpack(idx_raw)]
+
+    with (archive_dir / f"{name}{_SEGMENT_SUFFIX}").open("rb") as seg:
+        for start, end in zip(offsets, offsets[1:]):
+            seg.seek(start)
+            yield json.loads(_decompress(manifest["codec"], seg.read(end - start), zdict))
+
+
+# ------------------------------------------------------------
+# Verification
+# ------------------------------------------------------------
+def _verify_segment_shallow(archive_dir: Path, m: Dict[str, Any]) -> str | None:
+    name = m["segment"]
+    seg_path = archive_dir / f"{name}{_SEGMENT_SUFFIX}"
+    idx_path = archive_dir / f"{name}{_INDEX_SUFFIX}"
+
+    if not seg_path.exists() or not idx_path.exists():
+        return f"missing segment data for {name}"
+    if seg_path.stat().st_size != m["stored_bytes"]:
+        return f"segment size mismatch in {name}"
+    if idx_path.stat().st_size != (m["count"] + 1) * _OFFSET.size:
+        return f"index size mismatch in {name}"
+    if _sha256_file(seg_path) != m["segment_sha256"]:
+        return f"segment checksum mismatch in {name}"
+    if _sha256_file(idx_path) != m["index_sha256"]:
+        return f"index checksum mismatch in {name}"
+    return None
+
+
+def _verify_segment_deep(archive_dir: Path, m: Dict[str, Any]) -> str | None:
+    name = m["segment"]
+    prev = m["first_previous_hash"]
+    count = 0
+
+    for i, rb in enumerate(iter_segment_blocks(archive_dir, name)):
+        if i == 0 and rb["rblock_hash"] != m["first_hash"]:
+            return f"first_hash mismatch in {name}"
+
+        reason = check_rblock(rb, prev, f"{name}[{i}]")
+        if reason is not None:
+            return reason
+
+        prev = rb["rblock_hash"]
+        count += 1
+
+    if count != m["count"]:
+        return f"block count mismatch in {name}"
+    if prev != m["last_hash"]:
+        return f"last_hash mismatch in {name}"
+    return None
+
+
+def verify_segments(archive_dir: str | Path, deep: bool = False) -> dict:
+    """
+    Verify a chain of sealed segments.
+
+    By default only manifests are chained (each segment's first
+    previous_hash must equal the prior segment's last_hash) and the
+    compressed bytes are checksummed, without decompressing anything.
+    ``deep`` additionally decompresses every block and re-runs the
+    ``verify_chain`` hash checks.
+    """
+    archive_dir = Path(archive_dir)
+    manifests = list_manifests(archive_dir)
+
+    if not manifests:
+        return {"ok": False, "reason": "No sealed segments found"}
+
+    prev = GENESIS_HASH
+    count = 0
+
+    for m in manifests:
+        if m.get("format") != SEGMENT_FORMAT:
+            return {"ok": False, "reason": f"unknown segment format in {m.get('segment')}"}
+
+        if m["first_previous_hash"] != prev:
+            return {"ok": False, "reason": f"previous_hash mismatch in {m['segment']}"}
+
+        reason = _verify_segment_shallow(archive_dir, m)
+        if reason is None and deep:
+            reason = _verify_segment_deep(archive_dir, m)
+        if reason is not None:
+            return {"ok": False, "reason": reason}
+
+        prev = m["last_hash"]
+        count += m["count"]
+
+    return {
+        "ok": True,
+        "final_hash": prev,
+        "count": count,
+        "segments": len(manifests),
+    }
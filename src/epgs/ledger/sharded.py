@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+from epgs.core.crypto import canonical_json, chained_hash
+from epgs.core.ids import NAMESPACE
+from epgs.core.metrics import LEDGER_BYTES
+from epgs.orchestrator.replay import (
+    GENESIS_HASH,
+    check_rblock,
+    list_rblock_files,
+    load_rblock,
+)
+
+# ------------------------------------------------------------
+# Sharded ledger layout
+# ------------------------------------------------------------
+#   shards.json                 {"format", "shards", "key"}
+#   shard-0000/ ... shard-NNNN/ one independent hash chain per shard
+#   epochs/                     chain of epoch blocks over all shard heads
+#
+# Every shard (and the epoch chain) is an ordinary ledger directory:
+# verify_chain() accepts it as is. Block files are named with UUIDs whose
+# first 48 bits are the block's position, so name order is chain order.
+#
+# Appends take only their own shard's lock (an flock on <shard>/HEAD,
+# which also holds "<count> <head hash>"), so writers on different shards
+# never wait for each other. An epoch takes every shard lock in index
+# order, reads the heads and appends one epoch block committing to all
+# of them; verification checks each shard in parallel and then checks
+# each epoch commitment against the verified chains.
+#
+# A block file is renamed into place before HEAD is advanced. If a writer
+# dies in between, the next append re-derives the same position and file
+# name and replaces the unacknowledged block.
+
+SHARDED_FORMAT = "epgs-sharded/1"
+SHARD_KEYS = ("sector_label", "run_id")
+
+_CONFIG = "shards.json"
+_HEAD = "HEAD"
+_EPOCHS = "epochs"
+
+
+def shard_dir_name(index: int) -> str:
+    return f"shard-{index:04d}"
+
+
+def shard_of(value: str, shards: int) -> int:
+    """
+    Shard index for a key value. Stable across processes and machines
+    (unlike ``hash()``, which is salted per interpreter).
+    """
+    digest = hashlib.sha256(str(value).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def block_name(chain: str, position: int, previous_hash: str) -> str:
+    """
+    File name of the block at ``position`` of ``chain``: a UUID whose
+    first 12 hex digits are the position, so names sort in chain order.
+    """
+    tail = uuid.uuid5(NAMESPACE, f"{chain}::{position}::{previous_hash}").hex
+    pos = f"{position:012x}"
+    return f"{pos[:8]}-{pos[8:]}-{tail[12:16]}-{tail[16:20]}-{tail[20:]}.json"
+
+
+# ------------------------------------------------------------
+# Per-chain head (lock + position + hash)
+# ------------------------------------------------------------
+class _Head:
+    def __init__(self, fd: int):
+        self.fd = fd
+        raw = os.pread(fd, 128, 0).split()
+        self.count = int(raw[0]) if raw else 0
+        self.hash = raw[1].decode("ascii") if raw else GENESIS_HASH
+
+    def advance(self, new_hash: str) -> None:
+        self.count += 1
+        self.hash = new_hash
+        data = f"{self.count} {self.hash}\n".encode("ascii")
+        os.pwrite(self.fd, data, 0)
+        os.ftruncate(self.fd, len(data))
+
+
+@contextmanager
+def _locked_head(chain_dir: Path) -> Iterator[_Head]:
+    fd = os.open(chain_dir / _HEAD, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield _Head(fd)
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def _write_block(
+    chain_dir: Path, chain: str, head: _Head, payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    block_hash = chained_hash(payload, head.hash)
+    block = {**payload, "previous_hash": head.hash, "rblock_hash": block_hash}
+    raw = json.dumps(block, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+
+    name = block_name(chain, head.count, head.hash)
+    tmp = chain_dir / f".{name}.tmp"
+    tmp.write_text(raw, encoding="utf-8")
+    os.replace(tmp, chain_dir / name)
+
+    head.advance(block_hash)
+    LEDGER_BYTES.inc(amount=len(raw))
+    return block
+
+
+# ------------------------------------------------------------
+# Writer
+# ------------------------------------------------------------
+class ShardedLedger:
+    """
+    A ledger split into ``shards`` independent hash chains.
+
+    R-Blocks are routed by ``key`` ("sector_label" or "run_id"). Every
+    ``epoch_every`` appends made through this instance (0: never) an epoch
+    block is sealed automatically; ``seal_epoch()`` seals one on demand.
+    Safe to share between threads and between processes opening the same
+    root.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        shards: int = 8,
+        key: str = "sector_label",
+        epoch_every: int = 0,
+    ):
+        if key not in SHARD_KEYS:
+            raise ValueError(f"Unknown shard key: {key}")
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        config = {"format": SHARDED_FORMAT, "shards": shards, "key": key}
+
+        cfg_path = self.root / _CONFIG
+        if cfg_path.exists():
+            existing = json.loads(cfg_path.read_text(encoding="utf-8"))
+            if existing != config:
+                raise ValueError(f"{self.root} is already laid out as {existing}")
+        else:
+            tmp = self.root / f".{_CONFIG}.{os.getpid()}.tmp"
+            tmp.write_text(canonical_json(config), encoding="utf-8")
+            os.replace(tmp, cfg_path)
+
+        self.shards = shards
+        self.key = key
+        self.epoch_every = epoch_every
+        self._since_epoch = 0
+
+        for i in range(shards):
+            (self.root / shard_dir_name(i)).mkdir(exist_ok=True)
+        (self.root / _EPOCHS).mkdir(exist_ok=True)
+
+    def shard_for(self, payload: Dict[str, Any]) -> int:
+        if self.key not in payload:
+            raise ValueError(f"R-Block payload has no {self.key!r} to shard on")
+        return shard_of(payload[self.key], self.shards)
+
+    def append(
+        self,
+        payload: Dict[str, Any],
+        mint: Optional[Callable[[str], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Chain ``payload`` onto its shard and return the stored block.
+
+        ``mint(head_hash)`` adds fields derived from the head the block is
+        chained onto (e.g. run_id/rblock_id); it is called under the shard
+        lock. A shard key it mints is routed on its value at GENESIS,
+        which is known before the head is.
+        """
+        payload = {k: v for k, v in payload.items() if k not in ("previous_hash", "rblock_hash")}
+        route = payload
+        if mint is not None and self.key not in payload:
+            route = {**payload, **mint(GENESIS_HASH)}
+        index = self.shard_for(route)
+        name = shard_dir_name(index)
+        chain_dir = self.root / name
+
+        with _locked_head(chain_dir) as head:
+            if mint is not None:
+                payload = {**payload, **mint(head.hash)}
+            payload = {**payload, "shard": index, "shard_seq": head.count}
+            block = _write_block(chain_dir, name, head, payload)
+
+        self._since_epoch += 1
+        if self.epoch_every and self._since_epoch >= self.epoch_every:
+            self.seal_epoch()
+        return block
+
+    def seal_epoch(self) -> Dict[str, Any]:
+        """
+        Append an epoch block committing to every shard's current head.
+        """
+        epoch_dir = self.root / _EPOCHS
+        with ExitStack() as stack:
+            # Fixed lock order (shards by index, then the epoch chain)
+            heads = [
+                stack.enter_context(_locked_head(self.root / shard_dir_name(i)))
+                for i in range(self.shards)
+            ]
+            epoch_head = stack.enter_context(_locked_head(epoch_dir))
+            payload = {
+                "type": "epoch",
+                "epoch": epoch_head.count,
+                "key": self.key,
+                "shard_count": self.shards,
+                "heads": [[i, h.count, h.hash] for i, h in enumerate(heads)],
+            }
+            block = _write_block(epoch_dir, _EPOCHS, epoch_head, payload)
+
+        self._since_epoch = 0
+        return block
+
+
+# ------------------------------------------------------------
+# Gate runs (opt-in)
+# ------------------------------------------------------------
+#   EPGS_LEDGER_SHARDS       shard count for the ledger gate runs write to
+#                            (unset or 0: the single per-run ledger)
+#   EPGS_LEDGER_SHARD_KEY    sector_label (default) | run_id
+#   EPGS_LEDGER_EPOCH_EVERY  appends between automatic epochs (default 0)
+_LEDGERS: Dict[Tuple[Path, int, str, int], ShardedLedger] = {}
+_LEDGERS_LOCK = threading.Lock()
+
+
+def run_ledger(root: str | Path) -> Optional[ShardedLedger]:
+    """
+    The shared sharded ledger gate runs append to under ``root``; None
+    unless EPGS_LEDGER_SHARDS is set.
+    """
+    shards = int(os.environ.get("EPGS_LEDGER_SHARDS", "0") or 0)
+    if shards < 1:
+        return None
+    key = (
+        Path(root).resolve(),
+        shards,
+        os.environ.get("EPGS_LEDGER_SHARD_KEY", "sector_label"),
+        int(os.environ.get("EPGS_LEDGER_EPOCH_EVERY", "0") or 0),
+    )
+    ledger = _LEDGERS.get(key)
+    if ledger is None:
+        with _LEDGERS_LOCK:
+            ledger = _LEDGERS.get(key)
+            if ledger is None:
+                ledger = _LEDGERS[key] = ShardedLedger(*key)
+    return ledger
+
+
+def read_config(root: str | Path) -> Dict[str, Any]:
+    cfg = json.loads((Path(root) / _CONFIG).read_text(encoding="utf-8"))
+    if cfg.get("format") != SHARDED_FORMAT:
+        raise ValueError(f"unsupported sharded ledger format: {cfg.get('format')}")
+    return cfg
+
+
+def is_sharded(root: str | Path) -> bool:
+    return (Path(root) / _CONFIG).is_file()
+
+
+# ------------------------------------------------------------
+# Verification
+# ------------------------------------------------------------
+def _verify_hashes(chain_dir: Path) -> Tuple[Optional[str], List[str]]:
+    """
+    verify_chain over one chain that also returns every block hash, so
+    epoch commitments can be checked at any position.
+    """
+    prev = GENESIS_HASH
+    hashes: List[str] = []
+
+    for f in list_rblock_files(chain_dir):
+        try:
+            rb = load_rblock(f)
+        except ValueError:
+            return f"unreadable block {f.name}", hashes
+        reason = check_rblock(rb, prev, f.name)
+        if reason is not None:
+            return reason, hashes
+        prev = rb["rblock_hash"]
+        hashes.append(prev)
+
+    return None, hashes
+
+
+def _hash_at(hashes: List[str], count: int) -> str:
+    return hashes[count - 1] if count else GENESIS_HASH
+
+
+def verify_sharded(root: str | Path, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Verify every shard chain in parallel, then the epoch chain and each
+    epoch's commitment to the shard heads.
+
+    ``epoch_hash`` (the last epoch block's hash) commits to the whole
+    ledger up to that epoch; ``uncommitted`` counts blocks appended after
+    it.
+    """
+    root = Path(root)
+    try:
+        cfg = read_config(root)
+    except (OSError, ValueError) as e:
+        return {"ok": False, "reason": f"Not a sharded ledger: {e}"}
+
+    n = cfg["shards"]
+    dirs = [root / shard_dir_name(i) for i in range(n)] + [root / _EPOCHS]
+    workers = max(1, workers or min(32, (os.cpu_count() or 1) + 4))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_verify_hashes, dirs))
+
+    *shard_results, (epoch_reason, epoch_hashes) = results
+    shards = []
+    for i, (reason, h) in enumerate(shard_results):
+        status = {"shard": i, "ok": reason is None, "count": len(h), "head": _hash_at(h, len(h))}
+        if reason:
+            status["reason"] = reason
+        shards.append(status)
+
+    out: Dict[str, Any] = {
+        "ok": False,
+        "shards": shards,
+        "blocks": sum(s["count"] for s in shards),
+        "epochs": len(epoch_hashes),
+    }
+
+    bad = [s for s in shards if not s["ok"]]
+    if bad:
+        out["reason"] = f"shard {bad[0]['shard']}: {bad[0]['reason']}"
+        return out
+    if epoch_reason:
+        out["reason"] = f"epochs: {epoch_reason}"
+        return out
+
+    # Commitments: each epoch names a prefix of every shard chain
+    hashes = [h for _, h in shard_results]
+    last = [0] * n
+    for f in list_rblock_files(root / _EPOCHS):
+        epoch = load_rblock(f)
+        if epoch.get("shard_count") != n or len(epoch.get("heads", [])) != n:
+            out["reason"] = f"epoch {epoch.get('epoch')} does not cover {n} shards"
+            return out
+        for i, count, head in epoch["heads"]:
+            if count < last[i] or count > len(hashes[i]) or _hash_at(hashes[i], count) != head:
+                out["reason"] = f"epoch {epoch['epoch']} commitment mismatch for shard {i}"
+                return out
+            last[i] = count
+
+    out["ok"] = True
+    out["epoch_hash"] = _hash_at(epoch_hashes, len(epoch_hashes))
+    out["uncommitted"] = sum(len(h) - c for h, c in zip(hashes, last))
+    return out
+
+
+# ------------------------------------------------------------
+# Deterministic merge
+# ------------------------------------------------------------
+def iter_merged(root: str | Path) -> Iterator[Dict[str, Any]]:
+    """
+    All R-Blocks in one deterministic total order: epoch by epoch, and
+    within an epoch by shard index then position; blocks not yet covered
+    by an epoch come last in the same order.
+    """
+    root = Path(root)
+    n = read_config(root)["shards"]
+    files = [list_rblock_files(root / shard_dir_name(i)) for i in range(n)]
+
+    bounds = [
+        [count for _, count, _ in load_rblock(f)["heads"]]
+        for f in list_rblock_files(root / _EPOCHS)
+    ]
+    bounds.append([len(fs) for fs in files])
+
+    done = [0] * n
+    for upto in bounds:
+        for i in range(n):
+            for f in files[i][done[i]:upto[i]]:
+                yield load_rblock(f)
+            done[i] = max(done[i], upto[i])
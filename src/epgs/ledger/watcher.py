@@ -0,0 +1,572 @@
+"""
+Background verification of ledger directories.
+
+A ``LedgerWatcher`` keeps, per ledger directory under a root, the hashes of
+every verified R-Block and the last verified head. File events (inotify,
+or a stat-polling fallback) name the blocks that changed; only those are
+re-read and re-hashed with ``replay.check_rblock``, and an unchanged block
+is re-checked only when its predecessor's hash changed, by comparing its
+cached ``previous_hash``. Appending one block to a long ledger therefore
+reads one file.
+
+Any chain break raises a tamper alarm: it is recorded, counted in
+``epgs_tamper_alarms_total`` and passed to every registered hook.
+A ledger emptied and restarted from genesis (as ``run_scenario`` does on
+each run) is a reset, not an alarm.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import heapq
+import importlib
+import json
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from epgs.core.metrics import TAMPER_ALARMS, WATCH_BLOCKS_READ
+from epgs.orchestrator.replay import _RBLOCK_RE, GENESIS_HASH, check_rblock
+
+log = logging.getLogger(__name__)
+
+AlarmHook = Callable[[Dict[str, Any]], None]
+
+# (mtime_ns, size, inode): enough to tell a rewritten file from an unchanged one
+Sig = Tuple[int, int, int]
+
+# Changes reported by a source: ledger dir -> changed R-Block names,
+# or None for "re-list this directory".
+Changes = Dict[str, Optional[Set[str]]]
+
+
+def _sig(st: os.stat_result) -> Sig:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# ------------------------------------------------------------
+# Per-ledger state
+# ------------------------------------------------------------
+class _Ledger:
+    __slots__ = (
+        "path", "names", "blocks", "ok", "reason", "head", "head_name", "verified_at",
+        "resets", "unreadable", "stale",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.names: List[str] = []  # chain order
+        self.blocks: Dict[str, Tuple[str, str]] = {}  # name -> (previous_hash, rblock_hash)
+        self.ok = True
+        self.reason: Optional[str] = None
+        self.head: Optional[str] = None
+        self.head_name: Optional[str] = None
+        self.verified_at: Optional[float] = None
+        self.resets = 0
+        self.unreadable: Dict[str, Sig] = {}  # name -> sig of a failed parse
+        self.stale = True  # needs a full pass
+
+    def status(self) -> Dict[str, Any]:
+        out = {
+            "ledger": self.path,
+            "ok": self.ok,
+            "count": len(self.names),
+            "head": self.head,
+            "head_block": self.head_name,
+            "verified_at": self.verified_at,
+            "resets": self.resets,
+        }
+        if not self.ok:
+            out["reason"] = self.reason
+        return out
+
+
+# ------------------------------------------------------------
+# Event sources
+# ------------------------------------------------------------
+class PollSource:
+    """
+    Stat every R-Block file under the root each tick. No file is read
+    unless its (mtime, size, inode) changed.
+    """
+
+    mode = "poll"
+
+    def __init__(self, root: str, interval: float):
+        self.root = root
+        self.interval = interval
+        self._snap: Dict[str, Dict[str, Sig]] = {}
+
+    def _scan(self) -> Dict[str, Dict[str, Sig]]:
+        snap: Dict[str, Dict[str, Sig]] = {}
+        for d, _, files in os.walk(self.root):
+            entries = {}
+            for name in files:
+                if _RBLOCK_RE.match(name):
+                    try:
+                        entries[name] = _sig(os.stat(os.path.join(d, name)))
+                    except FileNotFoundError:
+                        pass
+            if entries:
+                snap[d] = entries
+        return snap
+
+    def prime(self) -> List[str]:
+        self._snap = self._scan()
+        return list(self._snap)
+
+    def wait(self, stop: threading.Event) -> Changes:
+        if stop.wait(self.interval):
+            return {}
+        snap = self._scan()
+        changes: Changes = {}
+        for d in snap.keys() | self._snap.keys():
+            new, old = snap.get(d, {}), self._snap.get(d, {})
+            changed = {n for n in new.keys() | old.keys() if new.get(n) != old.get(n)}
+            if changed:
+                changes[d] = changed
+        self._snap = snap
+        return changes
+
+    def close(self) -> None:
+        pass
+
+
+class InotifySource:
+    """
+    Linux inotify through ctypes: one watch per directory under the root,
+    reporting completed writes, renames and deletions by file name.
+    """
+
+    mode = "inotify"
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, root: str, interval: float):
+        self.root = root
+        self.interval = interval
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._wds: Dict[int, str] = {}
+
+    def _add_watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch failed for {path}: {os.strerror(err)}")
+        self._wds[wd] = path
+
+    def _add_tree(self, top: str) -> List[str]:
+        dirs = []
+        for d, _, _ in os.walk(top):
+            self._add_watch(d)
+            dirs.append(d)
+        return dirs
+
+    def prime(self) -> List[str]:
+        # Watches first, then the caller lists: nothing slips between.
+        return self._add_tree(self.root)
+
+    def wait(self, stop: threading.Event) -> Changes:
+        ready, _, _ = select.select([self._fd], [], [], self.interval)
+        if not ready or stop.is_set():
+            return {}
+        # Coalesce a burst (e.g. reset + rewrite of a ledger) into one batch
+        time.sleep(0.005)
+
+        changes: Changes = {}
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            off = 0
+            while off < len(buf):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(buf, off)
+                off += self._EVENT.size
+                name = buf[off:off + length].split(b"\0", 1)[0].decode("utf-8", "surrogateescape")
+                off += length
+                self._on_event(wd, mask, name, changes)
+        return changes
+
+    def _on_event(self, wd: int, mask: int, name: str, changes: Changes) -> None:
+        if mask & self.IN_Q_OVERFLOW:
+            # Events were dropped: re-list every directory we know
+            for d in self._wds.values():
+                changes[d] = None
+            return
+        if mask & self.IN_IGNORED:
+            self._wds.pop(wd, None)
+            return
+
+        d = self._wds.get(wd)
+        if d is None:
+            return
+        if mask & self.IN_DELETE_SELF:
+            changes[d] = None
+            return
+        if mask & self.IN_ISDIR:
+            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                for sub in self._add_tree(os.path.join(d, name)):
+                    changes[sub] = None
+            return
+        # Files: IN_CREATE is ignored, content is complete at IN_CLOSE_WRITE
+        if mask & self.IN_CREATE or not _RBLOCK_RE.match(name):
+            return
+        bucket = changes.setdefault(d, set())
+        if bucket is not None:
+            bucket.add(name)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+# ------------------------------------------------------------
+# Watcher
+# ------------------------------------------------------------
+class LedgerWatcher:
+    def __init__(
+        self,
+        root: str | Path,
+        mode: str = "auto",
+        interval: float = 1.0,
+        on_alarm: Optional[AlarmHook] = None,
+        keep_alarms: int = 1000,
+    ):
+        self.root = str(Path(root).resolve())
+        self.mode = mode
+        self.interval = interval
+        self._hooks: List[AlarmHook] = [on_alarm] if on_alarm else []
+        # Verification state belongs to the thread running apply(); the lock
+        # only guards what readers see: per-ledger status snapshots and the
+        # alarm list. Hooks and file reads never run under it.
+        self._ledgers: Dict[str, _Ledger] = {}
+        self._lock = threading.Lock()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._alarms: deque = deque(maxlen=keep_alarms)
+        self._raised: List[Dict[str, Any]] = []  # alarms of the current apply()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._source = None
+        self.blocks_read = 0
+
+    # ------------------------------------------------------------
+    # Hooks and queries
+    # ------------------------------------------------------------
+    def add_alarm_hook(self, hook: AlarmHook) -> None:
+        self._hooks.append(hook)
+
+    def alarms(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._alarms)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            ledgers = [self._status[p] for p in sorted(self._status)]
+            alarms = len(self._alarms)
+        return {
+            "root": self.root,
+            "mode": self._source.mode if self._source else None,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "ledgers": ledgers,
+            "alarms": alarms,
+        }
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+    def _make_source(self):
+        if self.mode in ("auto", "inotify"):
+            try:
+                return InotifySource(self.root, self.interval)
+            except (OSError, AttributeError):
+                if self.mode == "inotify":
+                    raise
+                log.info("inotify unavailable, polling %s every %ss", self.root, self.interval)
+        return PollSource(self.root, self.interval)
+
+    def start(self) -> "LedgerWatcher":
+        source = self._make_source()
+        try:
+            dirs = source.prime()
+        except OSError:
+            # e.g. inotify watch limit reached on a large tree
+            source.close()
+            if self.mode != "auto":
+                raise
+            source = PollSource(self.root, self.interval)
+            dirs = source.prime()
+        self._source = source
+        self.apply({d: None for d in dirs})
+
+        self._thread = threading.Thread(target=self._loop, name="epgs-ledger-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._source:
+            self._source.close()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                changes = self._source.wait(self._stop)
+                # Blocks that were mid-write last time are retried
+                for led in self._ledgers.values():
+                    if led.stale:
+                        changes.setdefault(led.path, None)
+                if changes:
+                    self.apply(changes)
+            except Exception:
+                log.exception("ledger watcher iteration failed")
+
+    # ------------------------------------------------------------
+    # Incremental verification
+    # ------------------------------------------------------------
+    def apply(self, changes: Changes) -> None:
+        """
+        Re-verify the given ledgers. ``None`` for a directory means "list
+        it and check every block that is not already verified unchanged".
+        """
+        try:
+            for d, names in changes.items():
+                if not os.path.isdir(d):
+                    if self._ledgers.pop(d, None) is not None:
+                        with self._lock:
+                            self._status.pop(d, None)
+                    continue
+                led = self._ledgers.get(d)
+                new = led is None
+                if new:
+                    if names is not None and not names:
+                        continue
+                    led = _Ledger(d)
+                self._check(led, names)
+                if new and not led.names and led.ok and not led.stale:
+                    continue  # not a ledger (yet)
+                self._ledgers[d] = led
+                snapshot = led.status()
+                with self._lock:
+                    self._status[d] = snapshot
+        finally:
+            self._publish()
+
+    def _publish(self) -> None:
+        raised, self._raised = self._raised, []
+        if not raised:
+            return
+        with self._lock:
+            self._alarms.extend(raised)
+        for rec in raised:
+            TAMPER_ALARMS.inc()
+            for hook in self._hooks:
+                try:
+                    hook(rec)
+                except Exception:
+                    log.exception("tamper alarm hook failed")
+
+    def _check(self, led: _Ledger, changed: Optional[Set[str]]) -> None:
+        if not led.ok:
+            # Re-baseline after an alarm (the alarm itself stays recorded)
+            led.names, led.blocks, led.head, led.head_name = [], {}, None, None
+            changed = None
+        if changed is None or led.stale:
+            # Full pass: every listed or known block is re-read
+            listed = {e.name for e in os.scandir(led.path) if _RBLOCK_RE.match(e.name)}
+            changed = listed | set(led.names) | (changed or set())
+        led.stale = False
+
+        names = led.names
+        old_head, old_head_name = led.head, led.head_name
+        survivors = len(led.blocks)  # previously verified blocks still intact
+        todo: Dict[int, bool] = {}  # index -> must re-read the file
+        heap: List[int] = []
+
+        def push(i: int, read: bool) -> None:
+            if i >= len(names):
+                return
+            if i in todo:
+                todo[i] = todo[i] or read
+                return
+            todo[i] = read
+            heapq.heappush(heap, i)
+
+        # Apply the name changes, then collect positions to re-check
+        removed: List[str] = []
+        for name in changed:
+            exists = os.path.exists(os.path.join(led.path, name))
+            i = bisect_left(names, name)
+            listed = i < len(names) and names[i] == name
+            if exists and not listed:
+                insort(names, name)
+            elif not exists and listed:
+                del names[i]
+                if led.blocks.pop(name, None) is not None:
+                    survivors -= 1
+                removed.append(name)
+        for name in changed:
+            i = bisect_left(names, name)
+            if i < len(names) and names[i] == name:
+                push(i, True)
+        for name in removed:
+            push(bisect_left(names, name), False)  # successor of a removed block
+
+        if not names:
+            # Emptied: a reset, not tampering
+            led.head, led.head_name, led.verified_at = None, None, time.time()
+            return
+
+        while heap:
+            j = heapq.heappop(heap)
+            read = todo.pop(j)
+            name = names[j]
+            prev = led.blocks[names[j - 1]][1] if j else GENESIS_HASH
+            cached = led.blocks.get(name)
+
+            if read or cached is None:
+                rb = self._read(led, name)
+                if rb is None:
+                    return
+                reason = check_rblock(rb, prev, name)
+                if reason is not None:
+                    self._alarm(led, reason)
+                    return
+                led.blocks[name] = (rb["previous_hash"], rb["rblock_hash"])
+                if cached is None or cached[1] != rb["rblock_hash"]:
+                    if cached is not None:
+                        survivors -= 1
+                    push(j + 1, False)
+            elif cached[0] != prev:
+                self._alarm(led, f"previous_hash mismatch in {name}")
+                return
+
+        # The chain is internally valid. It must still contain the last
+        # verified head, unless nothing of the old chain survived (a reset).
+        kept = led.blocks.get(old_head_name) if old_head_name else None
+        if old_head is not None and (kept is None or kept[1] != old_head):
+            if survivors > 0:
+                self._alarm(led, f"verified head {old_head_name} removed or rewritten")
+                return
+            led.resets += 1
+
+        led.head_name = names[-1]
+        led.head = led.blocks[led.head_name][1]
+        led.verified_at = time.time()
+
+    def _read(self, led: _Ledger, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse one block. None means "stop here": either the block may be
+        mid-write (the ledger is marked stale and retried next tick) or it
+        was already unparseable last time, unchanged, which is an alarm.
+        """
+        path = os.path.join(led.path, name)
+        try:
+            st = os.stat(path)
+            with open(path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            led.stale = True
+            return None
+
+        self.blocks_read += 1
+        WATCH_BLOCKS_READ.inc()
+        try:
+            rb = json.loads(raw)
+            if not isinstance(rb, dict) or "previous_hash" not in rb or "rblock_hash" not in rb:
+                raise ValueError("not an R-Block")
+        except ValueError:
+            sig = _sig(st)
+            if led.unreadable.get(name) == sig:
+                self._alarm(led, f"unreadable block {name}")
+            else:
+                led.unreadable[name] = sig
+                led.stale = True
+            return None
+
+        led.unreadable.pop(name, None)
+        return rb
+
+    def _alarm(self, led: _Ledger, reason: str) -> None:
+        repeated = not led.ok and led.reason == reason
+        led.ok, led.reason = False, reason
+        if repeated:
+            return
+
+        # Published (and hooks called) once apply() is done with the batch
+        self._raised.append(
+            {
+                "ledger": led.path,
+                "reason": reason,
+                "detected_at": time.time(),
+                "last_verified_head": led.head,
+                "last_verified_at": led.verified_at,
+            }
+        )
+
+
+# ------------------------------------------------------------
+# Environment wiring (used by the API at startup)
+# ------------------------------------------------------------
+def load_hook(spec: str) -> AlarmHook:
+    """
+    Resolve a ``"package.module:function"`` hook spec.
+    """
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def from_env(environ: Optional[Dict[str, str]] = None) -> List[LedgerWatcher]:
+    """
+    Watchers configured by the environment, not yet started.
+
+      EPGS_WATCH           root(s) to watch, os.pathsep-separated
+      EPGS_WATCH_MODE      auto (default) | inotify | poll
+      EPGS_WATCH_INTERVAL  poll / wake-up interval in seconds (default 1.0)
+      EPGS_WATCH_HOOK      "module:function" called with each alarm
+    """
+    env = os.environ if environ is None else environ
+    roots = [r for r in env.get("EPGS_WATCH", "").split(os.pathsep) if r]
+    if not roots:
+        return []
+
+    hook = load_hook(env["EPGS_WATCH_HOOK"]) if env.get("EPGS_WATCH_HOOK") else None
+    return [
+        LedgerWatcher(
+            root,
+            mode=env.get("EPGS_WATCH_MODE", "auto"),
+            interval=float(env.get("EPGS_WATCH_INTERVAL", "1.0")),
+            on_alarm=hook,
+        )
+        for root in roots
+    ]
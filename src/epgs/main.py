@@ -1,17 +1,60 @@
 from __future__ import annotations
 
+import contextlib
+import json
+import math
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, Query
-from pydantic import BaseModel
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from epgs.core import metrics
+from epgs.core.profiling import force_profiling, recent_profiles
+from epgs.orchestrator.admission import AdmissionController, Shed
+from epgs.orchestrator.gate import gate_async
+from epgs.orchestrator.run import reconcile_from_env
+from epgs.orchestrator.shadow import ShadowEvaluator
+from epgs.ledger.runs import MAX_LIMIT, run_store, store_path
+from epgs.ledger.watcher import from_env as watchers_from_env
+from epgs.scenarios.load import ContentHashMismatch
+from epgs.orchestrator.replay import (
+    normalize_ledger_dir,
+    replay_decisions,
+    verify_chain,
+    verify_many,
+)
+
+
+# ------------------------------------------------------------
+# Startup reconcile (EPGS_RECONCILE=<output_root>[:<output_root>...])
+# and background ledger watchers (EPGS_WATCH=<root>[:<root>...])
+# ------------------------------------------------------------
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    reconcile_from_env()
+    app.state.watchers = [w.start() for w in watchers_from_env()]
+    try:
+        yield
+    finally:
+        for w in app.state.watchers:
+            w.stop()
+        if shadow is not None:
+            shadow.drain(5.0)
+            shadow.close()
 
-from epgs.orchestrator.run import run_scenario
-from epgs.orchestrator.replay import verify_chain
+
+# Sector-aware admission control for /run (EPGS_ADMISSION=0 disables)
+admission = AdmissionController.from_env()
+
+# Shadow evaluation of a candidate profile for live runs (EPGS_SHADOW)
+shadow = ShadowEvaluator.from_env()
 
 app = FastAPI(
     title="EPGS – Execution Permission Gate Simulator",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 
@@ -21,38 +64,110 @@ app = FastAPI(
 class RunRequest(BaseModel):
     scenario_path: str
     output_root: Optional[str] = None
+    deadline_ms: Optional[float] = Field(None, ge=0, description="Fail closed past this many ms")
+    scenario_sha256: Optional[str] = Field(
+        None, description="Pin the scenario content by its SHA-256 (trusted path)"
+    )
+
+
+# ------------------------------------------------------------
+# Per-request profiling (X-EPGS-Profile: 1 | cprofile | sampling)
+# ------------------------------------------------------------
+def _profiling(header: Optional[str]):
+    if not header or header.lower() in ("0", "false", "no"):
+        return contextlib.nullcontext()
+    backend = None if header.lower() in ("1", "true", "yes") else header.lower()
+    try:
+        return force_profiling(backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # ------------------------------------------------------------
-# Ledger normalization (CI-FINAL)
+# API: run scenario
 # ------------------------------------------------------------
-def normalize_ledger_dir(ledger_dir: str) -> Path:
-    p = Path(ledger_dir)
+@app.post("/run")
+async def run(
+    req: RunRequest,
+    x_epgs_profile: Optional[str] = Header(None),
+):
+    # Untrusted input: full schema validation, once per scenario content.
+    # The run decides on the validated content, never on a re-read.
+    # Queued requests wait on the event loop, not on a worker thread.
+    try:
+        return await gate_async(
+            req.scenario_path,
+            req.output_root,
+            req.deadline_ms,
+            req.scenario_sha256,
+            admission=admission,
+            shadow=shadow,
+            profiling=_profiling(x_epgs_profile),
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False),
+        )
+    except ContentHashMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        # Not decodable at all (e.g. malformed JSON): as invalid as a schema error
+        raise HTTPException(status_code=422, detail=str(e))
+    except Shed as e:
+        # Shed requests fail closed: BLOCK / TERMINATED, nothing executed
+        return JSONResponse(
+            status_code=503,
+            content=e.response(),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
 
-    # ✅ ABSOLUTE RULE: if <path>/ledger exists, use it
-    ledger = p / "ledger"
-    if ledger.exists() and ledger.is_dir():
-        return ledger
 
-    # rblock file → parent
-    if p.exists() and p.is_file() and p.suffix == ".json":
-        return p.parent
+@app.get("/admission/stats")
+def admission_stats():
+    if admission is None:
+        return {"enabled": False}
+    return {"enabled": True, **admission.stats()}
 
-    # direct ledger dir
-    if p.exists() and p.is_dir():
-        return p
 
-    return p  # verify_chain will fail cleanly if invalid
+@app.get("/shadow/stats")
+def shadow_stats():
+    if shadow is None:
+        return {"enabled": False}
+    return {"enabled": True, **shadow.stats()}
 
 
 # ------------------------------------------------------------
-# API: run scenario
+# API: recorded run results (newest first, cursor pagination)
 # ------------------------------------------------------------
-@app.post("/run")
-def run(req: RunRequest):
-    if req.output_root is not None:
-        return run_scenario(req.scenario_path, req.output_root)
-    return run_scenario(req.scenario_path)
+@app.get("/runs")
+def runs_endpoint(
+    output_root: str = Query(".", description="Output root the runs were written under"),
+    scenario: Optional[str] = Query(None),
+    sector_label: Optional[str] = Query(None),
+    permission: Optional[str] = Query(None),
+    final_state: Optional[str] = Query(None),
+    run_id: Optional[str] = Query(None),
+    since: Optional[float] = Query(None, description="created_at >= since (unix seconds)"),
+    until: Optional[float] = Query(None, description="created_at < until (unix seconds)"),
+    cursor: Optional[int] = Query(None, ge=1, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=MAX_LIMIT),
+):
+    path = store_path(output_root)
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=404, detail=f"No run store for {output_root}")
+
+    return run_store(output_root).query(
+        cursor=cursor,
+        limit=limit,
+        since=since,
+        until=until,
+        scenario=scenario,
+        sector_label=sector_label,
+        permission=permission,
+        final_state=final_state,
+        run_id=run_id,
+    )
 
 
 # ------------------------------------------------------------
@@ -61,6 +176,83 @@ def run(req: RunRequest):
 @app.get("/verify")
 def verify(
     ledger_dir: str = Query(..., description="Ledger directory"),
+    x_epgs_profile: Optional[str] = Header(None),
 ):
     ledger_path = normalize_ledger_dir(ledger_dir)
-    return verify_chain(str(ledger_path))
+    with _profiling(x_epgs_profile):
+        return verify_chain(str(ledger_path))
+
+
+# ------------------------------------------------------------
+# API: verify many ledgers (NDJSON stream, summary line last)
+# ------------------------------------------------------------
+@app.get("/verify_many")
+def verify_many_endpoint(
+    root: str = Query(..., description="Directory containing ledgers"),
+    pattern: str = Query("**", description="Glob (relative to root) selecting ledger directories"),
+    workers: Optional[int] = Query(None, ge=1, le=64, description="Concurrent verifications"),
+):
+    if not Path(root).is_dir():
+        raise HTTPException(status_code=404, detail=f"Not a directory: {root}")
+
+    lines = (json.dumps(rec) + "\n" for rec in verify_many(root, pattern, workers))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+# ------------------------------------------------------------
+# API: re-derive recorded decisions (NDJSON stream, summary line last)
+# ------------------------------------------------------------
+@app.get("/replay")
+def replay_endpoint(
+    root: str = Query(..., description="Directory containing ledgers"),
+    pattern: str = Query("**", description="Glob (relative to root) selecting ledger directories"),
+    workers: Optional[int] = Query(None, ge=1, le=64, description="Concurrent replays"),
+    store: Optional[str] = Query(None, description="Input store (default: <ledger>/../inputs)"),
+):
+    if not Path(root).is_dir():
+        raise HTTPException(status_code=404, detail=f"Not a directory: {root}")
+
+    lines = (json.dumps(rec) + "\n" for rec in replay_decisions(root, pattern, workers, store))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+# ------------------------------------------------------------
+# API: background verification status and tamper alarms
+# ------------------------------------------------------------
+def _watchers() -> list:
+    return getattr(app.state, "watchers", [])
+
+
+@app.get("/watch")
+def watch_status():
+    watchers = _watchers()
+    return {
+        "enabled": bool(watchers),
+        "watchers": [w.status() for w in watchers],
+    }
+
+
+@app.get("/watch/alarms")
+def watch_alarms():
+    return [a for w in _watchers() for a in w.alarms()]
+
+
+# ------------------------------------------------------------
+# API: metrics (Prometheus text exposition)
+# ------------------------------------------------------------
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+# ------------------------------------------------------------
+# API: recently captured profiles
+# ------------------------------------------------------------
+@app.get("/debug/profile")
+def debug_profile(
+    n: int = Query(10, ge=1, le=1000, description="Number of captures"),
+):
+    return recent_profiles(n)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from itertools import islice
+from typing import Sequence
+
 from epgs.core.types import NeuroPauseOut, Readiness
 from epgs.scenarios.schema import TemporalSignal
 
@@ -30,3 +33,43 @@ def evaluate_temporal(temporal: list[TemporalSignal]) -> NeuroPauseOut:
         tau_ms_observed=observed,
         resets=resets,
     )
+
+
+def evaluate_temporal_columns(
+    step_index: Sequence[int],
+    stable_ms: Sequence[int],
+    jitter: Sequence[bool],
+) -> NeuroPauseOut:
+    """
+    ``evaluate_temporal`` over parallel columns (e.g. the memory-mapped
+    columns of an ``.epgsc`` scenario), without building per-step objects.
+    """
+    n = len(step_index)
+    if all(a <= b for a, b in zip(step_index, islice(step_index, 1, None))):
+        order = range(n)
+    else:
+        # Same stable order as sorted(..., key=step_index)
+        order = sorted(range(n), key=step_index.__getitem__)
+
+    observed = 0
+    resets = 0
+
+    for i in order:
+        if jitter[i]:
+            resets += 1
+            observed = 0
+        observed += stable_ms[i]
+        if observed >= TAU_MS:
+            return NeuroPauseOut(
+                readiness=Readiness.READY,
+                tau_ms_required=TAU_MS,
+                tau_ms_observed=observed,
+                resets=resets,
+            )
+
+    return NeuroPauseOut(
+        readiness=Readiness.NOT_READY,
+        tau_ms_required=TAU_MS,
+        tau_ms_observed=observed,
+        resets=resets,
+    )
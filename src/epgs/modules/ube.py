@@ -1,42 +1,68 @@
 from __future__ import annotations
 
+from typing import List, Sequence
+
 from epgs.core.types import UBEOut, StabilityClass
 from epgs.scenarios.schema import UBEStepVector
 from epgs.profiles.base import BaseProfile
 
 
+def _violates(phi: float, degradation_rate: float, risk_load: float) -> bool:
+    return not (0.0 <= phi <= 1.0) or degradation_rate < 0.0 or risk_load < 0.0
+
+
+def _stability(
+    phi: float, degradation_rate: float, risk_load: float, p: BaseProfile
+) -> StabilityClass:
+    if (
+        phi >= p.phi_min_safe
+        and risk_load <= p.risk_load_max_safe
+        and degradation_rate <= p.degradation_max_safe
+    ):
+        return StabilityClass.SAFE
+    if phi >= (p.phi_min_safe - 0.10):
+        return StabilityClass.CAUTION
+    return StabilityClass.UNSAFE
+
+
 def classify(v: UBEStepVector, p: BaseProfile) -> UBEOut:
-    invariant_violation = False
+    return classify_values(v.phi, v.degradation_rate, v.risk_load, p)
 
-    if not (0.0 <= v.phi <= 1.0):
-        invariant_violation = True
-    if v.degradation_rate < 0.0 or v.risk_load < 0.0:
-        invariant_violation = True
 
-    if invariant_violation:
+def classify_values(
+    phi: float, degradation_rate: float, risk_load: float, p: BaseProfile
+) -> UBEOut:
+    if _violates(phi, degradation_rate, risk_load):
         return UBEOut(
-            phi=max(0.0, min(1.0, v.phi)),
-            degradation_rate=max(0.0, v.degradation_rate),
-            risk_load=max(0.0, v.risk_load),
+            phi=max(0.0, min(1.0, phi)),
+            degradation_rate=max(0.0, degradation_rate),
+            risk_load=max(0.0, risk_load),
             stability_class=StabilityClass.UNSAFE,
             invariant_violation=True,
         )
 
-    if (
-        v.phi >= p.phi_min_safe
-        and v.risk_load <= p.risk_load_max_safe
-        and v.degradation_rate <= p.degradation_max_safe
-    ):
-        sc = StabilityClass.SAFE
-    elif v.phi >= (p.phi_min_safe - 0.10):
-        sc = StabilityClass.CAUTION
-    else:
-        sc = StabilityClass.UNSAFE
-
     return UBEOut(
-        phi=v.phi,
-        degradation_rate=v.degradation_rate,
-        risk_load=v.risk_load,
-        stability_class=sc,
+        phi=phi,
+        degradation_rate=degradation_rate,
+        risk_load=risk_load,
+        stability_class=_stability(phi, degradation_rate, risk_load, p),
         invariant_violation=False,
     )
+
+
+def classify_columns(
+    phi: Sequence[float],
+    degradation_rate: Sequence[float],
+    risk_load: Sequence[float],
+    p: BaseProfile,
+) -> List[StabilityClass]:
+    """
+    Per-step stability class straight from columns (e.g. an ``.epgsc``
+    scenario), without building a UBEOut per step. Invariant violations
+    classify as UNSAFE, as in ``classify``.
+    """
+    unsafe = StabilityClass.UNSAFE
+    return [
+        unsafe if _violates(f, d, r) else _stability(f, d, r, p)
+        for f, d, r in zip(phi, degradation_rate, risk_load)
+    ]
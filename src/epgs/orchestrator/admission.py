@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+)
+
+from epgs.core.metrics import (
+    ADMISSION_ADMITTED,
+    ADMISSION_SHED,
+    ADMISSION_WAIT_SECONDS,
+    HistogramChild,
+)
+
+# ------------------------------------------------------------
+# Admission control in front of the gate
+# ------------------------------------------------------------
+# Each request names its sector_label and passes, in order:
+#
+#   1. a per-sector token bucket (rate, burst): no token -> shed
+#   2. a per-sector queue depth limit:          queue full -> shed
+#      and a bound on all queued requests: when it is reached, the newest
+#      request of the sector furthest ahead in virtual time is shed
+#      (pushed out), or the arriving one if that is its own sector
+#   3. a weighted fair queue over all sectors, which hands out a fixed
+#      number of execution slots (start-time fair queueing: a sector with
+#      weight w advances its virtual clock by 1/w per request, and the
+#      queued request with the smallest start tag runs next)
+#
+# A request that waits longer than max_wait is shed as well. Shedding is
+# fail-closed: the caller gets BLOCK / TERMINATED, never an execution.
+#
+# ``admit`` parks the calling thread while queued; ``admit_async`` waits
+# on the event loop, so an async endpoint holds no worker thread until
+# its request is admitted. max_queued is kept below AnyIO's default
+# threadpool (40 threads), so blocking callers cannot exhaust it either.
+#
+#   EPGS_ADMISSION          "0" disables admission control
+#   EPGS_ADMISSION_POLICY   JSON: {"slots": 4, "max_wait_s": 5, "max_queued": 32,
+#                                  "default": {...}, "sectors": {"ROBOTICS": {...}}}
+#                           per-sector keys: weight, rate, burst, max_depth
+
+RATE_LIMITED = "RATE_LIMITED"
+QUEUE_FULL = "QUEUE_FULL"
+QUEUE_TIMEOUT = "QUEUE_TIMEOUT"
+
+DEFAULT_WEIGHTS = {
+    "AEROSPACE_DEFENSE": 8.0,
+    "ENERGY": 8.0,
+    "MOBILITY": 2.0,
+    "ROBOTICS": 1.0,
+}
+
+
+@dataclass(frozen=True)
+class SectorPolicy:
+    weight: float = 1.0
+    rate: Optional[float] = None  # requests/s; None: unlimited
+    burst: Optional[float] = None  # bucket size; default max(1, rate)
+    max_depth: int = 64
+
+
+class Shed(Exception):
+    """
+    Raised when a request is not admitted. Carries the fail-closed body.
+    """
+
+    def __init__(self, sector: str, reason: str, retry_after: float = 1.0):
+        super().__init__(f"{sector}: {reason}")
+        self.sector = sector
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def response(self) -> Dict[str, Any]:
+        return {
+            "permission": "BLOCK",
+            "stop_issued": False,
+            "terminal_stop": True,
+            "final_state": "TERMINATED",
+            "reason_code": "ADMISSION_REJECTED",
+            "admission": {"sector": self.sector, "reason": self.reason},
+        }
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float]):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._clock = clock
+        self._t = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._t) * self.rate)
+        self._t = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """
+        Seconds until the next token.
+        """
+        self._refill()
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+@dataclass(eq=False)
+class _Ticket:
+    sector: str
+    start: float
+    order: int
+    enqueued: float
+    wake: Optional[Callable[[], None]] = None  # async waiters: called once settled
+    settled: threading.Event = field(default_factory=threading.Event)
+    shed: Optional[Shed] = None  # pushed out instead of granted
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.start, self.order) < (other.start, other.order)
+
+
+class _Sector:
+    def __init__(self, name: str, policy: SectorPolicy, clock: Callable[[], float]):
+        self.name = name
+        self.policy = policy
+        self.bucket = None
+        if policy.rate is not None:
+            burst = policy.burst if policy.burst is not None else max(1.0, policy.rate)
+            self.bucket = TokenBucket(policy.rate, burst, clock)
+        self.queue: Deque[_Ticket] = collections.deque()
+        self.last_finish = 0.0
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed: Dict[str, int] = {}
+        self.wait = HistogramChild()
+        self.wait_metric = ADMISSION_WAIT_SECONDS.labels(name)
+
+
+class AdmissionController:
+    """
+    Weighted fair admission over ``slots`` concurrent executions.
+
+        with controller.admit("ENERGY"):
+            run_scenario(...)
+
+        async with controller.admit_async("ENERGY"):
+            await run_in_threadpool(run_scenario, ...)
+
+    ``admit`` blocks until a slot is granted, or raises ``Shed``.
+    """
+
+    def __init__(
+        self,
+        slots: int = 4,
+        policies: Optional[Mapping[str, SectorPolicy]] = None,
+        default: SectorPolicy = SectorPolicy(),
+        max_wait: Optional[float] = None,
+        max_queued: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if slots < 1:
+            raise ValueError("slots must be >= 1")
+        self.slots = slots
+        self.max_wait = max_wait
+        self.max_queued = max_queued
+        self.default = default
+        self._policies = dict(policies or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sectors: Dict[str, _Sector] = {}
+        self._ready: List[_Ticket] = []  # heap of queue heads by start tag
+        self._vtime = 0.0
+        self._in_flight = 0
+        self._queued = 0
+        self._order = itertools.count()
+
+    # --------------------------------------------------------
+    # Queueing
+    # --------------------------------------------------------
+    def _sector(self, name: str) -> _Sector:
+        s = self._sectors.get(name)
+        if s is None:
+            policy = self._policies.get(name, self.default)
+            s = self._sectors[name] = _Sector(name, policy, self._clock)
+        return s
+
+    def _shed(self, s: _Sector, reason: str, retry_after: float = 1.0) -> Shed:
+        s.shed[reason] = s.shed.get(reason, 0) + 1
+        ADMISSION_SHED.inc(s.name, reason)
+        return Shed(s.name, reason, retry_after)
+
+    @staticmethod
+    def _settle(t: _Ticket) -> None:
+        t.settled.set()
+        if t.wake is not None:
+            t.wake()
+
+    def _dispatch(self) -> None:
+        # Caller holds the lock
+        while self._in_flight < self.slots and self._ready:
+            t = heapq.heappop(self._ready)
+            s = self._sectors[t.sector]
+            s.queue.popleft()
+            if s.queue:
+                heapq.heappush(self._ready, s.queue[0])
+            self._queued -= 1
+            self._vtime = max(self._vtime, t.start)
+            self._in_flight += 1
+            s.in_flight += 1
+            s.admitted += 1
+            self._settle(t)
+
+    def _remove(self, t: _Ticket) -> None:
+        # Caller holds the lock; t is queued
+        s = self._sectors[t.sector]
+        head = s.queue[0] is t
+        s.queue.remove(t)
+        self._queued -= 1
+        if head:
+            self._ready.remove(t)
+            if s.queue:
+                self._ready.append(s.queue[0])
+            heapq.heapify(self._ready)
+
+    def _push_out(self, start: float) -> bool:
+        """
+        Make room for a request with start tag ``start`` by shedding the
+        newest queued request with a later one; False if there is none.
+        """
+        # Caller holds the lock
+        tails = [s.queue[-1] for s in self._sectors.values() if s.queue]
+        victim = max(tails, key=lambda t: (t.start, t.order), default=None)
+        if victim is None or victim.start <= start:
+            return False
+        s = self._sectors[victim.sector]
+        self._remove(victim)
+        s.last_finish = victim.start  # its share of virtual time was never used
+        victim.shed = self._shed(s, QUEUE_FULL)
+        self._settle(victim)
+        return True
+
+    def _enqueue(self, sector: str, wake: Optional[Callable[[], None]] = None) -> _Ticket:
+        with self._lock:
+            s = self._sector(sector)
+            if len(s.queue) >= s.policy.max_depth:
+                raise self._shed(s, QUEUE_FULL)
+            if s.bucket is not None and not s.bucket.try_take():
+                raise self._shed(s, RATE_LIMITED, s.bucket.wait_time())
+
+            start = max(self._vtime, s.last_finish)
+            full = self.max_queued is not None and self._queued >= self.max_queued
+            if full and not self._push_out(start):
+                raise self._shed(s, QUEUE_FULL)
+            s.last_finish = start + 1.0 / s.policy.weight
+            t = _Ticket(sector, start, next(self._order), self._clock(), wake)
+            s.queue.append(t)
+            self._queued += 1
+            if len(s.queue) == 1:
+                heapq.heappush(self._ready, t)
+            self._dispatch()
+            return t
+
+    def _cancel(self, t: _Ticket) -> bool:
+        """
+        Drop a waiting ticket; False if it was settled meanwhile.
+        """
+        with self._lock:
+            if t.settled.is_set():
+                return False
+            self._remove(t)
+            return True
+
+    def _release(self, sector: str) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._sectors[sector].in_flight -= 1
+            self._dispatch()
+
+    def _timed_out(self, t: _Ticket) -> Shed:
+        with self._lock:
+            return self._shed(self._sectors[t.sector], QUEUE_TIMEOUT)
+
+    def _admitted(self, t: _Ticket) -> None:
+        if t.shed is not None:
+            raise t.shed
+        s = self._sectors[t.sector]
+        waited = max(0, int((self._clock() - t.enqueued) * 1e9))
+        s.wait.observe_ns(waited)
+        s.wait_metric.observe_ns(waited)
+        ADMISSION_ADMITTED.inc(t.sector)
+
+    @contextlib.contextmanager
+    def admit(self, sector: str) -> Iterator[None]:
+        t = self._enqueue(sector)
+        if not t.settled.wait(self.max_wait) and self._cancel(t):
+            raise self._timed_out(t)
+
+        self._admitted(t)
+        try:
+            yield
+        finally:
+            self._release(sector)
+
+    @contextlib.asynccontextmanager
+    async def admit_async(self, sector: str) -> AsyncIterator[None]:
+        """
+        ``admit`` for coroutines: waits on the running event loop instead
+        of a thread.
+        """
+        loop = asyncio.get_running_loop()
+        settled = loop.create_future()
+
+        def wake() -> None:
+            # Runs under the controller lock, possibly on another thread
+            loop.call_soon_threadsafe(_resolve, settled)
+
+        t = self._enqueue(sector, wake)
+        try:
+            await asyncio.wait_for(settled, self.max_wait)
+        except asyncio.TimeoutError:
+            if self._cancel(t):
+                raise self._timed_out(t)
+        except BaseException:
+            # Cancelled while queued: give back a slot granted meanwhile
+            if not self._cancel(t) and t.shed is None:
+                self._release(sector)
+            raise
+
+        self._admitted(t)
+        try:
+            yield
+        finally:
+            self._release(sector)
+
+    # --------------------------------------------------------
+    # Stats
+    # --------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sectors = {}
+            for name, s in sorted(self._sectors.items()):
+                sectors[name] = {
+                    "weight": s.policy.weight,
+                    "rate": s.policy.rate,
+                    "max_depth": s.policy.max_depth,
+                    "queued": len(s.queue),
+                    "in_flight": s.in_flight,
+                    "admitted": s.admitted,
+                    "shed": dict(s.shed),
+                    "tokens": round(s.bucket.tokens, 3) if s.bucket is not None else None,
+                    "wait_p50_ms": s.wait.percentile(0.50) / 1e6,
+                    "wait_p99_ms": s.wait.percentile(0.99) / 1e6,
+                }
+            return {
+                "slots": self.slots,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "max_queued": self.max_queued,
+                "sectors": sectors,
+            }
+
+    @classmethod
+    def from_env(cls) -> Optional["AdmissionController"]:
+        if os.environ.get("EPGS_ADMISSION", "1") == "0":
+            return None
+        cfg = json.loads(os.environ.get("EPGS_ADMISSION_POLICY", "{}") or "{}")
+        sectors = {
+            name: SectorPolicy(weight=weight) for name, weight in DEFAULT_WEIGHTS.items()
+        }
+        for name, spec in cfg.get("sectors", {}).items():
+            sectors[name] = SectorPolicy(**{"weight": DEFAULT_WEIGHTS.get(name, 1.0), **spec})
+        return cls(
+            slots=int(cfg.get("slots", max(4, os.cpu_count() or 1))),
+            policies=sectors,
+            default=SectorPolicy(**cfg.get("default", {})),
+            max_wait=cfg.get("max_wait_s", 30.0),
+            max_queued=cfg.get("max_queued", 32),
+        )
+
+
+def _resolve(fut: "asyncio.Future[None]") -> None:
+    if not fut.done():
+        fut.set_result(None)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import collections
+import functools
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from epgs.core.crypto import canonical_json, sha256_hex
+from epgs.core.metrics import DECISION_CACHE, DECISION_CACHE_SAVED
+from epgs.profiles import base as _profiles
+from epgs.profiles.base import PROFILE_VERSION, apply_profile
+
+
+Resolver = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def decide(scenario: Dict[str, Any], resolver: Optional[Resolver] = None) -> Dict[str, Any]:
+    """
+    The gate decision for one resolved scenario input.
+
+    Shared by ``run_scenario`` and decision replay, so a replayed input
+    goes through exactly the code that gates live runs. ``resolver``
+    replaces ``apply_profile`` only for shadow evaluation.
+    """
+    profile = (resolver or apply_profile)(scenario)
+
+    permission = profile["permission"]
+    stop_issued = profile["stop_issued"]
+
+    # --------------------------------------------------------
+    # FINAL EXECUTION STATE (EPGS CANONICAL LAW)
+    # --------------------------------------------------------
+    terminal_stop = (permission == "BLOCK") or stop_issued
+    final_state = "TERMINATED" if terminal_stop else "EXECUTED"
+
+    return {
+        "permission": permission,
+        "stop_issued": stop_issued,
+        "terminal_stop": terminal_stop,
+        "final_state": final_state,
+        "neuro_pause": profile["neuro_pause"],
+    }
+
+
+def recorded_decision(rblock: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The decision fields of a stored R-Block, in ``decide`` form.
+    """
+    return {
+        "permission": rblock.get("permission"),
+        "stop_issued": rblock.get("stop_issued"),
+        "terminal_stop": rblock.get("terminal_stop"),
+        "final_state": rblock.get("final_state"),
+        "neuro_pause": (rblock.get("neuropause") or {}).get("enabled"),
+    }
+
+
+# ------------------------------------------------------------
+# Decision identity
+# ------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
+def code_version() -> str:
+    """
+    Fingerprint of the code that makes decisions (this module and the
+    profile resolver), so editing either invalidates cached decisions.
+    """
+    h = hashlib.sha256()
+    for path in (Path(__file__), Path(_profiles.__file__)):
+        h.update(path.read_bytes().replace(b"\r\n", b"\n"))
+    return h.hexdigest()[:16]
+
+
+def decision_key(input_hash: str) -> str:
+    """
+    Cache key: (scenario content, profile version, code version).
+    """
+    return sha256_hex(canonical_json([input_hash, PROFILE_VERSION, code_version()]))
+
+
+def decision_hash(key: str, decision: Dict[str, Any]) -> str:
+    return sha256_hex(canonical_json({"key": key, "decision": decision}))
+
+
+# ------------------------------------------------------------
+# Decision cache (opt-in)
+# ------------------------------------------------------------
+# Maps decision_key -> decision for identical resubmitted inputs. Every
+# run still writes its own R-Block; the block records decision_hash,
+# which is the same whether the decision was computed or cached.
+#
+#   EPGS_DECISION_CACHE       max cached decisions (unset/0: disabled)
+#   EPGS_DECISION_CACHE_TTL   seconds a decision stays valid (default 300)
+
+
+class CachedDecision(NamedTuple):
+    decision: Dict[str, Any]
+    decision_hash: str
+    cost_s: float
+    expires: float
+
+
+class DecisionCache:
+    """
+    Thread-safe LRU of decisions with a TTL and a size bound.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._items: collections.OrderedDict[str, CachedDecision] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_s = 0.0
+
+    def get(self, key: str) -> Optional[CachedDecision]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry.expires <= self._clock():
+                del self._items[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                DECISION_CACHE.inc("miss")
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            self.saved_s += entry.cost_s
+        DECISION_CACHE.inc("hit")
+        DECISION_CACHE_SAVED.inc(amount=entry.cost_s)
+        return entry
+
+    def put(self, key: str, decision: Dict[str, Any], digest: str, cost_s: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = CachedDecision(decision, digest, cost_s, self._clock() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": self.saved_s,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+            self.saved_s = 0.0
+
+    @classmethod
+    def from_env(cls) -> Optional["DecisionCache"]:
+        size = int(os.environ.get("EPGS_DECISION_CACHE", "0") or 0)
+        if size <= 0:
+            return None
+        return cls(size, float(os.environ.get("EPGS_DECISION_CACHE_TTL", "300")))
+
+
+def decide_input(
+    scenario: Dict[str, Any],
+    input_hash: str,
+    cache: Optional[DecisionCache] = None,
+) -> tuple[Dict[str, Any], str, bool]:
+    """
+    (decision, decision_hash, cached) for a scenario whose content hash is
+    ``input_hash``, consulting ``cache`` when given.
+    """
+    key = decision_key(input_hash)
+    if cache is not None:
+        entry = cache.get(key)
+        if entry is not None:
+            return entry.decision, entry.decision_hash, True
+
+    t0 = time.perf_counter()
+    decision = decide(scenario)
+    digest = decision_hash(key, decision)
+    if cache is not None:
+        cache.put(key, decision, digest, time.perf_counter() - t0)
+    return decision, digest, False
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import random
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from epgs.orchestrator.replay import list_rblock_files
+
+# Modules whose import order is shuffled in fresh interpreters, so that
+# hidden import-time state cannot leak into decisions unnoticed.
+_EPGS_MODULES = [
+    "epgs.core.crypto",
+    "epgs.core.types",
+    "epgs.profiles.base",
+    "epgs.scenarios.schema",
+    "epgs.scenarios.load",
+    "epgs.modules.neuropause",
+    "epgs.modules.ube",
+    "epgs.modules.aegixa",
+    "epgs.modules.nrrp",
+    "epgs.modules.execution_sink",
+    "epgs.ledger.inputs",
+    "epgs.ledger.runs",
+    "epgs.orchestrator.decision",
+    "epgs.orchestrator.replay",
+    "epgs.orchestrator.run",
+]
+
+
+# ------------------------------------------------------------
+# Single repetition
+# ------------------------------------------------------------
+def run_once(scenario_path: str, out_dir: str) -> Dict[str, Any]:
+    """
+    Run a scenario once with full isolation by output directory.
+    """
+    from epgs.orchestrator.run import run_scenario
+
+    # Every repetition is the same decision (seq 0), whatever earlier
+    # runs left in out_dir's sequence counters.
+    result = run_scenario(scenario_path, output_root=out_dir, seq=0)
+    return {
+        "execution_hash": result["execution_hash"],
+        "ledger_dir": result["ledger_dir"],
+    }
+
+
+def run_in_interpreter(scenario_path: str, out_dir: str, seed: int) -> Dict[str, Any]:
+    """
+    Run a scenario in a fresh interpreter with its own PYTHONHASHSEED and a
+    seed-shuffled import order.
+    """
+    env = dict(os.environ, PYTHONHASHSEED=str(seed))
+    proc = subprocess.run(
+        [
+            sys.executable, "-m", "epgs.orchestrator.determinism",
+            scenario_path, out_dir, "--import-seed", str(seed),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+# ------------------------------------------------------------
+# Comparison
+# ------------------------------------------------------------
+def ledger_snapshot(ledger_dir: str) -> List[Tuple[str, bytes]]:
+    return [(f.name, f.read_bytes()) for f in list_rblock_files(ledger_dir)]
+
+
+def first_diff_offset(a: bytes, b: bytes) -> Optional[int]:
+    if a == b:
+        return None
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
+
+
+def compare_ledgers(
+    ref: List[Tuple[str, bytes]],
+    other: List[Tuple[str, bytes]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Locate the first divergence between two ledger snapshots.
+
+    ``offset`` is relative to the start of ``file``; a missing or extra
+    block is reported at the end of the shorter ledger.
+    """
+    for (ref_name, ref_raw), (name, raw) in zip(ref, other):
+        offset = first_diff_offset(ref_raw, raw)
+        if offset is not None or ref_name != name:
+            return {"file": ref_name, "other_file": name, "offset": offset or 0}
+
+    if len(ref) != len(other):
+        return {"file": None, "other_file": None, "offset": None, "blocks": [len(ref), len(other)]}
+
+    return None
+
+
+# ------------------------------------------------------------
+# Harness
+# ------------------------------------------------------------
+def prove(
+    scenarios: List[Path],
+    base_out: Path,
+    repeats: int = 2,
+    interpreters: int = 1,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run every scenario ``repeats`` times across a process pool plus
+    ``interpreters`` times in separate interpreters, then compare each run's
+    execution_hash and ledger bytes against the first run.
+    """
+    jobs = []
+    for scenario in scenarios:
+        for k in range(repeats):
+            jobs.append((scenario, "pool", k))
+        for k in range(interpreters):
+            jobs.append((scenario, "interpreter", k))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            ThreadPoolExecutor(max_workers=workers) as spawner:
+        futures = []
+        for scenario, mode, k in jobs:
+            out_dir = str(base_out / f"{scenario.stem}_{mode}{k + 1}")
+            if mode == "pool":
+                fut = pool.submit(run_once, str(scenario), out_dir)
+            else:
+                fut = spawner.submit(run_in_interpreter, str(scenario), out_dir, k + 1)
+            futures.append(fut)
+
+        results = [f.result() for f in futures]
+
+    by_scenario: Dict[Path, List[Dict[str, Any]]] = {}
+    for (scenario, mode, k), res in zip(jobs, results):
+        by_scenario.setdefault(scenario, []).append({"mode": mode, "rep": k + 1, **res})
+
+    report = {"ok": True, "repeats": repeats, "interpreters": interpreters, "scenarios": []}
+
+    for scenario, runs in by_scenario.items():
+        ref = runs[0]
+        ref_ledger = ledger_snapshot(ref["ledger_dir"])
+        divergences = []
+
+        for run in runs[1:]:
+            diff = compare_ledgers(ref_ledger, ledger_snapshot(run["ledger_dir"]))
+            hash_match = run["execution_hash"] == ref["execution_hash"]
+            if diff is not None or not hash_match:
+                divergences.append({
+                    "mode": run["mode"],
+                    "rep": run["rep"],
+                    "execution_hash": run["execution_hash"],
+                    "hash_match": hash_match,
+                    **(diff or {}),
+                })
+
+        entry = {
+            "scenario": scenario.stem,
+            "path": str(scenario),
+            "reference_hash": ref["execution_hash"],
+            "runs": runs,
+            "divergences": divergences,
+            "ok": not divergences,
+        }
+        report["ok"] = report["ok"] and entry["ok"]
+        report["scenarios"].append(entry)
+
+    return report
+
+
+def to_junit(report: Dict[str, Any]) -> str:
+    suite = ET.Element(
+        "testsuite",
+        name="epgs-determinism",
+        tests=str(len(report["scenarios"])),
+        failures=str(sum(not s["ok"] for s in report["scenarios"])),
+    )
+
+    for s in report["scenarios"]:
+        case = ET.SubElement(suite, "testcase", classname="determinism", name=s["scenario"])
+        for d in s["divergences"]:
+            failure = ET.SubElement(
+                case,
+                "failure",
+                message=(
+                    f"{d['mode']} run {d['rep']} diverged "
+                    f"(hash_match={d['hash_match']}, file={d.get('file')}, "
+                    f"offset={d.get('offset')})"
+                ),
+            )
+            failure.text = json.dumps(d, sort_keys=True)
+
+    return ET.tostring(suite, encoding="unicode")
+
+
+# ------------------------------------------------------------
+# Fresh-interpreter worker
+# ------------------------------------------------------------
+def _worker_main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scenario_path")
+    parser.add_argument("out_dir")
+    parser.add_argument("--import-seed", type=int, default=0)
+    args = parser.parse_args()
+
+    order = list(_EPGS_MODULES)
+    random.Random(args.import_seed).shuffle(order)
+    for name in order:
+        importlib.import_module(name)
+
+    print(json.dumps(run_once(args.scenario_path, args.out_dir)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_worker_main())
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import Any, ContextManager, Dict, Optional
+
+from epgs.orchestrator.admission import AdmissionController
+from epgs.orchestrator.run import run_scenario
+from epgs.orchestrator.shadow import ShadowEvaluator
+from epgs.scenarios.load import Validated, load_source
+
+# ------------------------------------------------------------
+# The gate: one entry point for every transport
+# ------------------------------------------------------------
+# HTTP /run and the socket daemon both run a request through the same
+# steps, so they cannot drift apart:
+#
+#   1. validate   full schema validation of the scenario content, once per
+#                 content hash (optionally pinned by scenario_sha256)
+#   2. admit      sector-aware admission control; Shed when not admitted
+#   3. run        run_scenario on exactly the validated content
+#   4. shadow     hand the recorded result to the shadow evaluator
+#
+# Errors surface as raised: pydantic ValidationError (invalid scenario),
+# ContentHashMismatch (pinned content changed), any other ValueError
+# (content that cannot be decoded), Shed (not admitted). Each transport
+# maps them to its own error form.
+
+
+def _execute(
+    loaded: Validated,
+    scenario_path: str,
+    output_root: Optional[str],
+    deadline_ms: Optional[float],
+    started: float,
+    shadow: Optional[ShadowEvaluator],
+    profiling: Optional[ContextManager[Any]],
+) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"source": loaded.source}
+    if deadline_ms is not None:
+        # Validation and queueing already spent part of the budget
+        kwargs["deadline_ms"] = max(0.0, deadline_ms - (time.monotonic() - started) * 1000.0)
+
+    with profiling or contextlib.nullcontext():
+        if output_root is not None:
+            result = run_scenario(scenario_path, output_root, **kwargs)
+        else:
+            result = run_scenario(scenario_path, **kwargs)
+
+    # Decision made and recorded: the shadow only ever sees it afterwards
+    if shadow is not None:
+        shadow.submit(result, "." if output_root is None else output_root)
+    return result
+
+
+def gate(
+    scenario_path: str,
+    output_root: Optional[str] = None,
+    deadline_ms: Optional[float] = None,
+    scenario_sha256: Optional[str] = None,
+    admission: Optional[AdmissionController] = None,
+    shadow: Optional[ShadowEvaluator] = None,
+    profiling: Optional[ContextManager[Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Validate, admit, run and shadow one request, on the calling thread.
+    """
+    started = time.monotonic()
+    loaded = load_source(scenario_path, scenario_sha256)
+    args = (loaded, scenario_path, output_root, deadline_ms, started, shadow, profiling)
+    if admission is None:
+        return _execute(*args)
+    with admission.admit(loaded.model.sector_label):
+        return _execute(*args)
+
+
+async def gate_async(
+    scenario_path: str,
+    output_root: Optional[str] = None,
+    deadline_ms: Optional[float] = None,
+    scenario_sha256: Optional[str] = None,
+    admission: Optional[AdmissionController] = None,
+    shadow: Optional[ShadowEvaluator] = None,
+    profiling: Optional[ContextManager[Any]] = None,
+) -> Dict[str, Any]:
+    """
+    ``gate`` for the event loop: a queued request waits on the loop and
+    holds no worker thread; validation and admitted runs go to the
+    threadpool.
+    """
+    from starlette.concurrency import run_in_threadpool
+
+    started = time.monotonic()
+    loaded = await run_in_threadpool(load_source, scenario_path, scenario_sha256)
+    args = (loaded, scenario_path, output_root, deadline_ms, started, shadow, profiling)
+    if admission is None:
+        return await run_in_threadpool(_execute, *args)
+    async with admission.admit_async(loaded.model.sector_label):
+        return await run_in_threadpool(_execute, *args)
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 import json
+import os
 import re
 
-from epgs.core.crypto import chained_hash
+from epgs.core.crypto import chained_hash, canonical_json, sha256_hex
+from epgs.core.deadline import DEADLINE_EXCEEDED
+from epgs.core.metrics import VERIFICATIONS, VERIFY_SECONDS
+from epgs.core.profiling import profiled
+
+if TYPE_CHECKING:
+    from epgs.ledger.inputs import InputStore
 
 GENESIS_HASH = "0" * 64
 
@@ -19,15 +28,93 @@ def load_rblock(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def verify_chain(ledger_dir: str) -> dict:
+def normalize_ledger_dir(ledger_dir: str) -> Path:
+    p = Path(ledger_dir)
+
+    # ✅ ABSOLUTE RULE: if <path>/ledger exists, use it
+    ledger = p / "ledger"
+    if ledger.exists() and ledger.is_dir():
+        return ledger
+
+    # rblock file → parent
+    if p.exists() and p.is_file() and p.suffix == ".json":
+        return p.parent
+
+    # direct ledger dir
+    if p.exists() and p.is_dir():
+        return p
+
+    return p  # verify_chain will fail cleanly if invalid
+
+
+def list_rblock_files(ledger_dir: str | Path) -> list[Path]:
+    """
+    R-Block files of a ledger directory, in chain order.
+    """
     p = Path(ledger_dir)
 
     # Only accept real R-block files
-    files = sorted(
+    return sorted(
         f for f in p.glob("*.json")
         if _RBLOCK_RE.match(f.name)
     )
 
+
+def find_ledgers(root: str | Path, pattern: str = "**") -> list[Path]:
+    """
+    Directories under ``root`` matching ``pattern`` that hold R-Blocks.
+    """
+    p = Path(root)
+    return [
+        d for d in sorted(p.glob(pattern))
+        if d.is_dir() and list_rblock_files(d)
+    ]
+
+
+def check_rblock(rb: dict, prev: str, name: str) -> str | None:
+    """
+    Check one R-Block against the hash of its predecessor.
+
+    Returns the failure reason, or None when the block chains correctly.
+    """
+    payload = dict(rb)
+
+    embedded_prev = payload.pop("previous_hash")
+    embedded_hash = payload.pop("rblock_hash")
+
+    if embedded_prev != prev:
+        return f"previous_hash mismatch in {name}"
+
+    recomputed = chained_hash(payload, prev)
+    if recomputed != embedded_hash:
+        return f"hash mismatch in {name}"
+
+    return None
+
+
+_T_VERIFY = VERIFY_SECONDS.labels()
+
+
+def _profile_target(result: dict, ledger_dir: str) -> tuple[str, Path]:
+    # Keyed by the run_id of the chain head, next to the ledger directory
+    p = Path(ledger_dir)
+    files = list_rblock_files(p)
+    key = load_rblock(files[-1]).get("run_id") if files else None
+    return key or p.name, p.parent / "profiles"
+
+
+@profiled("verify_chain", _profile_target)
+def verify_chain(ledger_dir: str) -> dict:
+    with _T_VERIFY.time():
+        result = _verify_chain(ledger_dir)
+
+    VERIFICATIONS.inc("true" if result["ok"] else "false")
+    return result
+
+
+def _verify_chain(ledger_dir: str) -> dict:
+    files = list_rblock_files(ledger_dir)
+
     if not files:
         return {"ok": False, "reason": "No R-Blocks found"}
 
@@ -35,28 +122,241 @@ def verify_chain(ledger_dir: str) -> dict:
 
     for f in files:
         rb = load_rblock(f)
-        payload = dict(rb)
 
-        embedded_prev = payload.pop("previous_hash")
-        embedded_hash = payload.pop("rblock_hash")
-
-        if embedded_prev != prev:
+        reason = check_rblock(rb, prev, f.name)
+        if reason is not None:
             return {
                 "ok": False,
-                "reason": f"previous_hash mismatch in {f.name}",
+                "reason": reason,
             }
 
-        recomputed = chained_hash(payload, prev)
-        if recomputed != embedded_hash:
-            return {
-                "ok": False,
-                "reason": f"hash mismatch in {f.name}",
-            }
-
-        prev = embedded_hash
+        prev = rb["rblock_hash"]
 
     return {
         "ok": True,
         "final_hash": prev,
         "count": len(files),
     }
+
+
+# ------------------------------------------------------------
+# Many ledgers at once
+# ------------------------------------------------------------
+def root_hash(final_hashes: dict[str, str]) -> str:
+    """
+    One hash over a set of ledgers: sha256 of the canonical JSON list of
+    ``[ledger, final_hash]`` pairs, sorted by ledger path.
+    """
+    return sha256_hex(canonical_json(sorted(final_hashes.items())))
+
+
+def verify_many(
+    root: str | Path,
+    pattern: str = "**",
+    workers: int | None = None,
+) -> Iterator[dict]:
+    """
+    Verify every ledger under ``root`` matching ``pattern``, concurrently.
+
+    Yields one ``{"type": "ledger", "ledger": <path relative to root>, ...}``
+    record per ledger as soon as it is verified (completion order), then a
+    final ``{"type": "summary", ...}`` record. The summary carries
+    ``root_hash`` over all final hashes when every ledger verified, and
+    None otherwise.
+    """
+    base = Path(root)
+    ledgers = find_ledgers(base, pattern)
+    workers = max(1, workers or min(32, (os.cpu_count() or 1) + 4))
+
+    finals: dict[str, str] = {}
+    failed: list[str] = []
+    blocks = 0
+
+    def one(d: Path) -> dict:
+        rec = {"type": "ledger", "ledger": d.relative_to(base).as_posix()}
+        try:
+            return {**rec, **verify_chain(str(d))}
+        except (OSError, ValueError, KeyError, TypeError):
+            # One malformed R-Block fails its ledger, never the stream
+            return {**rec, "ok": False, "reason": "unreadable block"}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        todo = iter(ledgers)
+        pending = set()
+        while True:
+            # Bounded window: never more than 2x workers results in flight
+            for d in todo:
+                pending.add(pool.submit(one, d))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                rec = fut.result()
+                if rec["ok"]:
+                    finals[rec["ledger"]] = rec["final_hash"]
+                    blocks += rec["count"]
+                else:
+                    failed.append(rec["ledger"])
+                yield rec
+
+    ok = bool(ledgers) and not failed
+    summary = {
+        "type": "summary",
+        "ok": ok,
+        "ledgers": len(ledgers),
+        "verified": len(finals),
+        "failed": sorted(failed),
+        "blocks": blocks,
+        "root_hash": root_hash(finals) if ok else None,
+    }
+    if not ledgers:
+        summary["reason"] = "No ledgers found"
+    yield summary
+
+
+# ------------------------------------------------------------
+# Decision replay
+# ------------------------------------------------------------
+def _replay_input(digest: str, stores: list[InputStore]) -> dict:
+    from epgs.orchestrator.decision import decide
+
+    for store in stores:
+        try:
+            return decide(store.get(digest))
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError(f"input {digest} not found")
+
+
+def replay_decisions(
+    root: str | Path,
+    pattern: str = "**",
+    workers: int | None = None,
+    store: str | Path | None = None,
+) -> Iterator[dict]:
+    """
+    Re-derive the decision behind every R-Block under ``root`` from its
+    recorded input (``input_hash``) with the current code, concurrently.
+
+    Inputs are looked up in ``store`` or, by default, in the ``inputs``
+    directory next to each ledger and then under ``root``. Each unique
+    input is decided once however many blocks share it.
+
+    Yields a ``{"type": "divergence", ...}`` record for every block whose
+    recorded decision differs, a ``{"type": "error", ...}`` record for
+    every block whose input is missing or corrupt, then a final
+    ``{"type": "summary", ...}`` record. Blocks that failed closed on
+    their deadline are counted, not replayed. Hash chains are not checked
+    here; see ``verify_many``.
+    """
+    # Not at module level: verify never needs the decision engine
+    from epgs.ledger.inputs import InputStore
+    from epgs.orchestrator.decision import recorded_decision
+
+    base = Path(root)
+    ledgers = find_ledgers(base, pattern)
+    workers = max(1, workers or min(32, (os.cpu_count() or 1) + 4))
+    shared = [InputStore(store)] if store is not None else None
+
+    decided: dict[str, dict] = {}
+    waiting: dict[str, list[tuple[str, str, dict]]] = {}
+    stats = {
+        "blocks": 0,
+        "replayed": 0,
+        "unrecorded": 0,
+        "failed_closed": 0,
+        "divergences": 0,
+        "errors": 0,
+    }
+
+    def compare(digest: str, ledger: str, name: str, rb: dict) -> dict | None:
+        outcome = decided[digest]
+        if "error" in outcome:
+            stats["errors"] += 1
+            return {
+                "type": "error",
+                "ledger": ledger,
+                "block": name,
+                "input_hash": digest,
+                "reason": outcome["error"],
+            }
+
+        stats["replayed"] += 1
+        recorded = recorded_decision(rb)
+        diff = {
+            k: {"recorded": recorded[k], "replayed": v}
+            for k, v in outcome.items()
+            if recorded[k] != v
+        }
+        if not diff:
+            return None
+        stats["divergences"] += 1
+        return {
+            "type": "divergence",
+            "ledger": ledger,
+            "block": name,
+            "scenario": rb.get("scenario"),
+            "input_hash": digest,
+            "diff": diff,
+        }
+
+    def settle(done) -> Iterator[dict]:
+        for fut in done:
+            digest = pending.pop(fut)
+            try:
+                decided[digest] = fut.result()
+            except (OSError, ValueError) as e:
+                decided[digest] = {"error": str(e)}
+            for ledger, name, rb in waiting.pop(digest):
+                rec = compare(digest, ledger, name, rb)
+                if rec is not None:
+                    yield rec
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: dict = {}
+
+        for d in ledgers:
+            rel = d.relative_to(base).as_posix()
+            stores = shared or [InputStore(d.parent / "inputs"), InputStore(base / "inputs")]
+
+            for f in list_rblock_files(d):
+                rb = load_rblock(f)
+                if rb.get("type") == "epoch":
+                    continue
+                stats["blocks"] += 1
+                digest = rb.get("input_hash")
+                if rb.get("reason_code") == DEADLINE_EXCEEDED:
+                    # Failed closed on time, not decided: nothing to re-derive
+                    stats["failed_closed"] += 1
+                elif digest is None:
+                    stats["unrecorded"] += 1
+                elif digest in decided:
+                    rec = compare(digest, rel, f.name, rb)
+                    if rec is not None:
+                        yield rec
+                elif digest in waiting:
+                    waiting[digest].append((rel, f.name, rb))
+                else:
+                    waiting[digest] = [(rel, f.name, rb)]
+                    pending[pool.submit(_replay_input, digest, stores)] = digest
+                    # Bounded window: never more than 2x workers inputs in flight
+                    if len(pending) >= 2 * workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from settle(done)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from settle(done)
+
+    summary = {
+        "type": "summary",
+        "ok": bool(ledgers) and not stats["divergences"] and not stats["errors"],
+        "ledgers": len(ledgers),
+        **stats,
+        "unique_inputs": len(decided),
+    }
+    if not ledgers:
+        summary["reason"] = "No ledgers found"
+    yield summary
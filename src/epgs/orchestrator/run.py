@@ -1,89 +1,180 @@
 from __future__ import annotations
 
 import json
-import uuid
+import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from epgs.core.crypto import chained_hash
-from epgs.profiles.base import apply_profile
+from epgs.core.deadline import DEADLINE_EXCEEDED, Deadline
+from epgs.core.ids import SequenceAllocator, mint
+from epgs.core.metrics import DECISIONS, LEDGER_BYTES, STAGE_SECONDS, stage_clock
+from epgs.core.profiling import profiled
+from epgs.ledger.inputs import InputStore
+from epgs.ledger.runs import RunStore, run_store
+from epgs.ledger.sharded import run_ledger, shard_dir_name
+from epgs.orchestrator.decision import DecisionCache, decide_input
+from epgs.orchestrator.replay import find_ledgers, list_rblock_files, load_rblock
+from epgs.scenarios.source import Source, read_source
 
 GENESIS_HASH = "0" * 64
 
-# Stable namespace for per-scenario determinism
-NAMESPACE = uuid.UUID("12345678-1234-5678-1234-567812345678")
+# Process-wide decision cache, opt-in via EPGS_DECISION_CACHE
+DEFAULT_DECISION_CACHE = DecisionCache.from_env()
 
+# Fail-closed decision for a run that overran its deadline
+FAIL_CLOSED = {
+    "permission": "BLOCK",
+    "stop_issued": False,
+    "terminal_stop": True,
+    "final_state": "TERMINATED",
+    "neuro_pause": False,
+}
 
+# Per-stage latency (bound once: labels() is off the hot path)
+_T_LOAD = STAGE_SECONDS.labels("load")
+_T_INPUT = STAGE_SECONDS.labels("input_store")
+_T_PROFILE = STAGE_SECONDS.labels("profile")
+_T_LEDGER_RESET = STAGE_SECONDS.labels("ledger_reset")
+_T_HASH = STAGE_SECONDS.labels("hash")
+_T_LEDGER_WRITE = STAGE_SECONDS.labels("ledger_write")
+_T_TOTAL = STAGE_SECONDS.labels("total")
+
+
+def _profile_target(result: Dict[str, Any], *args, **kwargs) -> tuple[str, Path]:
+    # <output_root>/profiles/<run_id>/, next to <output_root>/ledger
+    return result["run_id"], Path(result["ledger_dir"]).parent / "profiles"
+
+
+@profiled("run_scenario", _profile_target)
 def run_scenario(
     scenario_path: str,
     output_root: str = ".",
+    seq: Optional[int] = None,
+    decision_cache: Optional[DecisionCache] = None,
+    deadline_ms: Optional[float] = None,
+    source: Optional[Source] = None,
 ) -> Dict[str, Any]:
-    scenario_path = Path(scenario_path).resolve()
-    output_root = Path(output_root).resolve()
+    """
+    Gate one scenario and write its R-Block to ``<output_root>/ledger``.
+
+    ``source`` is the scenario as already read (and validated) by the
+    caller, e.g. from ``load_source``; the run then decides on exactly
+    that content and ``scenario_path`` is not read again.
+
+    ``seq`` is the decision's sequence number; by default the next one is
+    taken from ``<output_root>/ids``. Batch runners can instead reserve a
+    range with ``SequenceAllocator.reserve`` and pass each number in.
+
+    ``decision_cache`` reuses decisions for identical inputs (default:
+    the EPGS_DECISION_CACHE cache, if enabled). The R-Block is written
+    either way.
 
-    scenario_obj = json.loads(scenario_path.read_text(encoding="utf-8"))
+    ``deadline_ms`` bounds the run. Stages check the remaining budget at
+    their boundaries; a run past its deadline fails closed to
+    BLOCK/TERMINATED with reason_code DEADLINE_EXCEEDED in its R-Block.
+    The result then carries a per-stage ``deadline`` report.
+    """
+    if decision_cache is None:
+        decision_cache = DEFAULT_DECISION_CACHE
+
+    deadline = Deadline(deadline_ms)
+    clock = stage_clock()
+    if source is None:
+        source = read_source(scenario_path)
+    result = _run_scenario(source, output_root, seq, decision_cache, deadline, clock)
+    clock.total(_T_TOTAL)
+
+    DECISIONS.inc(result["permission"], result["final_state"])
+    return result
+
+
+def _run_scenario(
+    source: Source,
+    output_root: str,
+    seq: Optional[int],
+    decision_cache: Optional[DecisionCache],
+    deadline: Deadline,
+    clock,
+) -> Dict[str, Any]:
+    # Canonical internal key (on a copy: sources are shared)
+    scenario_name = source.name
+    scenario = {**source.data, "scenario": scenario_name}
+    output_root = Path(output_root).resolve()
+    clock.mark(_T_LOAD)
 
     # --------------------------------------------------------
-    # Resolve scenario source (robust + deterministic)
+    # Recorded input (content-addressed, so the decision can be replayed)
     # --------------------------------------------------------
-    if "path" in scenario_obj:
-        resolved = (scenario_path.parent / scenario_obj["path"]).resolve()
-        scenario = json.loads(resolved.read_text(encoding="utf-8"))
-        scenario_name = (
-            scenario.get("scenario")
-            or scenario.get("scenario_id")
-            or resolved.stem
-        )
-    else:
-        scenario = scenario_obj
-        scenario_name = (
-            scenario.get("scenario")
-            or scenario.get("scenario_id")
-            or scenario_path.stem
-        )
-
-    # Canonical internal key
-    scenario["scenario"] = str(scenario_name)
+    input_hash = decision_hash = None
+    cached = False
+    if deadline.check("load"):
+        input_hash = InputStore(output_root / "inputs").put(scenario)
+        clock.mark(_T_INPUT)
 
     # --------------------------------------------------------
-    # Deterministic identifiers (per scenario)
+    # Governance decision (shared with decision replay; cacheable)
     # --------------------------------------------------------
-    run_id = str(uuid.uuid5(NAMESPACE, f"{scenario_name}::run"))
-    rblock_id = str(uuid.uuid5(NAMESPACE, f"{scenario_name}::rblock"))
+    if deadline.check("input_store"):
+        decision, decision_hash, cached = decide_input(scenario, input_hash, decision_cache)
+        clock.mark(_T_PROFILE)
+        deadline.check("decision")
 
     # --------------------------------------------------------
-    # Governance profile
+    # Ledger directory (RESET PER EXECUTION — CRITICAL FIX)
     # --------------------------------------------------------
-    profile = apply_profile(scenario)
+    ledger_dir = output_root / "ledger"
+
+    # Opt-in (EPGS_LEDGER_SHARDS): R-Blocks accumulate in a sharded ledger
+    # there instead, appended to in parallel; nothing is cleared
+    sharded = run_ledger(ledger_dir)
+
+    runs = run_store(output_root)
+
+    if sharded is None:
+        # Before it is cleared: record a block a crashed run left behind
+        if runs is not None and ledger_dir.exists():
+            _record_orphans(runs, ledger_dir, output_root)
 
-    permission = profile["permission"]
-    stop_issued = profile["stop_issued"]
-    neuro_pause = profile["neuro_pause"]
+        # IMPORTANT:
+        # Each run must be isolated. Clear any previous R-Blocks.
+        if ledger_dir.exists():
+            for f in ledger_dir.glob("*.json"):
+                f.unlink()
+        else:
+            ledger_dir.mkdir(parents=True, exist_ok=True)
+    clock.mark(_T_LEDGER_RESET)
+    deadline.check("ledger_reset")
 
     # --------------------------------------------------------
-    # FINAL EXECUTION STATE (EPGS CANONICAL LAW)
+    # FAIL-CLOSED: a decision reached past the deadline is not acted on
     # --------------------------------------------------------
-    terminal_stop = (permission == "BLOCK") or stop_issued
-    final_state = "TERMINATED" if terminal_stop else "EXECUTED"
+    if deadline.exceeded:
+        decision, decision_hash, cached = FAIL_CLOSED, None, False
+
+    permission = decision["permission"]
+    stop_issued = decision["stop_issued"]
+    neuro_pause = decision["neuro_pause"]
+    terminal_stop = decision["terminal_stop"]
+    final_state = decision["final_state"]
 
     # --------------------------------------------------------
-    # Ledger directory (RESET PER EXECUTION — CRITICAL FIX)
+    # Deterministic identifiers: (scenario, seq, chain head); a sharded
+    # append re-mints them on its shard's head
     # --------------------------------------------------------
-    ledger_dir = output_root / "ledger"
-
-    # IMPORTANT:
-    # Each run must be isolated. Clear any previous R-Blocks.
-    if ledger_dir.exists():
-        for f in ledger_dir.glob("*.json"):
-            f.unlink()
-    else:
-        ledger_dir.mkdir(parents=True, exist_ok=True)
+    previous_hash = GENESIS_HASH
+    if seq is None:
+        seq = SequenceAllocator(output_root).next(scenario_name)
+    run_id, rblock_id = mint(scenario_name, seq, previous_hash)
 
     # --------------------------------------------------------
     # R-Block payload
     # --------------------------------------------------------
     rblock_payload = {
         "scenario": scenario["scenario"],
+        "seq": seq,
+        "input_hash": input_hash,
+        "decision_hash": decision_hash,
         "run_id": run_id,
         "rblock_id": rblock_id,
         "permission": permission,
@@ -95,33 +186,54 @@ def run_scenario(
             "tau_ms_observed": 0,
         },
     }
+    if deadline.exceeded:
+        rblock_payload["reason_code"] = DEADLINE_EXCEEDED
+        rblock_payload["deadline"] = {
+            "budget_ms": deadline.budget_ms,
+            "stage": deadline.exceeded_at,
+        }
 
-    previous_hash = GENESIS_HASH
-    rblock_hash = chained_hash(rblock_payload, previous_hash)
+    if sharded is not None:
+        # Ids minted, hashed and written onto its shard's head, under that
+        # shard's lock only (timed as ledger_write)
+        def mint_on(head: str) -> Dict[str, Any]:
+            return dict(zip(("run_id", "rblock_id"), mint(scenario_name, seq, head)))
 
-    rblock = {
-        **rblock_payload,
-        "previous_hash": previous_hash,
-        "rblock_hash": rblock_hash,
-    }
+        rblock_payload["sector_label"] = scenario.get("sector_label")
+        del rblock_payload["run_id"], rblock_payload["rblock_id"]
+        rblock = sharded.append(rblock_payload, mint=mint_on)
+        run_id, rblock_id = rblock["run_id"], rblock["rblock_id"]
+        rblock_hash = rblock["rblock_hash"]
+        ledger_dir = sharded.root / shard_dir_name(rblock["shard"])
+    else:
+        rblock_hash = chained_hash(rblock_payload, previous_hash)
+
+        rblock = {
+            **rblock_payload,
+            "previous_hash": previous_hash,
+            "rblock_hash": rblock_hash,
+        }
+
+        clock.mark(_T_HASH)
 
-    rblock_path = ledger_dir / f"{rblock_id}.json"
-    rblock_path.write_text(
-        json.dumps(
+        rblock_path = ledger_dir / f"{rblock_id}.json"
+        raw = json.dumps(
             rblock,
             sort_keys=True,
             separators=(",", ":"),
             ensure_ascii=True,
-        ),
-        encoding="utf-8",
-    )
+        )
 
     # --------------------------------------------------------
-    # Return result (API + REPLAY SAFE)
+    # Result (API + REPLAY SAFE)
     # --------------------------------------------------------
-    return {
+    result = {
         "run_id": run_id,
         "rblock_id": rblock_id,
+        "seq": seq,
+        "input_hash": input_hash,
+        "decision_hash": decision_hash,
+        "decision_cached": cached,
         "permission": permission,
         "stop_issued": stop_issued,
         "terminal_stop": terminal_stop,
@@ -130,3 +242,141 @@ def run_scenario(
         "execution_hash": rblock_hash,
         "ledger_dir": str(ledger_dir),
     }
+    if deadline.exceeded:
+        result["reason_code"] = DEADLINE_EXCEEDED
+
+    # --------------------------------------------------------
+    # R-Block (atomically in place), then its run-result row
+    # --------------------------------------------------------
+    if sharded is None:
+        # A sharded append has already written (and counted) its block
+        tmp = ledger_dir / f".{rblock_id}.json.tmp"
+        try:
+            tmp.write_text(raw, encoding="utf-8")
+            os.replace(tmp, rblock_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        LEDGER_BYTES.inc(amount=len(raw))
+    if runs is not None:
+        runs.record(result, scenario_name, scenario.get("sector_label"))
+    clock.mark(_T_LEDGER_WRITE)
+
+    if deadline.budget_ms is not None:
+        deadline.charge("ledger_write")
+        result["deadline"] = deadline.report()
+    return result
+
+
+# ------------------------------------------------------------
+# Orphan R-Blocks
+# ------------------------------------------------------------
+# A run writes its R-Block before the run-store row. If it dies in
+# between, the block has no row. The per-run ledger holds at most the
+# previous run's block, which the next run records (if orphaned) before
+# clearing it. Sharded ledgers are never cleared and grow without bound:
+# ``reconcile`` records their orphans off the run path, at startup
+# (EPGS_RECONCILE) or via ``epgs runs --reconcile``.
+
+
+def _load(f: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return load_rblock(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _hash_of(f: Path) -> Optional[str]:
+    rb = _load(f)
+    return rb.get("rblock_hash") if rb is not None else None
+
+
+def _orphan(
+    runs: RunStore, ledger_dir: Path, rb: Optional[Dict[str, Any]], inputs: InputStore
+) -> Optional[tuple]:
+    # The (result, scenario, sector) record of a block without a row
+    if rb is None or "run_id" not in rb:
+        return None  # unreadable, or e.g. an epoch block of a sharded ledger
+    if runs.recorded(rb["rblock_id"], rb["rblock_hash"], str(ledger_dir)):
+        return None
+    sector = rb.get("sector_label")
+    if sector is None and rb.get("input_hash") in inputs:
+        sector = inputs.get(rb["input_hash"]).get("sector_label")
+    return _recorded_result(rb, ledger_dir), rb["scenario"], sector
+
+
+def _record_orphans(runs: RunStore, ledger_dir: Path, output_root: Path) -> None:
+    # The per-run ledger, just before it is cleared (normally one block)
+    inputs = InputStore(output_root / "inputs")
+    records = []
+    for f in list_rblock_files(ledger_dir):
+        rec = _orphan(runs, ledger_dir, _load(f), inputs)
+        if rec is not None:
+            records.append(rec)
+    if records:
+        runs.record_many(records)
+
+
+def reconcile(runs: RunStore, output_root: str | Path) -> int:
+    """
+    Record every R-Block under ``<output_root>/ledger`` that has no row in
+    ``runs``, in one transaction. Returns the number of rows added.
+
+    The store remembers how far each ledger was checked, so a later
+    reconcile only reads the blocks appended since.
+    """
+    output_root = Path(output_root).resolve()
+    inputs = InputStore(output_root / "inputs")
+    records: List[tuple] = []
+    marks: List[tuple] = []
+    for ledger_dir in find_ledgers(output_root / "ledger"):
+        files = list_rblock_files(ledger_dir)
+        count, head = runs.reconciled(str(ledger_dir))
+        if count and (count > len(files) or _hash_of(files[count - 1]) != head):
+            count, head = 0, None  # cleared since
+
+        for f in files[count:]:
+            rb = _load(f)
+            head = rb.get("rblock_hash") if rb is not None else None
+            rec = _orphan(runs, ledger_dir, rb, inputs)
+            if rec is not None:
+                records.append(rec)
+        if head is not None:
+            marks.append((str(ledger_dir), len(files), head))
+    return runs.record_many(records, marks)
+
+
+def reconcile_from_env() -> Dict[str, int]:
+    """
+    ``reconcile`` every output root listed in EPGS_RECONCILE
+    (``os.pathsep``-separated) that has a run store; rows added per root.
+    """
+    added: Dict[str, int] = {}
+    for root in filter(None, os.environ.get("EPGS_RECONCILE", "").split(os.pathsep)):
+        runs = run_store(root)
+        if runs is not None:
+            added[root] = reconcile(runs, root)
+    return added
+
+
+def _recorded_result(rb: Dict[str, Any], ledger_dir: Path) -> Dict[str, Any]:
+    # What run_scenario returned for this block, as far as it recorded it
+    result = {
+        "run_id": rb["run_id"],
+        "rblock_id": rb["rblock_id"],
+        "seq": rb.get("seq"),
+        "input_hash": rb.get("input_hash"),
+        "decision_hash": rb.get("decision_hash"),
+        "decision_cached": False,
+        "permission": rb["permission"],
+        "stop_issued": rb["stop_issued"],
+        "terminal_stop": rb["terminal_stop"],
+        "final_state": rb["final_state"],
+        "neuro_pause": rb.get("neuropause", {}).get("enabled", False),
+        "execution_hash": rb["rblock_hash"],
+        "ledger_dir": str(ledger_dir),
+        "reconciled": True,
+    }
+    if rb.get("reason_code"):
+        result["reason_code"] = rb["reason_code"]
+    return result
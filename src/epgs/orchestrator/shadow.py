@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from epgs.core.metrics import SHADOW_EVALUATIONS
+from epgs.ledger.inputs import InputStore
+from epgs.orchestrator.decision import Resolver, decide
+
+# ------------------------------------------------------------
+# Shadow evaluation of a candidate governance profile
+# ------------------------------------------------------------
+# A candidate is a resolver with the signature of apply_profile, named
+# as "package.module:function". It is run next to the active profile on
+# the same recorded inputs; it never gates anything. Where the two
+# decisions disagree on SHADOW_FIELDS, a diff record goes to a separate
+# NDJSON diff log (never the ledger), and divergences are tallied by
+# sector_label.
+#
+#   live     ShadowEvaluator: /run hands each result to a bounded
+#            background pool after the primary decision is made; when the
+#            pool is saturated the shadow evaluation is dropped, never
+#            waited for.
+#   offline  shadow_corpus: streams every input of one or more input
+#            stores through both profiles concurrently.
+#
+#   EPGS_SHADOW              candidate "module:function" (unset: off)
+#   EPGS_SHADOW_LOG          diff log path (default shadow-diffs.ndjson)
+#   EPGS_SHADOW_WORKERS      background workers (default 1)
+#   EPGS_SHADOW_MAX_PENDING  queued evaluations before dropping (default 256)
+
+SHADOW_FIELDS = ("permission", "final_state")
+
+
+def load_candidate(spec: str) -> Resolver:
+    """
+    Resolve a ``"package.module:function"`` candidate profile.
+    """
+    module, _, attr = spec.partition(":")
+    if not module or not attr:
+        raise ValueError(f"candidate must be 'module:function', got {spec!r}")
+    fn = getattr(importlib.import_module(module), attr)
+    if not callable(fn):
+        raise ValueError(f"candidate {spec!r} is not callable")
+    return fn
+
+
+def diff_decisions(active: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: {"active": active[k], "candidate": candidate[k]}
+        for k in SHADOW_FIELDS
+        if active[k] != candidate[k]
+    }
+
+
+class SectorTally:
+    """
+    Evaluations and divergences per sector_label, with the transitions
+    seen for each field (e.g. permission "ALLOW->BLOCK": 3).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sectors: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, sector: Optional[str], diff: Dict[str, Any]) -> None:
+        with self._lock:
+            s = self._sectors.setdefault(
+                sector or "UNKNOWN",
+                {"evaluated": 0, "diverged": 0, "fields": {k: {} for k in SHADOW_FIELDS}},
+            )
+            s["evaluated"] += 1
+            if diff:
+                s["diverged"] += 1
+            for k, d in diff.items():
+                move = f"{d['active']}->{d['candidate']}"
+                s["fields"][k][move] = s["fields"][k].get(move, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "evaluated": s["evaluated"],
+                    "diverged": s["diverged"],
+                    "rate": s["diverged"] / s["evaluated"],
+                    "fields": {k: dict(v) for k, v in s["fields"].items()},
+                }
+                for name, s in sorted(self._sectors.items())
+            }
+
+
+class DiffLog:
+    """
+    Append-only NDJSON log of shadow divergences, safe across threads.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, rec: Dict[str, Any]) -> None:
+        line = json.dumps(rec, sort_keys=True) + "\n"
+        with self._lock:
+            if self._f.closed:
+                return
+            self._f.write(line)
+            self._f.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._f.close()
+
+
+# ------------------------------------------------------------
+# Live shadow (off the critical path)
+# ------------------------------------------------------------
+class ShadowEvaluator:
+    """
+    Re-decides live runs with a candidate profile in a background pool.
+
+    ``submit`` never blocks: it only reserves a pending slot and hands
+    the run to the pool. The candidate reads the run's recorded input
+    back from the input store, so it sees exactly what the gate saw, and
+    is compared against the decision the gate actually made.
+    """
+
+    def __init__(
+        self,
+        candidate: Resolver,
+        log: str | Path,
+        workers: int = 1,
+        max_pending: int = 256,
+        name: Optional[str] = None,
+    ):
+        self.candidate = candidate
+        self.name = name or getattr(candidate, "__qualname__", repr(candidate))
+        self.log = DiffLog(log)
+        self.tally = SectorTally()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="epgs-shadow")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending: set[Future] = set()
+        self._closed = False
+        self.counts = {
+            "submitted": 0,
+            "dropped": 0,
+            "skipped": 0,
+            "evaluated": 0,
+            "diverged": 0,
+            "errors": 0,
+        }
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def submit(self, result: Dict[str, Any], output_root: str | Path) -> bool:
+        """
+        Queue ``result`` (a ``run_scenario`` result under ``output_root``)
+        for shadow evaluation; False if it was skipped or dropped.
+        """
+        # Fail-closed runs were never decided and unrecorded inputs cannot be re-read
+        if result.get("reason_code") or not result.get("input_hash"):
+            self._count("skipped")
+            SHADOW_EVALUATIONS.inc("skipped")
+            return False
+        if not self._slots.acquire(blocking=False):
+            self._count("dropped")
+            SHADOW_EVALUATIONS.inc("dropped")
+            return False
+
+        with self._lock:
+            # Once closed nothing more is evaluated; checked under the lock so
+            # close() cannot shut the pool between the check and the submit
+            if self._closed:
+                self._slots.release()
+                self.counts["skipped"] += 1
+                SHADOW_EVALUATIONS.inc("skipped")
+                return False
+            self.counts["submitted"] += 1
+            store = InputStore(Path(output_root).resolve() / "inputs")
+            fut = self._pool.submit(self._evaluate, result, store)
+            self._pending.add(fut)
+        fut.add_done_callback(self._done)
+        return True
+
+    def _done(self, fut: Future) -> None:
+        with self._lock:
+            self._pending.discard(fut)
+        self._slots.release()
+
+    def _evaluate(self, result: Dict[str, Any], store: InputStore) -> None:
+        digest = result["input_hash"]
+        try:
+            # The run's own store: a sharded ledger_dir is a shard below <out>/ledger
+            scenario = store.get(digest)
+            candidate = decide(scenario, self.candidate)
+        except Exception as e:  # a broken candidate must not take the worker down
+            self._count("errors")
+            SHADOW_EVALUATIONS.inc("error")
+            self.log.write(
+                {
+                    "type": "error",
+                    "run_id": result["run_id"],
+                    "input_hash": digest,
+                    "reason": str(e),
+                }
+            )
+            return
+
+        diff = diff_decisions(result, candidate)
+        sector = scenario.get("sector_label")
+        self.tally.add(sector, diff)
+        self._count("evaluated")
+        if not diff:
+            SHADOW_EVALUATIONS.inc("match")
+            return
+        self._count("diverged")
+        SHADOW_EVALUATIONS.inc("diverged")
+        self.log.write(
+            {
+                "type": "divergence",
+                "candidate": self.name,
+                "run_id": result["run_id"],
+                "scenario": scenario.get("scenario"),
+                "sector": sector,
+                "input_hash": digest,
+                "diff": diff,
+            }
+        )
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued evaluations; True if none are left.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.counts)
+            pending = len(self._pending)
+        return {
+            "candidate": self.name,
+            "log": str(self.log.path),
+            **counts,
+            "pending": pending,
+            "by_sector": self.tally.to_dict(),
+        }
+
+    def close(self) -> None:
+        """
+        Finish queued evaluations and close the diff log; later submits
+        are skipped. Safe to call more than once.
+        """
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=True)
+        self.log.close()
+
+    @classmethod
+    def from_env(cls) -> Optional["ShadowEvaluator"]:
+        spec = os.environ.get("EPGS_SHADOW")
+        if not spec:
+            return None
+        return cls(
+            load_candidate(spec),
+            os.environ.get("EPGS_SHADOW_LOG", "shadow-diffs.ndjson"),
+            workers=int(os.environ.get("EPGS_SHADOW_WORKERS", "1")),
+            max_pending=int(os.environ.get("EPGS_SHADOW_MAX_PENDING", "256")),
+            name=spec,
+        )
+
+
+# ------------------------------------------------------------
+# Offline shadow over a recorded input corpus
+# ------------------------------------------------------------
+def _both(
+    store: InputStore, digest: str, candidate: Resolver
+) -> tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    scenario = store.get(digest)
+    return scenario, decide(scenario), decide(scenario, candidate)
+
+
+def shadow_corpus(
+    stores: Iterable[str | Path],
+    candidate: Resolver,
+    workers: int | None = None,
+    log: str | Path | None = None,
+) -> Iterator[dict]:
+    """
+    Decide every input in ``stores`` with both the active profile and
+    ``candidate``, concurrently, and report where they diverge.
+
+    Yields a ``{"type": "divergence", ...}`` record per diverging input
+    and a ``{"type": "error", ...}`` record per unreadable input or
+    candidate failure, then a final ``{"type": "summary", ...}`` record
+    with divergences aggregated by sector. Divergence and error records
+    are also appended to ``log`` when given. Each distinct input is
+    evaluated once.
+    """
+    workers = max(1, workers or min(32, (os.cpu_count() or 1) + 4))
+    diff_log = DiffLog(log) if log is not None else None
+    tally = SectorTally()
+    seen: set[str] = set()
+    stats = {"inputs": 0, "evaluated": 0, "divergences": 0, "errors": 0}
+
+    def settle(done) -> Iterator[dict]:
+        for fut in done:
+            digest = pending.pop(fut)
+            try:
+                scenario, active, cand = fut.result()
+            except Exception as e:
+                stats["errors"] += 1
+                rec = {"type": "error", "input_hash": digest, "reason": str(e)}
+            else:
+                stats["evaluated"] += 1
+                diff = diff_decisions(active, cand)
+                tally.add(scenario.get("sector_label"), diff)
+                if not diff:
+                    continue
+                stats["divergences"] += 1
+                rec = {
+                    "type": "divergence",
+                    "scenario": scenario.get("scenario"),
+                    "sector": scenario.get("sector_label"),
+                    "input_hash": digest,
+                    "diff": diff,
+                }
+            if diff_log is not None:
+                diff_log.write(rec)
+            yield rec
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: dict = {}
+            for root in stores:
+                store = InputStore(root)
+                for digest in store:
+                    if digest in seen:
+                        continue
+                    seen.add(digest)
+                    stats["inputs"] += 1
+                    pending[pool.submit(_both, store, digest, candidate)] = digest
+                    # Bounded window: never more than 2x workers inputs in flight
+                    if len(pending) >= 2 * workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from settle(done)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from settle(done)
+    finally:
+        if diff_log is not None:
+            diff_log.close()
+
+    summary = {
+        "type": "summary",
+        "ok": bool(stats["inputs"]) and not stats["divergences"] and not stats["errors"],
+        **stats,
+        "by_sector": tally.to_dict(),
+    }
+    if not stats["inputs"]:
+        summary["reason"] = "No inputs found"
+    yield summary
@@ -1,8 +1,25 @@
 # src/epgs/profiles/base.py
 
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import Dict, Any
 
+# Bump whenever the governance matrix or thresholds change meaning:
+# cached decisions are keyed by it.
+PROFILE_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class BaseProfile:
+    """
+    Numeric thresholds consumed by the UBE and NRRP stages.
+    """
+
+    phi_min_safe: float = 0.78
+    risk_load_max_safe: float = 0.50
+    degradation_max_safe: float = 0.05
+    max_retries: int = 0
+
 
 def apply_profile(scenario: Dict[str, Any]) -> Dict[str, Any]:
     """
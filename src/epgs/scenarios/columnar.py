@@ -0,0 +1,288 @@
+"""
+Columnar scenario container (``.epgsc``).
+
+JSON scenarios store each temporal/UBE step as a small object, so every
+step repeats its key names and is parsed into a dict and then a model.
+An ``.epgsc`` file keeps the small parts as JSON and the per-step data as
+typed little-endian columns that can be memory-mapped and read in place:
+
+    offset 0   magic  b"EPGSC01\\n"
+    offset 8   uint32 header length (little-endian)
+    offset 12  header JSON (utf-8)
+    ...        zero padding to an 8-byte boundary ("data start")
+    ...        columns, each 8-byte aligned, at header offsets from data start
+
+Header:
+    {"format": "epgs-columnar/1", "scenario_id": ..., "sector_label": ...,
+     "requests": [...], "extra": {...},
+     "rows": {"temporal": N, "ube": M},
+     "columns": {"temporal.stable_ms": {"type": "int32", "offset": ..., "count": N}, ...}}
+
+``extra`` carries any other top-level scenario keys (e.g. ``tampered``).
+"""
+
+from __future__ import annotations
+
+import array
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+FORMAT = "epgs-columnar/1"
+MAGIC = b"EPGSC01\n"
+_HLEN = struct.Struct("<I")
+_PREAMBLE = len(MAGIC) + _HLEN.size
+_LITTLE = sys.byteorder == "little"
+
+# type name -> (struct/memoryview format, item size)
+_TYPES: Dict[str, Tuple[str, int]] = {
+    "int32": ("i", 4),
+    "float64": ("d", 8),
+    "bool": ("?", 1),
+}
+
+TEMPORAL_COLUMNS = (("step_index", "int32"), ("stable_ms", "int32"), ("jitter", "bool"))
+UBE_COLUMNS = (
+    ("step_index", "int32"),
+    ("phi", "float64"),
+    ("degradation_rate", "float64"),
+    ("risk_load", "float64"),
+)
+_TABLES = (("temporal", TEMPORAL_COLUMNS), ("ube", UBE_COLUMNS))
+_JSON_TABLE = {"temporal": "temporal", "ube": "ube_vectors"}
+_KNOWN = {"scenario_id", "sector_label", "requests", "temporal", "ube_vectors"}
+
+
+class TemporalColumns(NamedTuple):
+    step_index: Sequence[int]
+    stable_ms: Sequence[int]
+    jitter: Sequence[bool]
+
+
+class UBEColumns(NamedTuple):
+    step_index: Sequence[int]
+    phi: Sequence[float]
+    degradation_rate: Sequence[float]
+    risk_load: Sequence[float]
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def is_columnar(path: str | Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# ------------------------------------------------------------
+# Writing
+# ------------------------------------------------------------
+def _column_bytes(type_name: str, values: List[Any]) -> bytes:
+    fmt, _ = _TYPES[type_name]
+    if type_name == "bool":
+        return bytes(1 if v else 0 for v in values)
+    arr = array.array(fmt, values)
+    if not _LITTLE:
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_columnar(scenario: Dict[str, Any], path: str | Path) -> Path:
+    """
+    Write a JSON-shaped scenario dict (or a ``Scenario`` model) as ``.epgsc``.
+    """
+    if hasattr(scenario, "model_dump"):
+        scenario = scenario.model_dump(mode="json")
+
+    rows: Dict[str, int] = {}
+    columns: Dict[str, Dict[str, Any]] = {}
+    blobs: List[bytes] = []
+    offset = 0
+
+    for table, spec in _TABLES:
+        steps = scenario[_JSON_TABLE[table]]
+        rows[table] = len(steps)
+        for name, type_name in spec:
+            blob = _column_bytes(type_name, [s[name] for s in steps])
+            columns[f"{table}.{name}"] = {"type": type_name, "offset": offset, "count": len(steps)}
+            blobs.append(blob + b"\0" * (_align(len(blob)) - len(blob)))
+            offset += _align(len(blob))
+
+    header = json.dumps(
+        {
+            "format": FORMAT,
+            "scenario_id": scenario["scenario_id"],
+            "sector_label": scenario["sector_label"],
+            "requests": scenario["requests"],
+            "extra": {k: v for k, v in scenario.items() if k not in _KNOWN},
+            "rows": rows,
+            "columns": columns,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    pad = _align(_PREAMBLE + len(header)) - (_PREAMBLE + len(header))
+    path = Path(path)
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HLEN.pack(len(header)))
+        f.write(header)
+        f.write(b"\0" * pad)
+        for blob in blobs:
+            f.write(blob)
+    return path
+
+
+# ------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------
+def _parse_header(buf) -> Tuple[Dict[str, Any], int]:
+    if bytes(buf[: len(MAGIC)]) != MAGIC:
+        raise ValueError("not an EPGS columnar scenario (bad magic)")
+    (hlen,) = _HLEN.unpack_from(buf, len(MAGIC))
+    header = json.loads(bytes(buf[_PREAMBLE:_PREAMBLE + hlen]))
+    if header.get("format") != FORMAT:
+        raise ValueError(f"unsupported columnar format: {header.get('format')}")
+    return header, _align(_PREAMBLE + hlen)
+
+
+def read_header(path: str | Path) -> Dict[str, Any]:
+    """
+    Only the JSON header, without touching the columns.
+    """
+    with open(path, "rb") as f:
+        pre = f.read(_PREAMBLE)
+        if len(pre) < _PREAMBLE:
+            raise ValueError("not an EPGS columnar scenario (truncated)")
+        (hlen,) = _HLEN.unpack_from(pre, len(MAGIC))
+        header, _ = _parse_header(pre + f.read(hlen))
+    return header
+
+
+class ColumnarScenario:
+    """
+    A parsed ``.epgsc`` container over any buffer (bytes, or an mmap via
+    ``open_columnar``). Columns are zero-copy memoryviews into the buffer.
+    """
+
+    def __init__(self, buf, _owner=None):
+        self.header, data_start = _parse_header(buf)
+        self._owner = _owner
+        self._view = memoryview(buf)
+        self._cols: Dict[str, memoryview] = {}
+
+        for key, spec in self.header["columns"].items():
+            fmt, size = _TYPES[spec["type"]]
+            start = data_start + spec["offset"]
+            end = start + size * spec["count"]
+            if end > len(self._view):
+                raise ValueError(f"column {key} runs past the end of the data")
+            raw = self._view[start:end]
+            if _LITTLE or size == 1:
+                self._cols[key] = raw.cast(fmt)
+            else:
+                arr = array.array(fmt, raw.tobytes())
+                arr.byteswap()
+                self._cols[key] = memoryview(arr)
+
+    @property
+    def scenario_id(self) -> str:
+        return self.header["scenario_id"]
+
+    @property
+    def sector_label(self) -> str:
+        return self.header["sector_label"]
+
+    @property
+    def requests(self) -> List[Dict[str, Any]]:
+        return self.header["requests"]
+
+    @property
+    def extra(self) -> Dict[str, Any]:
+        return self.header.get("extra", {})
+
+    @property
+    def temporal(self) -> TemporalColumns:
+        return TemporalColumns(*(self._cols[f"temporal.{n}"] for n, _ in TEMPORAL_COLUMNS))
+
+    @property
+    def ube(self) -> UBEColumns:
+        return UBEColumns(*(self._cols[f"ube.{n}"] for n, _ in UBE_COLUMNS))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The scenario in its JSON shape.
+        """
+        out: Dict[str, Any] = {
+            "scenario_id": self.scenario_id,
+            "sector_label": self.sector_label,
+            "requests": self.requests,
+        }
+        for table, spec in _TABLES:
+            names = [n for n, _ in spec]
+            cols = [self._cols[f"{table}.{n}"].tolist() for n in names]
+            out[_JSON_TABLE[table]] = [dict(zip(names, row)) for row in zip(*cols)]
+        out.update(self.extra)
+        return out
+
+    def close(self) -> None:
+        for col in self._cols.values():
+            col.release()
+        self._cols = {}
+        self._view.release()
+        if self._owner is not None:
+            mm, f = self._owner
+            mm.close()
+            f.close()
+            self._owner = None
+
+    def __enter__(self) -> "ColumnarScenario":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_columnar(path: str | Path) -> ColumnarScenario:
+    """
+    Memory-map an ``.epgsc`` file. Close it (or use ``with``) when done.
+    """
+    f = open(path, "rb")
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        f.close()
+        raise
+    try:
+        return ColumnarScenario(mm, _owner=(mm, f))
+    except BaseException:
+        mm.close()
+        f.close()
+        raise
+
+
+# ------------------------------------------------------------
+# Converters
+# ------------------------------------------------------------
+def json_to_columnar(src: str | Path, dst: str | Path) -> Path:
+    """
+    Validate a JSON scenario and write it as ``.epgsc``.
+    """
+    from epgs.scenarios.schema import Scenario
+
+    raw = Path(src).read_bytes()
+    Scenario.model_validate_json(raw)
+    return write_columnar(json.loads(raw), dst)
+
+
+def columnar_to_json(src: str | Path, dst: str | Path) -> Path:
+    with open_columnar(src) as cs:
+        data = cs.to_dict()
+    dst = Path(dst)
+    dst.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return dst
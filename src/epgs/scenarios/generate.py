@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, TextIO
+
+from epgs.modules.neuropause import TAU_MS
+
+SECTORS = ("ENERGY", "AEROSPACE_DEFENSE", "MOBILITY", "ROBOTICS")
+
+# UBE degradation profiles -> governance tag embedded in the scenario id.
+# apply_profile() resolves governance by these tags, so generated traffic
+# exercises every branch of the matrix.
+UBE_PROFILES = {
+    "stable": "STABLE-SAFE",
+    "caution": "CAUTION-ASSIST",
+    "degrading": "MIDSTOP-DEGRADE",
+    "collapse": "NRRP-TERMINATE",
+}
+NOT_READY_TAG = "FAST-NOTREADY"
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    """
+    Shape of a synthetic scenario corpus. Identical configs generate
+    identical corpora, on any machine and under any PYTHONHASHSEED.
+    """
+
+    seed: int = 0
+    requests: int = 1
+    steps: int = 3
+    jitter_rate: float = 0.05
+    ube_profiles: Mapping[str, float] = field(default_factory=lambda: {"stable": 1.0})
+    sector_mix: Mapping[str, float] = field(default_factory=lambda: {s: 1.0 for s in SECTORS})
+    prefix: str = "S-SYN"
+
+    def __post_init__(self):
+        if self.requests < 1 or self.steps < 1:
+            raise ValueError("requests and steps must be >= 1")
+        if not 0.0 <= self.jitter_rate <= 1.0:
+            raise ValueError("jitter_rate must be within [0, 1]")
+        unknown = set(self.ube_profiles) - set(UBE_PROFILES)
+        if unknown:
+            raise ValueError(f"Unknown UBE profiles: {sorted(unknown)}")
+        unknown = set(self.sector_mix) - set(SECTORS)
+        if unknown:
+            raise ValueError(f"Unknown sectors: {sorted(unknown)}")
+
+
+def _pick(rng: random.Random, weights: Mapping[str, float]) -> str:
+    keys = sorted(weights)
+    return rng.choices(keys, weights=[weights[k] for k in keys])[0]
+
+
+def _temporal(rng: random.Random, c: GeneratorConfig) -> tuple[list, bool]:
+    # Expected accumulation is ~2 x tau over the trace, so readiness
+    # depends on where jitter lands rather than on trace length.
+    top = max(1, (4 * TAU_MS) // c.steps)
+
+    steps = []
+    observed = 0
+    ready = False
+    for i in range(c.steps):
+        jitter = rng.random() < c.jitter_rate
+        stable_ms = rng.randint(0, top)
+        steps.append({"step_index": i, "stable_ms": stable_ms, "jitter": jitter})
+
+        if not ready:
+            observed = stable_ms if jitter else observed + stable_ms
+            ready = observed >= TAU_MS
+
+    return steps, ready
+
+
+def _ube(rng: random.Random, c: GeneratorConfig, profile: str) -> list:
+    vectors = []
+    for i in range(c.steps):
+        if profile == "stable":
+            phi = rng.uniform(0.85, 0.98)
+            deg = rng.uniform(0.0, 0.04)
+            risk = rng.uniform(0.0, 0.40)
+        elif profile == "caution":
+            phi = rng.uniform(0.70, 0.76)
+            deg = rng.uniform(0.0, 0.04)
+            risk = rng.uniform(0.10, 0.40)
+        elif profile == "degrading":
+            # Safe start, linear decay into the unsafe band on the last step
+            t = i / max(1, c.steps - 1)
+            phi = 0.92 - 0.55 * t
+            deg = 0.01 + 0.19 * t
+            risk = 0.20 + 0.60 * t
+        else:  # collapse
+            phi = rng.uniform(0.10, 0.50)
+            deg = rng.uniform(0.08, 0.30)
+            risk = rng.uniform(0.60, 1.00)
+
+        vectors.append({
+            "step_index": i,
+            "phi": round(phi, 4),
+            "degradation_rate": round(deg, 4),
+            "risk_load": round(risk, 4),
+        })
+    return vectors
+
+
+def make_scenario(c: GeneratorConfig, index: int) -> Dict[str, Any]:
+    """
+    Scenario number ``index`` of the corpus described by ``c``.
+
+    Every scenario has its own RNG stream, so any slice of a corpus can be
+    generated independently (e.g. by parallel workers).
+    """
+    rng = random.Random(f"{c.seed}:{index}")
+
+    sector = _pick(rng, c.sector_mix)
+    profile = _pick(rng, c.ube_profiles)
+    temporal, ready = _temporal(rng, c)
+    tag = UBE_PROFILES[profile] if ready else NOT_READY_TAG
+
+    return {
+        "scenario_id": f"{c.prefix}-{index:08d}-{tag}",
+        "sector_label": sector,
+        "requests": [
+            {
+                "execution_id": f"exec-{index:08d}-{r:03d}",
+                "action_type": "IRREVERSIBLE",
+                "sector_label": sector,
+                "requested_at_ms": r * 10,
+            }
+            for r in range(c.requests)
+        ],
+        "temporal": temporal,
+        "ube_vectors": _ube(rng, c, profile),
+    }
+
+
+def generate(c: GeneratorConfig, count: int, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield raw scenario dicts ``start .. start + count - 1``.
+    """
+    for i in range(start, start + count):
+        yield make_scenario(c, i)
+
+
+def generate_scenarios(c: GeneratorConfig, count: int, start: int = 0):
+    """
+    Like ``generate`` but yields validated ``Scenario`` models.
+    """
+    from epgs.scenarios.schema import Scenario
+
+    for raw in generate(c, count, start):
+        yield Scenario.model_validate(raw)
+
+
+def write_stream(c: GeneratorConfig, count: int, out: TextIO, start: int = 0) -> int:
+    """
+    Write scenarios as JSON Lines without holding the corpus in memory.
+    """
+    n = 0
+    for raw in generate(c, count, start):
+        out.write(json.dumps(raw, separators=(",", ":")))
+        out.write("\n")
+        n += 1
+    return n
+
+
+def iter_stream(path: str | Path) -> Iterator[Dict[str, Any]]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _weights(value: str) -> Dict[str, float]:
+    """
+    "stable=3,caution=1" -> {"stable": 3.0, "caution": 1.0}
+    """
+    out = {}
+    for item in value.split(","):
+        key, _, w = item.partition("=")
+        out[key.strip()] = float(w) if w else 1.0
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic EPGS scenario corpus (JSON Lines)"
+    )
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--out", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--jitter-rate", type=float, default=0.05)
+    parser.add_argument("--ube-profiles", type=_weights, default={"stable": 1.0})
+    parser.add_argument("--sector-mix", type=_weights, default={s: 1.0 for s in SECTORS})
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        seed=args.seed,
+        requests=args.requests,
+        steps=args.steps,
+        jitter_rate=args.jitter_rate,
+        ube_profiles=args.ube_profiles,
+        sector_mix=args.sector_mix,
+    )
+
+    if args.out == "-":
+        write_stream(config, args.count, sys.stdout, args.start)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            write_stream(config, args.count, f, args.start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,174 @@
 from __future__ import annotations
 
-import json
+import collections
+import os
+import threading
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+from epgs.scenarios.columnar import MAGIC
 from epgs.scenarios.schema import Scenario
+from epgs.scenarios.source import Source, content_hash, decode, resolve, scenario_name
+
+# ------------------------------------------------------------
+# Two-tier scenario loading
+# ------------------------------------------------------------
+# Untrusted input is fully validated by pydantic, once per content: the
+# validated model and its decoded ``Source`` are cached by the SHA-256 of
+# the raw bytes, so a repeat costs one hash instead of a parse and
+# validation.
+#
+# Trusted input -- content validated before and pinned by its content
+# hash -- is looked up by that hash alone: a cache hit does no file IO,
+# no hashing and no parsing. On a miss the bytes are read, must match
+# the hash, and are validated once.
+#
+# Either way the caller gets the ``Source`` that was validated and hands
+# it to ``run_scenario``, which decides on it instead of re-reading the
+# file.
+#
+# (model_construct is deliberately not used as a shortcut: for these
+# models pydantic-core's validate_json is faster than constructing them
+# in Python, and almost all of its cost is the JSON parse itself.)
+#
+# Both JSON and columnar (``.epgsc``) content are accepted; the format
+# is detected from the leading bytes.
+#
+#   EPGS_VALIDATION_CACHE   validated scenarios kept in memory (default 1024)
+
+
+class ContentHashMismatch(ValueError):
+    """
+    Pinned scenario content no longer hashes to its recorded SHA-256.
+    """
+
+
+class Validated(NamedTuple):
+    model: Scenario
+    source: Source
+
+
+class ValidationCache:
+    """
+    Thread-safe LRU of ``Validated`` scenarios keyed by content hash.
+    Models are frozen and sources are never mutated, so one entry can be
+    shared by every caller.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._items: collections.OrderedDict[str, Validated] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Validated]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: Validated) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+
+VALIDATED = ValidationCache(int(os.environ.get("EPGS_VALIDATION_CACHE", "1024")))
+
+
+def _validated(raw: bytes, key: str) -> Validated:
+    entry = VALIDATED.get(key)
+    if entry is None:
+        data = decode(raw)
+        if raw.startswith(MAGIC):
+            model = Scenario.model_validate(data)
+        else:
+            model = Scenario.model_validate_json(raw)
+        entry = Validated(model, Source(data, scenario_name(data, model.scenario_id), key))
+        VALIDATED.put(key, entry)
+    return entry
+
+
+# ------------------------------------------------------------
+# Tier 1: full validation (untrusted)
+# ------------------------------------------------------------
+def validate_scenario(raw: bytes) -> Scenario:
+    """
+    Validate raw scenario JSON (or columnar) content, reusing the result
+    for identical content. Raises pydantic.ValidationError on invalid input.
+    """
+    return _validated(raw, content_hash(raw)).model
+
+
+# ------------------------------------------------------------
+# Tier 2: trusted, content-addressed
+# ------------------------------------------------------------
+def load_trusted(path: str | Path, sha256: str) -> Scenario:
+    """
+    Load a scenario recorded as validated under ``sha256``.
+    Raises ContentHashMismatch if the file no longer matches that hash.
+    """
+    return load_source(path, sha256).model
+
+
+# ------------------------------------------------------------
+# Files
+# ------------------------------------------------------------
+def load_source(path: str | Path, sha256: Optional[str] = None) -> Validated:
+    """
+    Validate the scenario ``path`` refers to (following a ``{"path": ...}``
+    indirection) and return it with the ``Source`` to run it from.
+
+    With ``sha256`` the content is pinned: a cached entry is returned
+    without touching the file, and otherwise the file must still hash to
+    ``sha256`` (ContentHashMismatch if not).
+    """
+    if sha256 is not None:
+        entry = VALIDATED.get(sha256)
+        if entry is not None:
+            return entry
+
+    _, raw = resolve(path)
+    key = content_hash(raw)
+    if sha256 is not None and key != sha256:
+        raise ContentHashMismatch(f"content of {path} does not match recorded sha256 {sha256}")
+    return _validated(raw, key)
+
+
+def load_scenario(path: str | Path, sha256: Optional[str] = None) -> Scenario:
+    """
+    Load a scenario file. Pass ``sha256`` (the content hash recorded when
+    the file was validated) to take the trusted path.
+    """
+    if sha256 is not None:
+        return load_trusted(path, sha256)
+    return validate_scenario(Path(path).read_bytes())
 
 
-def load_scenario(path: str | Path) -> Scenario:
-    p = Path(path)
-    raw = json.loads(p.read_text(encoding="utf-8"))
-    return Scenario.model_validate(raw)
+def validate_file(path: str | Path) -> Scenario:
+    """
+    Validate the scenario a file refers to, following a ``{"path": ...}``
+    indirection the way ``run_scenario`` does.
+    """
+    return load_source(path).model
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, NamedTuple
+
+from epgs.scenarios.columnar import MAGIC, ColumnarScenario
+
+# ------------------------------------------------------------
+# Scenario sources
+# ------------------------------------------------------------
+# A scenario file is JSON or columnar (``.epgsc``), or a JSON reference
+# {"path": "<file>"} to one, resolved relative to the referring file.
+# The file is read exactly once; ``Source`` carries the decoded content
+# together with the SHA-256 of the bytes it was decoded from, so whoever
+# validated a Source can hand it on and the run decides on exactly those
+# bytes. Kept free of pydantic: the run path imports it.
+
+
+class Source(NamedTuple):
+    data: Dict[str, Any]  # decoded scenario; treat as read-only
+    name: str  # canonical scenario name
+    sha256: str  # of the bytes ``data`` was decoded from
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def decode(raw: bytes) -> Dict[str, Any]:
+    """
+    The scenario in ``raw`` (JSON or columnar content).
+    """
+    if raw.startswith(MAGIC):
+        # The full logical document, so a columnar scenario records (and
+        # hashes to) the same input as its JSON form
+        with ColumnarScenario(raw) as cs:
+            return cs.to_dict()
+    return json.loads(raw)
+
+
+def scenario_name(data: Dict[str, Any], fallback: str) -> str:
+    return str(data.get("scenario") or data.get("scenario_id") or fallback)
+
+
+def resolve(path: str | Path) -> tuple[Path, bytes]:
+    """
+    (file, bytes) of the scenario ``path`` refers to, following one
+    ``{"path": ...}`` indirection.
+    """
+    p = Path(path).resolve()
+    raw = p.read_bytes()
+    if not raw.startswith(MAGIC) and b'"path"' in raw:
+        try:
+            obj = json.loads(raw)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict) and "path" in obj:
+            p = (p.parent / obj["path"]).resolve()
+            raw = p.read_bytes()
+    return p, raw
+
+
+def read_source(path: str | Path) -> Source:
+    """
+    Read (without validating) the scenario ``path`` refers to.
+    """
+    p, raw = resolve(path)
+    data = decode(raw)
+    return Source(data, scenario_name(data, p.stem), content_hash(raw))
@@ -5,7 +5,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from epgs.main import app
-import epgs.main as main_module  # for monkeypatching run_scenario
+import epgs.orchestrator.gate as gate_module  # for monkeypatching run_scenario
 
 
 SCENARIOS = [
@@ -27,18 +27,19 @@ def make_client():
 
 def _monkeypatch_run_to_tmp(monkeypatch, tmp_path: Path):
     """
-    Patch epgs.main.run_scenario so /run writes into tmp_path
+    Patch the gate's run_scenario so /run writes into tmp_path
     instead of real output/ directory.
     """
     from epgs.orchestrator.run import run_scenario as real_run_scenario
 
-    def _run_to_tmp(scenario_path: str):
+    def _run_to_tmp(scenario_path: str, **kwargs):
         return real_run_scenario(
             scenario_path=scenario_path,
             output_root=str(tmp_path),
+            **kwargs,
         )
 
-    monkeypatch.setattr(main_module, "run_scenario", _run_to_tmp)
+    monkeypatch.setattr(gate_module, "run_scenario", _run_to_tmp)
 
 
 def _run_via_api(client: TestClient, scenario_path: str) -> dict:
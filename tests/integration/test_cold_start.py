@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+
+from epgs.cli import main
+
+
+HEAVY = ("fastapi", "pydantic", "starlette", "uvicorn")
+
+# Cumulative import time of `epgs verify` (about 30 ms here). The web
+# stack alone costs about 300 ms, so pulling it (or the pydantic models)
+# back into the verify path blows this budget.
+VERIFY_IMPORT_BUDGET_MS = 150
+
+
+def _cold(code: str) -> subprocess.CompletedProcess:
+    # Import timings go to stderr
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _epgs_import_ms(stderr: str) -> float:
+    # -X importtime lines: "import time: <self us> | <cumulative us> | <name>",
+    # the name indented two spaces per nesting level; top-level epgs imports
+    # (including lazy ones made while running) add up to the whole cost
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith(" epgs") and not name.startswith("  "):
+            total += int(cumulative)
+    return total / 1000.0
+
+
+def test_verify_path_does_not_import_the_web_stack():
+    proc = _cold(
+        "import sys, epgs.cli, epgs.orchestrator.replay;"
+        f"print(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY!r}))"
+    )
+    assert proc.stdout.strip() == "[]"
+
+
+def test_verify_loads_only_the_verify_modules(tmp_path):
+    run = _cold(
+        "from epgs.cli import main;"
+        f"main(['run', 'src/epgs/scenarios/S-STABLE-SAFE.json', '--out', {str(tmp_path)!r}])"
+    )
+    assert json.loads(run.stdout)["permission"] == "ALLOW"
+
+    proc = _cold(
+        "import sys; from epgs.cli import main;"
+        f"code = main(['verify', {str(tmp_path / 'ledger')!r}]);"
+        "print(sorted(m for m in sys.modules if m.split('.')[0] == 'epgs'))"
+    )
+    *_, loaded = proc.stdout.strip().splitlines()
+    assert 0 < _epgs_import_ms(proc.stderr) < VERIFY_IMPORT_BUDGET_MS
+    # Hashing and the chain walk only: no decision engine, profiles,
+    # input store, scenario loading or run path
+    assert set(json.loads(loaded.replace("'", '"'))) == {
+        "epgs",
+        "epgs.cli",
+        "epgs.core",
+        "epgs.core.crypto",
+        "epgs.core.deadline",
+        "epgs.core.metrics",
+        "epgs.core.profiling",
+        "epgs.orchestrator",
+        "epgs.orchestrator.replay",
+    }
+
+
+def test_cli_run_then_verify(tmp_path, capsys):
+    assert main(["run", "src/epgs/scenarios/S-STABLE-SAFE.json", "--out", str(tmp_path)]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["permission"] == "ALLOW"
+
+    assert main(["verify", str(tmp_path / "ledger")]) == 0
+    assert json.loads(capsys.readouterr().out)["ok"] is True
+
+    block = next((tmp_path / "ledger").glob("*.json"))
+    block.write_text(block.read_text().replace("ALLOW", "BLOCK"))
+    assert main(["verify", str(tmp_path / "ledger")]) == 1
+    assert json.loads(capsys.readouterr().out)["ok"] is False
@@ -0,0 +1,141 @@
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from epgs.cli import main as cli_main
+from epgs.ledger.inputs import InputStore
+from epgs.main import app
+from epgs.orchestrator import decision
+from epgs.orchestrator.replay import replay_decisions
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIOS = [
+    "src/epgs/scenarios/S-STABLE-SAFE.json",
+    "src/epgs/scenarios/S-CAUTION-ASSIST.json",
+    "src/epgs/scenarios/S-NRRP-TERMINATE.json",
+]
+
+
+def _populate(root, runs=2):
+    results = []
+    for i, scenario in enumerate(SCENARIOS):
+        for k in range(1, runs + 1):
+            results.append(run_scenario(scenario, output_root=str(root / f"scenario_{i}_run{k}")))
+    return results
+
+
+def test_rblocks_record_a_replayable_input_hash(tmp_path):
+    result = run_scenario(SCENARIOS[1], output_root=str(tmp_path))
+
+    [block_file] = (tmp_path / "ledger").glob("*.json")
+    block = json.loads(block_file.read_text())
+    assert block["input_hash"] == result["input_hash"]
+
+    stored = InputStore(tmp_path / "inputs").get(block["input_hash"])
+    assert stored["scenario"] == "S-CAUTION-ASSIST"
+    assert decision.decide(stored)["permission"] == block["permission"]
+
+
+def test_unique_inputs_are_replayed_once(tmp_path, monkeypatch):
+    _populate(tmp_path, runs=3)
+
+    calls = []
+    real = decision.decide
+    monkeypatch.setattr(decision, "decide", lambda s: calls.append(s["scenario"]) or real(s))
+
+    [summary] = list(replay_decisions(tmp_path, workers=2))
+    assert summary["ok"] is True
+    assert summary["blocks"] == summary["replayed"] == 9
+    assert summary["unique_inputs"] == 3
+    assert sorted(calls) == ["S-CAUTION-ASSIST", "S-NRRP-TERMINATE", "S-STABLE-SAFE"]
+
+
+def test_code_change_streams_divergences(tmp_path, monkeypatch):
+    _populate(tmp_path)
+
+    real = decision.apply_profile
+
+    def changed(scenario):
+        out = real(scenario)
+        if "CAUTION" in scenario["scenario"]:
+            out = {**out, "permission": "BLOCK"}
+        return out
+
+    monkeypatch.setattr(decision, "apply_profile", changed)
+
+    *divergences, summary = replay_decisions(tmp_path)
+    assert sorted(d["ledger"] for d in divergences) == [
+        "scenario_1_run1/ledger",
+        "scenario_1_run2/ledger",
+    ]
+    assert divergences[0]["diff"] == {
+        "permission": {"recorded": "ASSIST", "replayed": "BLOCK"},
+        "terminal_stop": {"recorded": False, "replayed": True},
+        "final_state": {"recorded": "EXECUTED", "replayed": "TERMINATED"},
+    }
+    assert summary["ok"] is False and summary["divergences"] == 2
+
+
+def test_missing_inputs_and_legacy_blocks(tmp_path):
+    result = run_scenario(SCENARIOS[0], output_root=str(tmp_path / "a"))
+    InputStore(tmp_path / "a" / "inputs").path(result["input_hash"]).unlink()
+
+    legacy = tmp_path / "b" / "ledger"
+    shutil.copytree("output_ci/scenario_0_run1/ledger/11111111-1111-1111-1111-000000000000", legacy)
+
+    *errors, summary = replay_decisions(tmp_path)
+    assert [e["type"] for e in errors] == ["error"]
+    assert "not found" in errors[0]["reason"]
+    assert summary["unrecorded"] == 1
+    assert summary["ok"] is False
+
+
+def test_shared_store_cli_and_api(tmp_path):
+    results = _populate(tmp_path, runs=1)
+    shared = InputStore(tmp_path / "shared")
+    for i, r in enumerate(results):
+        own = tmp_path / f"scenario_{i}_run1" / "inputs"
+        shared.put(InputStore(own).get(r["input_hash"]))
+        shutil.rmtree(own)
+
+    assert cli_main(["replay", str(tmp_path), "--store", str(tmp_path / "shared")]) == 0
+    assert cli_main(["replay", str(tmp_path)]) == 1
+
+    client = TestClient(app)
+    r = client.get("/replay", params={"root": str(tmp_path), "store": str(tmp_path / "shared")})
+    assert r.status_code == 200
+    summary = json.loads(r.text.splitlines()[-1])
+    assert summary["ok"] is True and summary["unique_inputs"] == 3
+
+    assert client.get("/replay", params={"root": str(tmp_path / "nope")}).status_code == 404
+
+
+def test_concurrent_puts_of_one_new_input(tmp_path, monkeypatch):
+    store = InputStore(tmp_path / "inputs")
+    scenario = json.loads(open(SCENARIOS[0]).read())
+    start = threading.Barrier(8)
+    replace = os.replace
+
+    def slow_replace(src, dst):
+        time.sleep(0.01)  # every writer has its temp file written before any rename
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", slow_replace)
+
+    def put(_):
+        start.wait(5)
+        return store.put(scenario)
+
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            digests = set(pool.map(put, range(8)))
+        [digest] = digests
+        assert store.get(digest) == scenario
+        assert [p.name for p in store.path(digest).parent.iterdir()] == [f"{digest}.json"]
+        store.path(digest).unlink()
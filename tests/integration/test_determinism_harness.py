@@ -0,0 +1,40 @@
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+from epgs.orchestrator.determinism import (
+    compare_ledgers,
+    first_diff_offset,
+    prove,
+    to_junit,
+)
+
+
+def test_prove_pool_and_interpreter_runs_agree(tmp_path):
+    scenarios = [
+        Path("src/epgs/scenarios/S-STABLE-SAFE.json"),
+        Path("src/epgs/scenarios/S-MIDSTOP-DEGRADE.json"),
+    ]
+
+    report = prove(scenarios, tmp_path, repeats=2, interpreters=1, workers=2)
+
+    assert report["ok"] is True
+    for s in report["scenarios"]:
+        assert len(s["runs"]) == 3
+        assert {r["mode"] for r in s["runs"]} == {"pool", "interpreter"}
+        assert s["reference_hash"] is not None
+        assert all(r["execution_hash"] == s["reference_hash"] for r in s["runs"])
+
+    suite = ET.fromstring(to_junit(report))
+    assert suite.get("failures") == "0"
+
+
+def test_first_differing_byte_is_reported():
+    assert first_diff_offset(b"abcdef", b"abcdef") is None
+    assert first_diff_offset(b"abcdef", b"abcXef") == 3
+    assert first_diff_offset(b"abc", b"abcdef") == 3
+
+    ref = [("a.json", b'{"x":1}'), ("b.json", b'{"y":2}')]
+    other = [("a.json", b'{"x":1}'), ("b.json", b'{"y":3}')]
+    assert compare_ledgers(ref, other) == {"file": "b.json", "other_file": "b.json", "offset": 5}
+    assert compare_ledgers(ref, ref) is None
+    assert compare_ledgers(ref, ref[:1])["blocks"] == [2, 1]
@@ -0,0 +1,154 @@
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+
+from epgs.ledger.bundle import export_bundle, verify_bundle
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIOS = [
+    "src/epgs/scenarios/S-STABLE-SAFE.json",
+    "src/epgs/scenarios/S-FAST-NOTREADY.json",
+    "src/epgs/scenarios/S-CAUTION-ASSIST.json",
+]
+
+
+def _run_all(root):
+    results = []
+    for i, scenario_path in enumerate(SCENARIOS):
+        results.append(run_scenario(scenario_path, output_root=str(root / f"run_{i}")))
+    return results
+
+
+@pytest.mark.parametrize("fmt", ["tar", "zip"])
+def test_export_and_verify_bundle(tmp_path, fmt):
+    root = tmp_path / "out"
+    results = _run_all(root)
+
+    bundle = tmp_path / f"evidence.{fmt}"
+    manifest = export_bundle(root, bundle, fmt=fmt)
+
+    assert manifest["block_count"] == len(SCENARIOS)
+    assert [e["final_hash"] for e in manifest["ledgers"]] == [r["execution_hash"] for r in results]
+    assert all(e["ok"] for e in manifest["ledgers"])
+
+    v = verify_bundle(bundle)
+    assert v == {"ok": True, "ledgers": len(SCENARIOS), "block_count": len(SCENARIOS)}
+
+
+def test_bundle_is_readable_by_tarfile(tmp_path):
+    root = tmp_path / "out"
+    _run_all(root)
+    bundle = tmp_path / "evidence.tar"
+    export_bundle(root, bundle)
+
+    with tarfile.open(bundle) as tf:
+        names = tf.getnames()
+    assert names[-1] == "MANIFEST.json"
+    assert "ledgers/run_0/ledger" in names[0]
+
+
+def test_scenario_filter(tmp_path):
+    root = tmp_path / "out"
+    _run_all(root)
+    bundle = tmp_path / "evidence.tar"
+
+    manifest = export_bundle(root, bundle, scenario="S-CAUTION-ASSIST")
+    assert [e["path"] for e in manifest["ledgers"]] == ["ledgers/run_2/ledger"]
+    assert verify_bundle(bundle)["ok"] is True
+
+
+def test_time_filter_excludes_old_ledgers(tmp_path):
+    root = tmp_path / "out"
+    _run_all(root)
+    manifest = export_bundle(root, tmp_path / "evidence.tar", since=4102444800.0)
+    assert manifest["ledgers"] == []
+
+
+def test_tampered_bundle_fails_verification(tmp_path):
+    root = tmp_path / "out"
+    _run_all(root)
+    bundle = tmp_path / "evidence.tar"
+    export_bundle(root, bundle)
+
+    data = bytearray(bundle.read_bytes())
+    pos = data.index(b'"permission":"ALLOW"')
+    data[pos + len('"permission":"')] = ord("B")
+    bundle.write_bytes(bytes(data))
+
+    v = verify_bundle(bundle)
+    assert v["ok"] is False
+    assert "sha256 mismatch" in v["reason"]
+
+
+def _rewrite(bundle, edit):
+    """
+    Re-pack a tar bundle with ``edit(name, data)`` applied to each member.
+    """
+    with tarfile.open(bundle) as tf:
+        members = [(m.name, tf.extractfile(m).read()) for m in tf if m.isfile()]
+    with tarfile.open(bundle, "w") as tf:
+        for name, data in members:
+            data = edit(name, data)
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+
+def _files_only(name, data):
+    if name != "MANIFEST.json":
+        return data
+    return json.dumps({"files": json.loads(data)["files"]}).encode()
+
+
+@pytest.mark.parametrize(
+    "edit, reason",
+    [
+        (lambda name, data: b"not json" if name == "MANIFEST.json" else data, "not JSON"),
+        (lambda name, data: b"[]" if name == "MANIFEST.json" else data, "malformed"),
+        (_files_only, "malformed"),
+    ],
+)
+def test_malformed_manifest_fails_verification(tmp_path, edit, reason):
+    root = tmp_path / "out"
+    _run_all(root)
+    bundle = tmp_path / "evidence.tar"
+    export_bundle(root, bundle)
+    _rewrite(bundle, edit)
+
+    v = verify_bundle(bundle)
+    assert v["ok"] is False
+    assert reason in v["reason"]
+
+
+@pytest.mark.parametrize("block", [b"{truncated", b"[]", b"{}"])
+def test_malformed_rblock_fails_verification(tmp_path, block):
+    root = tmp_path / "out"
+    _run_all(root)
+    bundle = tmp_path / "evidence.tar"
+    export_bundle(root, bundle)
+
+    def edit(name, data):
+        if name == "MANIFEST.json":
+            m = json.loads(data)
+            m["files"] = {k: hashlib.sha256(block).hexdigest() for k in m["files"]}
+            return json.dumps(m).encode()
+        return block
+
+    _rewrite(bundle, edit)
+    v = verify_bundle(bundle)
+    assert v["ok"] is False
+    assert v["reason"].startswith("unreadable block ")
+
+
+def test_truncated_bundle_fails_verification(tmp_path):
+    root = tmp_path / "out"
+    _run_all(root)
+    bundle = tmp_path / "evidence.tar"
+    export_bundle(root, bundle)
+    bundle.write_bytes(bundle.read_bytes()[:700])
+
+    assert verify_bundle(bundle)["ok"] is False
@@ -0,0 +1,168 @@
+import json
+import socket
+import struct
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from epgs.daemon import server as daemon
+from epgs.daemon.client import GateClient, GateError
+from epgs.daemon.protocol import ProtocolError, recv_frame
+from epgs.daemon.server import GateServer
+from epgs.orchestrator.admission import QUEUE_FULL, AdmissionController, SectorPolicy
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIO = "src/epgs/scenarios/S-CAUTION-ASSIST.json"
+
+
+@pytest.fixture
+def gate(tmp_path):
+    server = GateServer(str(tmp_path / "gate.sock"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = GateClient(server.path)
+    yield client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_socket_run_matches_direct_call(gate, tmp_path):
+    via_socket = gate.run(SCENARIO, str(tmp_path / "a"))
+    direct = run_scenario(SCENARIO, output_root=str(tmp_path / "b"))
+
+    for key in ("run_id", "permission", "final_state", "execution_hash"):
+        assert via_socket[key] == direct[key]
+
+    assert gate.verify(via_socket["ledger_dir"])["ok"] is True
+    assert gate.verify(str(tmp_path / "a"))["ok"] is True  # output root normalized
+
+
+def test_connections_are_pooled_across_calls_and_threads(gate, tmp_path):
+    assert gate.ping()
+    for i in range(5):
+        gate.run(SCENARIO, str(tmp_path / f"seq{i}"))
+    assert gate.connects == 1
+
+    errors = []
+
+    def worker(k):
+        try:
+            for i in range(5):
+                gate.run(SCENARIO, str(tmp_path / f"t{k}_{i}"))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert gate.connects <= 4
+
+
+def test_errors_come_back_as_gate_errors(gate, tmp_path):
+    with pytest.raises(GateError, match="unknown op"):
+        gate.call("nope")
+    with pytest.raises(GateError, match="unknown op"):
+        gate.call(["run"])  # unhashable
+    with pytest.raises(GateError, match="missing field"):
+        gate.call("run")
+    with pytest.raises(GateError):
+        gate.run(str(tmp_path / "missing.json"), str(tmp_path))
+    # The connection survives application errors
+    assert gate.ping()
+    assert gate.connects == 1
+
+
+def test_oversized_frame_is_rejected(gate):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(gate.path)
+        s.sendall(struct.pack(">I", 1 << 30))
+        resp = recv_frame(s)
+    assert resp["ok"] is False
+    assert "frame too large" in resp["error"]
+
+
+def test_socket_run_goes_through_the_gate(gate, tmp_path, monkeypatch):
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"scenario_id": "S-BAD", "sector_label": "ROBOTICS"}))
+    with pytest.raises(GateError, match="invalid scenario"):
+        gate.run(str(bad), str(tmp_path / "bad"))
+    assert not (tmp_path / "bad" / "ledger").exists()
+
+    with pytest.raises(GateError, match="does not match"):
+        gate.run(SCENARIO, str(tmp_path / "pinned"), scenario_sha256="0" * 64)
+
+    submitted = []
+    monkeypatch.setattr(
+        daemon, "shadow", SimpleNamespace(submit=lambda *args: submitted.append(args))
+    )
+    monkeypatch.setattr(
+        daemon, "admission", AdmissionController(policies={"ROBOTICS": SectorPolicy(max_depth=0)})
+    )
+    with pytest.raises(GateError, match="admission rejected") as shed:
+        gate.run(SCENARIO, str(tmp_path / "shed"))
+    assert shed.value.shed["final_state"] == "TERMINATED"
+    assert shed.value.shed["admission"] == {"sector": "ROBOTICS", "reason": QUEUE_FULL}
+    assert not (tmp_path / "shed" / "ledger").exists()
+
+    monkeypatch.setattr(daemon, "admission", None)
+    result = gate.run(SCENARIO, str(tmp_path / "ok"))
+    assert submitted == [(result, str(tmp_path / "ok"))]
+
+
+def _dropping_daemon(path, received):
+    """
+    A daemon that reads each request and closes without answering.
+    """
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                received.append(recv_frame(conn))
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener
+
+
+def test_lost_reply_is_not_resent_for_run(tmp_path):
+    received = []
+    listener = _dropping_daemon(str(tmp_path / "drop.sock"), received)
+    client = GateClient(str(tmp_path / "drop.sock"))
+    try:
+        # Pool a live connection, as after an earlier successful call
+        sock = client._connect()
+        client._release(sock)
+        with pytest.raises(ProtocolError, match="'run'"):
+            client.run(SCENARIO, str(tmp_path))
+        assert [r["op"] for r in received] == ["run"]
+
+        # Side-effect-free ops are retried once on a fresh connection
+        client._release(client._connect())
+        with pytest.raises(ProtocolError):
+            client.verify(str(tmp_path))
+        assert [r["op"] for r in received] == ["run", "verify", "verify"]
+    finally:
+        client.close()
+        listener.close()
+
+
+def test_dropped_idle_connection_is_retried_before_sending(gate, tmp_path):
+    assert gate.ping()
+    [idle] = gate._idle
+    idle.shutdown(socket.SHUT_WR)  # sending on it now fails: nothing reaches the daemon
+    result = gate.run(SCENARIO, str(tmp_path / "a"))
+    assert result["final_state"] == "EXECUTED"
+    assert gate.connects == 2
+    assert len(list((tmp_path / "a" / "ledger").glob("*.json"))) == 1
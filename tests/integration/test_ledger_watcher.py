@@ -0,0 +1,216 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from epgs.core.crypto import chained_hash
+from epgs.ledger.watcher import LedgerWatcher
+from epgs.main import app
+from epgs.orchestrator.replay import GENESIS_HASH
+from epgs.orchestrator.run import run_scenario
+
+
+def _name(i):
+    return f"{i:08x}-0000-0000-0000-000000000000.json"
+
+
+def _append(ledger_dir, i, prev):
+    payload = {
+        "scenario": "S-STABLE-SAFE",
+        "rblock_id": _name(i)[:-5],
+        "permission": "ALLOW",
+        "final_state": "EXECUTED",
+        "step": i,
+    }
+    h = chained_hash(payload, prev)
+    block = {**payload, "previous_hash": prev, "rblock_hash": h}
+    ledger_dir.mkdir(parents=True, exist_ok=True)
+    (ledger_dir / _name(i)).write_text(
+        json.dumps(block, sort_keys=True, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    return h
+
+
+def _write_ledger(ledger_dir, n):
+    prev = GENESIS_HASH
+    for i in range(n):
+        prev = _append(ledger_dir, i, prev)
+    return prev
+
+
+def _tamper(path):
+    path.write_text(path.read_text().replace('"ALLOW"', '"BLOCK"'))
+
+
+def _baseline(root):
+    w = LedgerWatcher(root)
+    alarms = []
+    w.add_alarm_hook(alarms.append)
+    w.apply({str(p): None for p in root.rglob("*") if p.is_dir()})
+    return w, alarms
+
+
+def _only(w):
+    [status] = w.status()["ledgers"]
+    return status
+
+
+def test_append_reads_only_the_new_block(tmp_path):
+    ledger = tmp_path / "a" / "ledger"
+    head = _write_ledger(ledger, 200)
+    w, alarms = _baseline(tmp_path)
+    assert _only(w)["head"] == head and _only(w)["count"] == 200
+
+    read = w.blocks_read
+    new_head = _append(ledger, 200, head)
+    w.apply({str(ledger): {_name(200)}})
+
+    assert w.blocks_read - read == 1
+    assert _only(w)["head"] == new_head
+    assert _only(w)["ok"] is True
+    assert alarms == []
+
+
+def test_tampered_middle_block_raises_alarm_with_last_head(tmp_path):
+    ledger = tmp_path / "ledger"
+    head = _write_ledger(ledger, 50)
+    w, alarms = _baseline(tmp_path)
+
+    _tamper(ledger / _name(20))
+    w.apply({str(ledger): {_name(20)}})
+
+    [alarm] = alarms
+    assert alarm["reason"] == f"hash mismatch in {_name(20)}"
+    assert alarm["last_verified_head"] == head
+    assert _only(w)["ok"] is False
+    assert w.alarms() == [alarm]
+
+
+def test_consistent_rewrite_is_caught_by_successor(tmp_path):
+    # Re-hashing a middle block correctly still breaks the next link
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 10)
+    w, alarms = _baseline(tmp_path)
+
+    prev = json.loads((ledger / _name(3)).read_text())["previous_hash"]
+    block = json.loads((ledger / _name(3)).read_text())
+    block.pop("rblock_hash")
+    block.pop("previous_hash")
+    block["permission"] = "BLOCK"
+    block["rblock_hash"] = chained_hash(block, prev)
+    block["previous_hash"] = prev
+    (ledger / _name(3)).write_text(json.dumps(block, sort_keys=True, separators=(",", ":")))
+
+    read = w.blocks_read
+    w.apply({str(ledger): {_name(3)}})
+    assert w.blocks_read - read == 1  # successor checked from its cached link
+    assert alarms[0]["reason"] == f"previous_hash mismatch in {_name(4)}"
+
+
+def test_truncation_alarms_but_run_reset_does_not(tmp_path):
+    ledger = tmp_path / "a" / "ledger"
+    _write_ledger(ledger, 5)
+    run_scenario("src/epgs/scenarios/S-STABLE-SAFE.json", output_root=str(tmp_path / "b"))
+    w, alarms = _baseline(tmp_path)
+
+    (ledger / _name(4)).unlink()
+    w.apply({str(ledger): {_name(4)}})
+    assert [a["reason"] for a in alarms] == [f"verified head {_name(4)} removed or rewritten"]
+
+    # run_scenario clears and rewrites its ledger on every run
+    result = run_scenario(
+        "src/epgs/scenarios/S-CAUTION-ASSIST.json", output_root=str(tmp_path / "b")
+    )
+    w.apply({result["ledger_dir"]: None})
+    assert len(alarms) == 1
+    status = {s["ledger"]: s for s in w.status()["ledgers"]}[result["ledger_dir"]]
+    assert status["ok"] is True
+    assert status["head"] == result["execution_hash"]
+    assert status["resets"] == 1
+
+
+def test_partial_write_is_retried_before_alarming(tmp_path):
+    ledger = tmp_path / "ledger"
+    head = _write_ledger(ledger, 3)
+    w, alarms = _baseline(tmp_path)
+
+    (ledger / _name(3)).write_text('{"scenario": ')
+    w.apply({str(ledger): {_name(3)}})
+    assert alarms == []  # may still be mid-write
+
+    _append(ledger, 3, head)
+    w.apply({str(ledger): {_name(3)}})
+    assert alarms == [] and _only(w)["count"] == 4
+
+
+@pytest.mark.parametrize("mode", ["inotify", "poll"])
+def test_background_thread_detects_tampering(tmp_path, mode):
+    ledger = tmp_path / "runs" / "r1" / "ledger"
+    _write_ledger(ledger, 20)
+    alarms = []
+    w = LedgerWatcher(tmp_path, mode=mode, interval=0.05, on_alarm=alarms.append).start()
+    try:
+        assert w.status()["mode"] == mode
+        # A ledger created after start is picked up too
+        late = tmp_path / "runs" / "r2" / "ledger"
+        _write_ledger(late, 3)
+        _tamper(ledger / _name(7))
+
+        deadline = time.monotonic() + 10
+        while not alarms and time.monotonic() < deadline:
+            time.sleep(0.02)
+        while len(w.status()["ledgers"]) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        w.stop()
+
+    assert alarms and alarms[0]["reason"] == f"hash mismatch in {_name(7)}"
+    assert {s["count"] for s in w.status()["ledgers"]} == {20, 3}
+
+
+def test_alarm_hook_may_query_the_watcher(tmp_path):
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 5)
+    seen = []
+
+    def hook(rec):
+        # Runs on the watcher thread; must not deadlock against its lock
+        seen.append((rec, w.alarms(), w.status()["alarms"]))
+
+    w = LedgerWatcher(tmp_path, mode="poll", interval=0.05, on_alarm=hook).start()
+    try:
+        _tamper(ledger / _name(2))
+        deadline = time.monotonic() + 10
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert w.status()["ledgers"][0]["ok"] is False
+    finally:
+        w.stop()
+
+    [(rec, alarms, count)] = seen
+    assert alarms == [rec] and count == 1
+
+
+def test_api_starts_watchers_from_env(tmp_path, monkeypatch):
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 4)
+    monkeypatch.setenv("EPGS_WATCH", str(tmp_path))
+    monkeypatch.setenv("EPGS_WATCH_MODE", "poll")
+    monkeypatch.setenv("EPGS_WATCH_INTERVAL", "0.05")
+
+    with TestClient(app) as client:
+        status = client.get("/watch").json()
+        assert status["enabled"] is True
+        assert status["watchers"][0]["ledgers"][0]["count"] == 4
+
+        _tamper(ledger / _name(1))
+        deadline = time.monotonic() + 10
+        alarms = []
+        while not alarms and time.monotonic() < deadline:
+            time.sleep(0.05)
+            alarms = client.get("/watch/alarms").json()
+
+    assert alarms[0]["ledger"] == str(ledger)
+    assert "hash mismatch" in alarms[0]["reason"]
@@ -0,0 +1,92 @@
+import pstats
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from epgs.core import profiling
+from epgs.core.profiling import force_profiling, recent_profiles
+from epgs.main import app
+from epgs.orchestrator.replay import verify_chain
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIO = "src/epgs/scenarios/S-STABLE-SAFE.json"
+
+
+def test_unforced_calls_are_not_profiled(tmp_path, monkeypatch):
+    monkeypatch.delenv("EPGS_PROFILE", raising=False)
+    run_scenario(SCENARIO, output_root=str(tmp_path))
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_forced_run_and_verify_write_profiles_keyed_by_run_id(tmp_path):
+    with force_profiling():
+        result = run_scenario(SCENARIO, output_root=str(tmp_path))
+        assert verify_chain(result["ledger_dir"])["ok"] is True
+
+    target = tmp_path / "profiles" / result["run_id"]
+    assert (target / "run_scenario.prof").exists()
+    assert (target / "verify_chain.prof").exists()
+    pstats.Stats(str(target / "run_scenario.prof"))  # loadable
+
+    latest = recent_profiles(2)
+    assert [p["kind"] for p in latest] == ["verify_chain", "run_scenario"]
+    assert latest[1]["key"] == result["run_id"]
+    assert "cumulative" in latest[1]["summary"]
+
+
+def test_failed_profiler_start_does_not_disable_profiling(tmp_path, monkeypatch):
+    class Broken:
+        ext = "prof"
+
+        def start(self):
+            raise RuntimeError("another profiler is already active")
+
+    monkeypatch.setitem(profiling._BACKENDS, "broken", Broken)
+    with force_profiling("broken"), pytest.raises(RuntimeError):
+        run_scenario(SCENARIO, output_root=str(tmp_path / "a"))
+
+    # The thread is not left marked as profiling
+    with force_profiling():
+        result = run_scenario(SCENARIO, output_root=str(tmp_path / "b"))
+    assert (tmp_path / "b" / "profiles" / result["run_id"] / "run_scenario.prof").exists()
+
+
+def test_sampling_rate_is_counter_based(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPGS_PROFILE", "1")
+    monkeypatch.setenv("EPGS_PROFILE_RATE", "0.25")
+    monkeypatch.setattr(profiling, "_calls", 0)
+
+    for i in range(8):
+        run_scenario(SCENARIO, output_root=str(tmp_path / f"r{i}"))
+
+    # Exactly every 4th call: r3 and r7
+    assert len(list(tmp_path.glob("r*/profiles/*/run_scenario.prof"))) == 2
+
+
+def test_profile_header_and_debug_endpoint(tmp_path):
+    client = TestClient(app)
+
+    r = client.post(
+        "/run",
+        json={"scenario_path": SCENARIO, "output_root": str(tmp_path)},
+        headers={"X-EPGS-Profile": "sampling"},
+    )
+    assert r.status_code == 200, r.text
+    run_id = r.json()["run_id"]
+    assert (tmp_path / "profiles" / run_id / "run_scenario.folded").exists()
+
+    r = client.get("/debug/profile", params={"n": 1})
+    assert r.status_code == 200
+    [capture] = r.json()
+    assert capture["backend"] == "sampling"
+    assert capture["key"] == run_id
+    assert Path(capture["path"]).exists()
+
+    r = client.post(
+        "/run",
+        json={"scenario_path": SCENARIO, "output_root": str(tmp_path)},
+        headers={"X-EPGS-Profile": "nope"},
+    )
+    assert r.status_code == 400
@@ -1,6 +1,5 @@
 from pathlib import Path
 
-import epgs.orchestrator.run as run_module
 from epgs.orchestrator.run import run_scenario
 from epgs.orchestrator.replay import verify_chain
 
@@ -14,47 +13,17 @@ SCENARIOS = [
 ]
 
 
-class FixedUUIDSequence:
-    """
-    Deterministic UUID generator.
-    Each run_scenario() calls uuid.uuid4() twice:
-      1) run_id
-      2) rblock_id
-    """
-
-    def __init__(self, run_id: str, rblock_id: str):
-        self.values = [run_id, rblock_id]
-        self.idx = 0
-
-    def reset(self):
-        self.idx = 0
-
-    def uuid4(self):
-        v = self.values[self.idx]
-        self.idx = (self.idx + 1) % 2
-        return v
-
-
-def test_replay_equivalence_all_scenarios(monkeypatch, tmp_path):
+def test_replay_equivalence_all_scenarios(tmp_path):
     for i, scenario_path in enumerate(SCENARIOS):
-        # Unique deterministic IDs per scenario
-        run_id = f"11111111-1111-1111-1111-{i:012d}"
-        rblock_id = f"22222222-2222-2222-2222-{i:012d}"
-
-        fixed = FixedUUIDSequence(run_id, rblock_id)
-        monkeypatch.setattr(run_module.uuid, "uuid4", fixed.uuid4)
-
         out1 = tmp_path / f"scenario_{i}_run1"
         out2 = tmp_path / f"scenario_{i}_run2"
 
         # --- Run #1 ---
-        fixed.reset()
         res1 = run_scenario(scenario_path, output_root=str(out1))
         v1 = verify_chain(res1["ledger_dir"])
         assert v1["ok"] is True
 
         # --- Run #2 ---
-        fixed.reset()
         res2 = run_scenario(scenario_path, output_root=str(out2))
         v2 = verify_chain(res2["ledger_dir"])
         assert v2["ok"] is True
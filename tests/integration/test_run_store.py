@@ -0,0 +1,273 @@
+import json
+import pathlib
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from epgs import main
+from epgs.cli import main as cli_main
+from epgs.ledger.runs import RunStore, run_store, store_path
+from epgs.orchestrator import run as run_module
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIOS = [
+    "src/epgs/scenarios/S-STABLE-SAFE.json",
+    "src/epgs/scenarios/S-CAUTION-ASSIST.json",
+    "src/epgs/scenarios/S-MIDSTOP-DEGRADE.json",
+]
+
+
+class FakeClock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _result(i, permission="ALLOW", final_state="EXECUTED"):
+    return {
+        "run_id": f"RUN-{i}",
+        "rblock_id": f"RB-{i}",
+        "permission": permission,
+        "final_state": final_state,
+        "execution_hash": f"{i:064x}",
+    }
+
+
+def _fill(store, n):
+    store.append_many(
+        (
+            _result(i, *(("BLOCK", "TERMINATED") if i % 10 == 0 else ("ALLOW", "EXECUTED"))),
+            f"S-{i % 50}",
+            "ENERGY" if i % 2 else "ROBOTICS",
+        )
+        for i in range(n)
+    )
+
+
+def test_run_scenario_records_its_result(tmp_path):
+    for path in SCENARIOS:
+        run_scenario(path, output_root=str(tmp_path))
+
+    store = run_store(tmp_path)
+    assert store.path == tmp_path / "runs.sqlite3"
+    assert len(store) == 3
+
+    page = store.query()
+    assert [r["scenario"] for r in page["runs"]] == [
+        "S-MIDSTOP-DEGRADE",
+        "S-CAUTION-ASSIST",
+        "S-STABLE-SAFE",
+    ]
+    last = run_scenario(SCENARIOS[0], output_root=str(tmp_path))
+    assert store.get(last["run_id"]) == {
+        **last,
+        "id": 4,
+        "created_at": store.get(last["run_id"])["created_at"],
+        "scenario": "S-STABLE-SAFE",
+        "sector_label": "ENERGY",
+    }
+    # The ledger keeps only the latest run; the store keeps them all
+    assert len(list((tmp_path / "ledger").glob("*.json"))) == 1
+    assert len(store) == 4
+
+
+def test_failed_rblock_write_records_no_row(tmp_path, monkeypatch):
+    run_scenario(SCENARIOS[0], output_root=str(tmp_path))
+    write_text = pathlib.Path.write_text
+
+    def failing(self, *args, **kwargs):
+        if self.parent.name == "ledger":
+            # The store's write lock is not held while the block is written
+            other = sqlite3.connect(tmp_path / "runs.sqlite3", timeout=0, isolation_level=None)
+            other.execute("BEGIN IMMEDIATE")  # "database is locked" otherwise
+            other.execute("ROLLBACK")
+            other.close()
+            raise OSError("disk full")
+        return write_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(pathlib.Path, "write_text", failing)
+    with pytest.raises(OSError):
+        run_scenario(SCENARIOS[1], output_root=str(tmp_path))
+
+    assert len(run_store(tmp_path)) == 1
+    assert list((tmp_path / "ledger").iterdir()) == []
+
+
+def test_orphan_rblock_is_recorded_by_the_next_process(tmp_path, monkeypatch):
+    def crash(*args, **kwargs):
+        raise SystemExit("killed between the R-Block and its row")
+
+    monkeypatch.setattr(RunStore, "record", crash)
+    with pytest.raises(SystemExit):
+        run_scenario(SCENARIOS[1], output_root=str(tmp_path))
+    monkeypatch.undo()
+    [orphan] = (tmp_path / "ledger").glob("*.json")
+
+    last = run_scenario(SCENARIOS[0], output_root=str(tmp_path))
+
+    store = run_store(tmp_path)
+    first, second = store.query()["runs"][::-1]
+    assert first["rblock_id"] == orphan.stem and first["reconciled"] is True
+    assert first["scenario"] == "S-CAUTION-ASSIST"
+    assert first["sector_label"] == "ROBOTICS"  # from the recorded input
+    assert first["permission"] == "ASSIST"
+    assert second["run_id"] == last["run_id"] and "reconciled" not in second
+
+    # Reconciling again finds nothing new
+    assert run_module.reconcile(store, tmp_path) == 0
+
+
+def test_sharded_orphans_are_reconciled_off_the_run_path(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("EPGS_LEDGER_SHARDS", "2")
+    for _ in range(3):
+        run_scenario(SCENARIOS[0], output_root=str(tmp_path))
+
+    def crash(*args, **kwargs):
+        raise SystemExit("killed between the R-Block and its row")
+
+    monkeypatch.setattr(RunStore, "record", crash)
+    with pytest.raises(SystemExit):
+        run_scenario(SCENARIOS[1], output_root=str(tmp_path))
+    monkeypatch.undo()
+    monkeypatch.setenv("EPGS_LEDGER_SHARDS", "2")
+
+    # A run never scans the sharded ledger
+    scanned = []
+    load_rblock = run_module.load_rblock
+    monkeypatch.setattr(run_module, "load_rblock", lambda f: scanned.append(f) or load_rblock(f))
+    run_scenario(SCENARIOS[0], output_root=str(tmp_path))
+    assert scanned == [] and len(run_store(tmp_path)) == 4
+
+    # Startup / on demand: one pass records the orphan
+    assert cli_main(["runs", "--reconcile", "--out", str(tmp_path)]) == 0
+    assert json.loads(capsys.readouterr().out) == {"reconciled": 1}
+    [orphan] = run_store(tmp_path).query(scenario="S-CAUTION-ASSIST")["runs"]
+    assert orphan["reconciled"] is True and orphan["sector_label"] == "ROBOTICS"
+
+    # Later reconciles read each ledger's last checked block and what follows it
+    run_scenario(SCENARIOS[0], output_root=str(tmp_path))
+    scanned.clear()
+    monkeypatch.setenv("EPGS_RECONCILE", str(tmp_path))
+    assert run_module.reconcile_from_env() == {str(tmp_path): 0}
+    assert len(scanned) == 3  # 2 shards + 1 new block
+    assert len(run_store(tmp_path)) == 6
+
+
+def test_rows_are_append_only(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    _fill(store, 3)
+    conn = sqlite3.connect(store.path)
+    with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+        conn.execute("UPDATE runs SET permission = 'ALLOW'")
+    with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+        conn.execute("DELETE FROM runs")
+
+
+def test_cursor_pagination_and_filters(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    _fill(store, 1000)
+
+    seen, cursor = [], None
+    while True:
+        page = store.query(cursor=cursor, limit=64, permission="BLOCK")
+        seen += [r["run_id"] for r in page["runs"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"RUN-{i}" for i in range(990, -1, -10)]
+
+    page = store.query(limit=1000, scenario="S-7", sector_label="ENERGY")
+    assert [r["run_id"] for r in page["runs"]] == [f"RUN-{i}" for i in range(957, -1, -50)]
+    assert page["next_cursor"] is None
+
+    assert store.query(final_state="TERMINATED", limit=1)["runs"][0]["run_id"] == "RUN-990"
+    with pytest.raises(ValueError):
+        store.query(ube_class="STABLE")
+
+
+def test_time_range_is_non_decreasing_in_insert_order(tmp_path):
+    clock = FakeClock()
+    store = RunStore(tmp_path / "runs.sqlite3", clock=clock)
+    for i in range(10):
+        clock.now = 1000.0 + i
+        store.append(_result(i), "S-X")
+    clock.now = 995.0  # wall clock stepped back
+    store.append(_result(10), "S-X")
+
+    def ids(**kw):
+        return [r["run_id"] for r in store.query(**kw)["runs"]]
+
+    assert ids(since=1003, until=1006) == ["RUN-5", "RUN-4", "RUN-3"]
+    assert ids(since=1009) == ["RUN-10", "RUN-9"]
+    assert ids(since=2000) == []
+    assert ids(until=1000) == []
+    assert store.get("RUN-10")["created_at"] == 1009.0
+
+
+def test_queries_use_indexes_and_stay_fast(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    _fill(store, 100_000)
+    conn = sqlite3.connect(store.path)
+
+    for column in ("scenario", "sector_label", "permission", "final_state"):
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM runs WHERE {column} = ? AND id <= ? "
+                "ORDER BY id DESC LIMIT 51",
+                ("x", 10**9),
+            )
+        )
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+    store.query(permission="BLOCK")  # warm the page cache
+    t0 = time.perf_counter()
+    cursor = None
+    for _ in range(20):
+        page = store.query(cursor=cursor, permission="BLOCK", since=0)
+        cursor = page["next_cursor"]
+    per_page = (time.perf_counter() - t0) / 20
+    assert per_page < 0.05
+
+
+def test_runs_endpoint_and_cli(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(main, "admission", None)
+    for path in SCENARIOS:
+        run_scenario(path, output_root=str(tmp_path))
+    client = TestClient(main.app)
+
+    r = client.get("/runs", params={"output_root": str(tmp_path), "limit": 2})
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["runs"]) == 2 and body["next_cursor"] == 2
+
+    r = client.get("/runs", params={"output_root": str(tmp_path), "cursor": body["next_cursor"]})
+    assert [run["scenario"] for run in r.json()["runs"]] == ["S-STABLE-SAFE"]
+    assert r.json()["next_cursor"] is None
+
+    r = client.get("/runs", params={"output_root": str(tmp_path), "final_state": "TERMINATED"})
+    assert [run["scenario"] for run in r.json()["runs"]] == ["S-MIDSTOP-DEGRADE"]
+
+    assert client.get("/runs", params={"output_root": str(tmp_path / "none")}).status_code == 404
+
+    assert cli_main(["runs", "--out", str(tmp_path), "--scenario", "S-CAUTION-ASSIST"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert [run["scenario"] for run in out["runs"]] == ["S-CAUTION-ASSIST"]
+
+
+def test_store_can_be_relocated_or_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPGS_RUN_STORE", str(tmp_path / "all-runs.sqlite3"))
+    run_scenario(SCENARIOS[0], output_root=str(tmp_path / "a"))
+    run_scenario(SCENARIOS[1], output_root=str(tmp_path / "b"))
+    assert len(RunStore(tmp_path / "all-runs.sqlite3")) == 2
+
+    monkeypatch.setenv("EPGS_RUN_STORE", "0")
+    assert store_path(tmp_path) is None
+    run_scenario(SCENARIOS[0], output_root=str(tmp_path / "c"))
+    assert not (tmp_path / "c" / "runs.sqlite3").exists()
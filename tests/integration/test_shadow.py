@@ -0,0 +1,194 @@
+import json
+import sys
+import textwrap
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from epgs import main
+from epgs.cli import main as cli_main
+from epgs.orchestrator.run import run_scenario
+from epgs.profiles.base import apply_profile
+from epgs.orchestrator.shadow import ShadowEvaluator, load_candidate, shadow_corpus
+
+
+SCENARIOS = [
+    "src/epgs/scenarios/S-STABLE-SAFE.json",  # ENERGY
+    "src/epgs/scenarios/S-CAUTION-ASSIST.json",  # ROBOTICS
+    "src/epgs/scenarios/S-FAST-NOTREADY.json",  # MOBILITY
+]
+
+# Stricter candidate: ASSIST becomes BLOCK, everything else unchanged
+CANDIDATE = """
+from epgs.profiles.base import apply_profile
+
+def strict(scenario):
+    result = apply_profile(scenario)
+    if result["permission"] == "ASSIST":
+        result["permission"] = "BLOCK"
+    return result
+
+def broken(scenario):
+    raise RuntimeError("candidate bug")
+"""
+
+
+@pytest.fixture
+def candidates(tmp_path, monkeypatch):
+    (tmp_path / "shadow_candidates.py").write_text(textwrap.dedent(CANDIDATE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "shadow_candidates"
+    sys.modules.pop("shadow_candidates", None)
+
+
+def _log(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_load_candidate(candidates):
+    strict = load_candidate(f"{candidates}:strict")
+    assert strict({"scenario": "S-CAUTION-ASSIST"})["permission"] == "BLOCK"
+    with pytest.raises(ValueError):
+        load_candidate("no_function_given")
+
+
+def test_live_shadow_logs_divergences_by_sector(tmp_path, candidates):
+    shadow = ShadowEvaluator(load_candidate(f"{candidates}:strict"), tmp_path / "diffs.ndjson")
+    results = [run_scenario(path, output_root=str(tmp_path / "out")) for path in SCENARIOS]
+    for result in results:
+        assert shadow.submit(result, tmp_path / "out")
+    assert shadow.drain(10)
+
+    [rec] = _log(tmp_path / "diffs.ndjson")
+    assert rec["type"] == "divergence"
+    assert rec["run_id"] == results[1]["run_id"]
+    assert rec["sector"] == "ROBOTICS"
+    assert rec["diff"] == {
+        "permission": {"active": "ASSIST", "candidate": "BLOCK"},
+        "final_state": {"active": "EXECUTED", "candidate": "TERMINATED"},
+    }
+
+    stats = shadow.stats()
+    assert stats["evaluated"] == 3 and stats["diverged"] == 1
+    assert stats["by_sector"]["ROBOTICS"]["fields"]["permission"] == {"ASSIST->BLOCK": 1}
+    assert stats["by_sector"]["ENERGY"] == {
+        "evaluated": 1,
+        "diverged": 0,
+        "rate": 0.0,
+        "fields": {"permission": {}, "final_state": {}},
+    }
+    # The diff log is the shadow's only output
+    assert not list((tmp_path / "out").glob("shadow*"))
+    shadow.close()
+
+
+def test_live_shadow_reads_inputs_of_a_sharded_ledger(tmp_path, monkeypatch, candidates):
+    monkeypatch.setenv("EPGS_LEDGER_SHARDS", "4")
+    shadow = ShadowEvaluator(load_candidate(f"{candidates}:strict"), tmp_path / "diffs.ndjson")
+    results = [run_scenario(path, output_root=str(tmp_path / "out")) for path in SCENARIOS]
+    assert all("shard-" in r["ledger_dir"] for r in results)
+    for result in results:
+        assert shadow.submit(result, tmp_path / "out")
+    assert shadow.drain(10)
+
+    stats = shadow.stats()
+    assert (stats["evaluated"], stats["diverged"], stats["errors"]) == (3, 1, 0)
+    assert [r["sector"] for r in _log(tmp_path / "diffs.ndjson")] == ["ROBOTICS"]
+    shadow.close()
+
+
+def test_submit_never_waits_for_the_candidate(tmp_path):
+    release = threading.Event()
+
+    def slow(scenario):
+        release.wait(10)
+        return {"permission": "ALLOW", "stop_issued": False, "neuro_pause": False}
+
+    shadow = ShadowEvaluator(slow, tmp_path / "diffs.ndjson", workers=1, max_pending=1)
+    result = run_scenario(SCENARIOS[0], output_root=str(tmp_path / "out"))
+
+    assert shadow.submit(result, tmp_path / "out") is True
+    assert shadow.submit(result, tmp_path / "out") is False  # saturated: dropped, not queued
+    failed = {**result, "reason_code": "DEADLINE_EXCEEDED"}
+    assert shadow.submit(failed, tmp_path / "out") is False
+    assert shadow.stats()["pending"] == 1
+
+    release.set()
+    assert shadow.drain(10)
+    stats = shadow.stats()
+    outcomes = (stats["submitted"], stats["dropped"], stats["skipped"], stats["evaluated"])
+    assert outcomes == (1, 1, 1, 1)
+    shadow.close()
+
+
+def test_broken_candidate_is_contained(tmp_path, candidates):
+    shadow = ShadowEvaluator(load_candidate(f"{candidates}:broken"), tmp_path / "diffs.ndjson")
+    shadow.submit(run_scenario(SCENARIOS[0], output_root=str(tmp_path / "out")), tmp_path / "out")
+    assert shadow.drain(10)
+    assert shadow.stats()["errors"] == 1
+    assert _log(tmp_path / "diffs.ndjson")[0]["reason"] == "candidate bug"
+    shadow.close()
+
+
+def test_run_endpoint_feeds_the_shadow(tmp_path, monkeypatch, candidates):
+    shadow = ShadowEvaluator(load_candidate(f"{candidates}:strict"), tmp_path / "diffs.ndjson")
+    monkeypatch.setattr(main, "admission", None)
+    monkeypatch.setattr(main, "shadow", shadow)
+    client = TestClient(main.app)
+
+    r = client.post(
+        "/run", json={"scenario_path": SCENARIOS[1], "output_root": str(tmp_path / "out")}
+    )
+    assert r.status_code == 200
+    assert r.json()["permission"] == "ASSIST"  # the active profile still decides
+    assert shadow.drain(10)
+
+    stats = client.get("/shadow/stats").json()
+    assert stats["enabled"] is True
+    assert stats["by_sector"]["ROBOTICS"]["diverged"] == 1
+    shadow.close()
+
+
+def test_offline_corpus_and_cli(tmp_path, candidates, capsys):
+    for i, path in enumerate(SCENARIOS * 2):
+        run_scenario(path, output_root=str(tmp_path / f"run{i % 2}"))
+    stores = [str(tmp_path / "run0" / "inputs"), str(tmp_path / "run1" / "inputs")]
+
+    *records, summary = shadow_corpus(stores, load_candidate(f"{candidates}:strict"), workers=2)
+    assert summary["inputs"] == summary["evaluated"] == 3  # identical inputs counted once
+    assert summary["ok"] is False and summary["divergences"] == 1
+    assert [r["scenario"] for r in records] == ["S-CAUTION-ASSIST"]
+    assert summary["by_sector"]["ROBOTICS"]["fields"]["final_state"] == {"EXECUTED->TERMINATED": 1}
+
+    [same] = shadow_corpus(stores, apply_profile)
+    assert same["ok"] is True
+
+    log = tmp_path / "offline.ndjson"
+    assert cli_main(["shadow", f"{candidates}:strict", *stores, "--log", str(log)]) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[-1]["type"] == "summary" and lines[-1]["divergences"] == 1
+    assert [r["type"] for r in _log(log)] == ["divergence"]
+
+
+def test_lifespan_drains_and_closes_the_shadow(tmp_path, monkeypatch, candidates):
+    shadow = ShadowEvaluator(load_candidate(f"{candidates}:strict"), tmp_path / "diffs.ndjson")
+    monkeypatch.setattr(main, "admission", None)
+    monkeypatch.setattr(main, "shadow", shadow)
+
+    with TestClient(main.app) as client:
+        r = client.post(
+            "/run", json={"scenario_path": SCENARIOS[1], "output_root": str(tmp_path / "out")}
+        )
+        assert r.status_code == 200
+
+    # Shutdown waited for the evaluation, then closed the diff log
+    assert shadow.stats()["evaluated"] == 1
+    assert [r["type"] for r in _log(tmp_path / "diffs.ndjson")] == ["divergence"]
+    assert shadow.log._f.closed
+
+    # A late submit after close is skipped, and close is idempotent
+    late = run_scenario(SCENARIOS[0], output_root=str(tmp_path / "out"))
+    assert shadow.submit(late, tmp_path / "out") is False
+    assert shadow.stats()["skipped"] == 1
+    shadow.close()
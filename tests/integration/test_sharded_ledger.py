@@ -0,0 +1,181 @@
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from epgs.cli import main as cli_main
+from epgs.core import ids
+from epgs.core.crypto import chained_hash
+from epgs.ledger.sharded import (
+    ShardedLedger,
+    iter_merged,
+    shard_dir_name,
+    shard_of,
+    verify_sharded,
+)
+from epgs.ledger.runs import run_store
+from epgs.orchestrator.replay import list_rblock_files, replay_decisions, verify_chain
+from epgs.orchestrator.run import run_scenario
+
+SECTORS = ["ENERGY", "AEROSPACE_DEFENSE", "AUTONOMOUS_MOBILITY", "INDUSTRIAL_ROBOTICS"]
+
+
+def _payload(i, sector=None):
+    return {
+        "scenario": "S-STABLE-SAFE",
+        "run_id": f"run-{i}",
+        "sector_label": sector or SECTORS[i % len(SECTORS)],
+        "permission": "ALLOW",
+        "final_state": "EXECUTED",
+    }
+
+
+def _write(root, n, shards=4, key="sector_label", epoch_every=0):
+    ledger = ShardedLedger(root, shards=shards, key=key, epoch_every=epoch_every)
+    for i in range(n):
+        ledger.append(_payload(i))
+    return ledger
+
+
+def test_blocks_route_by_key_and_each_shard_is_a_plain_chain(tmp_path):
+    _write(tmp_path, 40)
+
+    for i in range(4):
+        shard = tmp_path / shard_dir_name(i)
+        blocks = [json.loads(f.read_text()) for f in list_rblock_files(shard)]
+        assert all(shard_of(b["sector_label"], 4) == i for b in blocks)
+        assert [b["shard_seq"] for b in blocks] == list(range(len(blocks)))
+        if blocks:
+            assert verify_chain(str(shard))["count"] == len(blocks)
+
+
+def test_epochs_commit_to_all_shard_heads(tmp_path):
+    ledger = _write(tmp_path, 30, epoch_every=10)
+    assert ledger._since_epoch == 0
+
+    result = verify_sharded(tmp_path)
+    assert result["ok"] is True
+    assert result["epochs"] == 3
+    assert result["blocks"] == 30
+    assert result["uncommitted"] == 0
+
+    ledger.append(_payload(99))
+    assert verify_sharded(tmp_path)["uncommitted"] == 1
+
+    last = json.loads(list_rblock_files(tmp_path / "epochs")[-1].read_text())
+    assert result["epoch_hash"] == last["rblock_hash"]
+    assert [h[0] for h in last["heads"]] == [0, 1, 2, 3]
+
+
+def test_tampering_a_shard_or_rewriting_it_consistently_is_detected(tmp_path):
+    _write(tmp_path, 20).seal_epoch()
+    target = list_rblock_files(tmp_path / shard_dir_name(shard_of("ENERGY", 4)))[1]
+    original = target.read_text()
+
+    target.write_text(original.replace('"ALLOW"', '"BLOCK"'))
+    result = verify_sharded(tmp_path)
+    assert result["ok"] is False
+    assert result["reason"].endswith(f"hash mismatch in {target.name}")
+
+    # Rewrite the whole shard as a valid chain: only the epoch catches it
+    prev = "0" * 64
+    for f in list_rblock_files(target.parent):
+        block = json.loads(original if f == target else f.read_text())
+        block.pop("previous_hash")
+        block.pop("rblock_hash")
+        block["permission"] = "BLOCK"
+        block["rblock_hash"] = chained_hash(block, prev)
+        block["previous_hash"] = prev
+        prev = block["rblock_hash"]
+        f.write_text(json.dumps(block))
+
+    result = verify_sharded(tmp_path)
+    assert result["ok"] is False
+    assert "commitment mismatch" in result["reason"]
+
+
+def test_merge_order_is_deterministic(tmp_path):
+    _write(tmp_path / "a", 25, epoch_every=7)
+    _write(tmp_path / "b", 25, epoch_every=7)
+
+    merged = [b["rblock_hash"] for b in iter_merged(tmp_path / "a")]
+    assert merged == [b["rblock_hash"] for b in iter_merged(tmp_path / "b")]
+    assert len(merged) == 25
+
+
+def test_layout_is_fixed_once_created(tmp_path):
+    ShardedLedger(tmp_path, shards=4)
+    with pytest.raises(ValueError):
+        ShardedLedger(tmp_path, shards=8)
+    with pytest.raises(ValueError):
+        ShardedLedger(tmp_path, shards=4).append({"run_id": "x"})
+
+
+def _append_many(root, worker):
+    ledger = ShardedLedger(root, shards=4, key="run_id")
+    for i in range(50):
+        ledger.append({**_payload(i), "run_id": f"w{worker}-{i}"})
+        if i % 20 == 0:
+            ledger.seal_epoch()
+
+
+def test_concurrent_writers_across_processes_and_threads(tmp_path):
+    ShardedLedger(tmp_path, shards=4, key="run_id")
+    with ProcessPoolExecutor(max_workers=2) as procs, ThreadPoolExecutor(max_workers=2) as threads:
+        futures = [procs.submit(_append_many, str(tmp_path), w) for w in range(2)]
+        futures += [threads.submit(_append_many, str(tmp_path), w) for w in range(2, 4)]
+        for f in futures:
+            f.result()
+
+    result = verify_sharded(tmp_path)
+    assert result["ok"] is True
+    assert result["blocks"] == 200
+    assert result["epochs"] == 12
+
+
+def test_cli_verify_sharded(tmp_path, capsys):
+    _write(tmp_path, 5).seal_epoch()
+    assert cli_main(["verify-sharded", str(tmp_path)]) == 0
+    assert json.loads(capsys.readouterr().out)["epochs"] == 1
+    assert cli_main(["verify-sharded", str(tmp_path / "missing")]) == 1
+
+
+def test_gate_runs_opt_into_the_sharded_ledger(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPGS_LEDGER_SHARDS", "4")
+    scenarios = [
+        "src/epgs/scenarios/S-STABLE-SAFE.json",
+        "src/epgs/scenarios/S-CAUTION-ASSIST.json",
+        "src/epgs/scenarios/S-FAST-NOTREADY.json",
+    ]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        runs = pool.map(lambda p: run_scenario(p, output_root=str(tmp_path)), scenarios * 4)
+        results = list(runs)
+
+    # Runs accumulate (no per-run reset), one chain per sector
+    verified = verify_sharded(tmp_path / "ledger")
+    assert verified["ok"] is True and verified["blocks"] == 12
+    for result in results:
+        chain = verify_chain(result["ledger_dir"])
+        assert chain["ok"] is True and chain["count"] == 4
+    assert len({r["ledger_dir"] for r in results}) == 3
+    assert len(run_store(tmp_path)) == 12
+
+    *_, summary = replay_decisions(tmp_path)
+    assert summary["ok"] is True and summary["replayed"] == 12
+
+
+@pytest.mark.parametrize("key", ["sector_label", "run_id"])
+def test_gate_run_ids_regenerate_from_the_sharded_ledger(tmp_path, monkeypatch, key):
+    monkeypatch.setenv("EPGS_LEDGER_SHARDS", "2")
+    monkeypatch.setenv("EPGS_LEDGER_SHARD_KEY", key)
+    results = [
+        run_scenario("src/epgs/scenarios/S-STABLE-SAFE.json", output_root=str(tmp_path))
+        for _ in range(4)
+    ]
+
+    blocks = list(iter_merged(tmp_path / "ledger"))
+    assert len(blocks) == 4
+    assert max(b["shard_seq"] for b in blocks) > 0  # some blocks chain past a shard's first
+    for block in blocks:
+        assert ids.regenerate(block) == (block["run_id"], block["rblock_id"])
+    assert {r["run_id"] for r in results} == {b["run_id"] for b in blocks}
@@ -0,0 +1,92 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from epgs.main import app
+from epgs.orchestrator.replay import root_hash, verify_chain, verify_many
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIOS = [
+    "src/epgs/scenarios/S-STABLE-SAFE.json",
+    "src/epgs/scenarios/S-CAUTION-ASSIST.json",
+    "src/epgs/scenarios/S-NRRP-TERMINATE.json",
+]
+
+
+def _populate(root, runs=2):
+    for i, scenario in enumerate(SCENARIOS):
+        for k in range(1, runs + 1):
+            run_scenario(scenario, output_root=str(root / f"scenario_{i}_run{k}"))
+
+
+def test_verify_many_streams_ledgers_then_summary(tmp_path):
+    _populate(tmp_path)
+
+    records = list(verify_many(tmp_path, "scenario_*_run*/ledger", workers=2))
+    *ledgers, summary = records
+
+    assert len(ledgers) == 6
+    assert all(r["type"] == "ledger" and r["ok"] for r in ledgers)
+    assert summary["type"] == "summary"
+    assert summary["ok"] is True
+    assert summary["verified"] == 6 and summary["blocks"] == 6
+
+    finals = {
+        r["ledger"]: verify_chain(str(tmp_path / r["ledger"]))["final_hash"]
+        for r in ledgers
+    }
+    assert summary["root_hash"] == root_hash(finals)
+
+    # Independent of worker count and completion order
+    again = list(verify_many(tmp_path, "scenario_*_run*/ledger", workers=5))[-1]
+    assert again["root_hash"] == summary["root_hash"]
+
+
+def test_verify_many_reports_tampered_ledger(tmp_path):
+    _populate(tmp_path, runs=1)
+    block = next((tmp_path / "scenario_1_run1" / "ledger").glob("*.json"))
+    block.write_text(block.read_text().replace("ASSIST", "ALLOW"))
+
+    *ledgers, summary = verify_many(tmp_path, "scenario_*_run*/ledger")
+
+    bad = [r for r in ledgers if not r["ok"]]
+    assert [r["ledger"] for r in bad] == ["scenario_1_run1/ledger"]
+    assert "hash mismatch" in bad[0]["reason"]
+    assert summary["ok"] is False
+    assert summary["failed"] == ["scenario_1_run1/ledger"]
+    assert summary["root_hash"] is None
+
+
+def test_verify_many_reports_unreadable_block(tmp_path):
+    _populate(tmp_path, runs=1)
+    [block] = (tmp_path / "scenario_1_run1" / "ledger").glob("*.json")
+    block.write_text("{truncated", encoding="utf-8")
+
+    *ledgers, summary = verify_many(tmp_path, "scenario_*_run*/ledger")
+    bad = [r for r in ledgers if not r["ok"]]
+    assert bad == [
+        {
+            "type": "ledger",
+            "ledger": "scenario_1_run1/ledger",
+            "ok": False,
+            "reason": "unreadable block",
+        }
+    ]
+    assert summary["ok"] is False and summary["verified"] == 2
+    assert summary["failed"] == ["scenario_1_run1/ledger"]
+
+
+def test_verify_many_endpoint_streams_ndjson(tmp_path):
+    _populate(tmp_path, runs=1)
+    client = TestClient(app)
+
+    r = client.get("/verify_many", params={"root": str(tmp_path), "pattern": "*/ledger"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [x["type"] for x in lines] == ["ledger"] * 3 + ["summary"]
+    assert lines[-1]["ok"] is True
+
+    r = client.get("/verify_many", params={"root": str(tmp_path / "missing")})
+    assert r.status_code == 404
@@ -0,0 +1,121 @@
+import json
+import random
+
+import pytest
+
+from epgs.cli import main as cli_main
+from epgs.modules.neuropause import evaluate_temporal, evaluate_temporal_columns
+from epgs.modules.ube import classify, classify_columns
+from epgs.orchestrator.replay import replay_decisions
+from epgs.orchestrator.run import run_scenario
+from epgs.profiles.base import BaseProfile
+from epgs.scenarios.columnar import (
+    columnar_to_json,
+    json_to_columnar,
+    open_columnar,
+    read_header,
+    write_columnar,
+)
+from epgs.scenarios.generate import GeneratorConfig, make_scenario
+from epgs.scenarios.load import VALIDATED, load_scenario, validate_file
+from epgs.scenarios.schema import Scenario
+
+
+SCENARIO = "src/epgs/scenarios/S-MIDSTOP-DEGRADE.json"
+
+CONFIG = GeneratorConfig(
+    seed=7,
+    steps=1000,
+    jitter_rate=0.2,
+    ube_profiles={"stable": 1, "caution": 1, "degrading": 1, "collapse": 1},
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    VALIDATED.clear()
+    yield
+    VALIDATED.clear()
+
+
+def test_json_round_trip_is_lossless(tmp_path):
+    for src in (json.loads(open(SCENARIO).read()), make_scenario(CONFIG, 0)):
+        src = {**src, "tampered": True}
+        (tmp_path / "in.json").write_text(json.dumps(src))
+
+        json_to_columnar(tmp_path / "in.json", tmp_path / "s.epgsc")
+        columnar_to_json(tmp_path / "s.epgsc", tmp_path / "out.json")
+
+        assert json.loads((tmp_path / "out.json").read_text()) == src
+
+
+def test_invalid_json_is_not_converted(tmp_path):
+    (tmp_path / "bad.json").write_text(json.dumps({"scenario_id": "S-X"}))
+    with pytest.raises(Exception):
+        json_to_columnar(tmp_path / "bad.json", tmp_path / "bad.epgsc")
+    assert not (tmp_path / "bad.epgsc").exists()
+
+
+def test_load_scenario_detects_the_format(tmp_path):
+    path = json_to_columnar(SCENARIO, tmp_path / "s.epgsc")
+    assert load_scenario(path) == load_scenario(SCENARIO)
+    assert validate_file(path) == load_scenario(SCENARIO)
+
+
+def test_columns_are_mapped_in_place(tmp_path):
+    data = make_scenario(CONFIG, 1)
+    path = write_columnar(data, tmp_path / "s.epgsc")
+
+    header = read_header(path)
+    assert header["rows"] == {"temporal": 1000, "ube": len(data["ube_vectors"])}
+
+    with open_columnar(path) as cs:
+        t = cs.temporal
+        assert isinstance(t.stable_ms, memoryview)
+        assert t.stable_ms.tolist() == [s["stable_ms"] for s in data["temporal"]]
+        assert cs.ube.phi.tolist() == [v["phi"] for v in data["ube_vectors"]]
+
+    with pytest.raises(ValueError):
+        len(t.stable_ms)  # released on close
+
+
+def test_column_stages_match_the_model_stages(tmp_path):
+    profile = BaseProfile()
+    rng = random.Random(3)
+
+    for i in range(40):
+        config = GeneratorConfig(seed=i, steps=rng.choice([1, 5, 60]), jitter_rate=0.3)
+        data = make_scenario(config, i)
+        if i % 2:
+            rng.shuffle(data["temporal"])  # unsorted step_index
+        model = Scenario.model_validate(data)
+        path = write_columnar(data, tmp_path / f"{i}.epgsc")
+
+        with open_columnar(path) as cs:
+            assert evaluate_temporal_columns(*cs.temporal) == evaluate_temporal(model.temporal)
+            assert classify_columns(*cs.ube[1:], profile) == [
+                classify(v, profile).stability_class for v in model.ube_vectors
+            ]
+
+
+def test_run_scenario_on_columnar_matches_json(tmp_path):
+    path = json_to_columnar(SCENARIO, tmp_path / "S-MIDSTOP-DEGRADE.epgsc")
+
+    a = run_scenario(SCENARIO, output_root=str(tmp_path / "a"))
+    b = run_scenario(str(path), output_root=str(tmp_path / "b"))
+    for key in ("permission", "stop_issued", "terminal_stop", "final_state"):
+        assert a[key] == b[key]
+    # Both formats record the same logical scenario
+    assert a["input_hash"] == b["input_hash"]
+    assert a["execution_hash"] == b["execution_hash"]
+
+    *_, summary = replay_decisions(tmp_path / "b")
+    assert summary["ok"] is True and summary["replayed"] == 1
+
+
+def test_cli_convert(tmp_path, capsys):
+    dst = tmp_path / "s.epgsc"
+    assert cli_main(["convert", SCENARIO, str(dst)]) == 0
+    assert cli_main(["convert", str(dst), str(tmp_path / "back.json")]) == 0
+    assert json.loads((tmp_path / "back.json").read_text()) == json.loads(open(SCENARIO).read())
+    assert cli_main(["convert", SCENARIO, str(tmp_path / "x.bin")]) == 2
@@ -0,0 +1,115 @@
+import json
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from epgs.core.deadline import Deadline
+from epgs.core.metrics import DEADLINES_EXCEEDED
+from epgs.main import app
+from epgs.orchestrator import run as run_module
+from epgs.orchestrator.replay import replay_decisions, verify_chain
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIO = "src/epgs/scenarios/S-STABLE-SAFE.json"
+
+
+class StepClock:
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def _block(result):
+    [f] = Path(result["ledger_dir"]).glob("*.json")
+    return json.loads(f.read_text())
+
+
+def test_deadline_accounts_per_stage_and_latches():
+    d = Deadline(25, clock=StepClock(0.010))  # every clock read is 10ms later
+    assert d.check("a") is True
+    assert d.check("b") is True
+    assert d.check("c") is False
+    assert d.check("d") is False
+    assert d.exceeded_at == "c"
+
+    report = d.report()
+    assert report["stages"]["a"] == {"ms": 10.0, "share": 0.4}
+    assert set(report["stages"]) == {"a", "b", "c", "d"}
+
+    unlimited = Deadline()
+    assert unlimited.check("a") is True and unlimited.report() is None
+
+
+def test_within_budget_runs_normally_and_reports_stages(tmp_path):
+    result = run_scenario(SCENARIO, output_root=str(tmp_path), deadline_ms=60_000)
+
+    assert result["final_state"] == "EXECUTED"
+    assert "reason_code" not in result
+    report = result["deadline"]
+    assert report["exceeded"] is False
+    assert list(report["stages"]) == [
+        "load",
+        "input_store",
+        "decision",
+        "ledger_reset",
+        "ledger_write",
+    ]
+    assert "reason_code" not in _block(result)
+
+
+def test_overrun_fails_closed_with_reason_in_ledger(tmp_path, monkeypatch):
+    skew = [0.0]
+    real = run_module.decide_input
+
+    def slow(*args):
+        skew[0] += 1.0  # the decision "takes" a second
+        return real(*args)
+
+    monkeypatch.setattr(run_module, "decide_input", slow)
+    monkeypatch.setattr(
+        run_module,
+        "Deadline",
+        lambda budget: Deadline(budget, clock=lambda: time.monotonic() + skew[0]),
+    )
+    before = DEADLINES_EXCEEDED.value("decision")
+
+    result = run_scenario(SCENARIO, output_root=str(tmp_path), deadline_ms=500)
+
+    assert result["permission"] == "BLOCK"
+    assert result["final_state"] == "TERMINATED"
+    assert result["terminal_stop"] is True
+    assert result["reason_code"] == "DEADLINE_EXCEEDED"
+    assert result["deadline"]["exceeded_at"] == "decision"
+    assert DEADLINES_EXCEEDED.value("decision") == before + 1
+
+    block = _block(result)
+    assert block["reason_code"] == "DEADLINE_EXCEEDED"
+    assert block["deadline"] == {"budget_ms": 500, "stage": "decision"}
+    assert block["decision_hash"] is None
+    assert verify_chain(result["ledger_dir"])["ok"] is True
+
+    # Replay counts it instead of reporting a divergence
+    [summary] = list(replay_decisions(tmp_path))
+    assert summary["failed_closed"] == 1 and summary["ok"] is True
+
+
+def test_zero_budget_over_http(tmp_path):
+    client = TestClient(app)
+    r = client.post(
+        "/run",
+        json={"scenario_path": SCENARIO, "output_root": str(tmp_path), "deadline_ms": 0},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert body["final_state"] == "TERMINATED"
+    assert body["reason_code"] == "DEADLINE_EXCEEDED"
+    assert body["deadline"]["exceeded_at"] == "load"
+
+    r = client.post("/run", json={"scenario_path": SCENARIO, "deadline_ms": -1})
+    assert r.status_code == 422
@@ -0,0 +1,90 @@
+import json
+
+from epgs.core.metrics import DECISION_CACHE, DECISION_CACHE_SAVED
+from epgs.orchestrator import decision
+from epgs.orchestrator.decision import DecisionCache, decide_input, decision_key
+from epgs.orchestrator.replay import verify_chain
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIO = "src/epgs/scenarios/S-MIDSTOP-DEGRADE.json"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_returns_cached_decision_and_still_writes_rblock(tmp_path, monkeypatch):
+    cache = DecisionCache()
+    calls = []
+    real = decision.decide
+    monkeypatch.setattr(decision, "decide", lambda s: calls.append(1) or real(s))
+    hits, saved = DECISION_CACHE.value("hit"), DECISION_CACHE_SAVED.value()
+
+    a = run_scenario(SCENARIO, output_root=str(tmp_path), decision_cache=cache)
+    b = run_scenario(SCENARIO, output_root=str(tmp_path), decision_cache=cache)
+
+    assert len(calls) == 1
+    assert (a["decision_cached"], b["decision_cached"]) == (False, True)
+    assert a["decision_hash"] == b["decision_hash"]
+    assert b["final_state"] == a["final_state"] == "TERMINATED"
+    assert a["rblock_id"] != b["rblock_id"]
+
+    [block_file] = (tmp_path / "ledger").glob("*.json")
+    assert json.loads(block_file.read_text())["decision_hash"] == b["decision_hash"]
+    assert verify_chain(str(tmp_path / "ledger"))["ok"] is True
+
+    assert cache.stats()["hit_rate"] == 0.5
+    assert DECISION_CACHE.value("hit") == hits + 1
+    assert DECISION_CACHE_SAVED.value() > saved
+
+
+def test_cached_and_uncached_blocks_are_identical(tmp_path):
+    cache = DecisionCache()
+    run_scenario(SCENARIO, output_root=str(tmp_path / "warm"), decision_cache=cache)
+
+    a = run_scenario(SCENARIO, output_root=str(tmp_path / "a"), seq=0)
+    b = run_scenario(SCENARIO, output_root=str(tmp_path / "b"), seq=0, decision_cache=cache)
+    assert b["decision_cached"] is True
+    assert a["execution_hash"] == b["execution_hash"]
+
+
+def test_key_covers_profile_and_code_version(monkeypatch):
+    key = decision_key("a" * 64)
+    monkeypatch.setattr(decision, "PROFILE_VERSION", "999")
+    assert decision_key("a" * 64) != key
+
+    monkeypatch.undo()
+    monkeypatch.setattr(decision, "code_version", lambda: "other")
+    assert decision_key("a" * 64) != key
+
+
+def test_lru_ttl_and_size_bound():
+    clock = FakeClock()
+    cache = DecisionCache(maxsize=2, ttl=10, clock=clock)
+    scenario = {"scenario": "S-STABLE-SAFE"}
+
+    for h in ("a", "b"):
+        decide_input({**scenario, "h": h}, h * 64, cache)
+    decide_input(scenario, "a" * 64, cache)          # touch a
+    decide_input(scenario, "c" * 64, cache)          # evicts b
+    assert len(cache) == 2
+    assert decide_input(scenario, "a" * 64, cache)[2] is True
+    assert decide_input(scenario, "b" * 64, cache)[2] is False
+
+    clock.now = 11
+    assert decide_input(scenario, "a" * 64, cache)[2] is False
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("EPGS_DECISION_CACHE", raising=False)
+    assert DecisionCache.from_env() is None
+
+    monkeypatch.setenv("EPGS_DECISION_CACHE", "16")
+    monkeypatch.setenv("EPGS_DECISION_CACHE_TTL", "2.5")
+    cache = DecisionCache.from_env()
+    assert (cache.maxsize, cache.ttl) == (16, 2.5)
@@ -0,0 +1,72 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from epgs.core.ids import SequenceAllocator, mint, regenerate
+from epgs.orchestrator.replay import GENESIS_HASH
+from epgs.orchestrator.run import run_scenario
+
+
+SCENARIO = "src/epgs/scenarios/S-STABLE-SAFE.json"
+
+
+def test_mint_is_a_pure_function_of_scenario_seq_and_head():
+    assert mint("S-A", 0, GENESIS_HASH) == mint("S-A", 0, GENESIS_HASH)
+
+    variants = {
+        mint("S-A", 0, GENESIS_HASH),
+        mint("S-A", 1, GENESIS_HASH),
+        mint("S-B", 0, GENESIS_HASH),
+        mint("S-A", 0, "f" * 64),
+    }
+    assert len(variants) == 4
+    run_id, rblock_id = mint("S-A", 0, GENESIS_HASH)
+    assert run_id != rblock_id
+
+
+def test_repeated_runs_get_fresh_ids_regenerable_from_the_ledger(tmp_path):
+    seen = set()
+    for expected_seq in range(3):
+        result = run_scenario(SCENARIO, output_root=str(tmp_path))
+        assert result["seq"] == expected_seq
+        assert result["rblock_id"] not in seen
+        seen.add(result["rblock_id"])
+
+        [block_file] = Path(result["ledger_dir"]).glob("*.json")
+        block = json.loads(block_file.read_text())
+        assert block["seq"] == expected_seq
+        assert regenerate(block) == (block["run_id"], block["rblock_id"])
+
+    assert SequenceAllocator(tmp_path).peek("S-STABLE-SAFE") == 3
+
+
+def test_fresh_roots_and_explicit_seq_are_deterministic(tmp_path):
+    a = run_scenario(SCENARIO, output_root=str(tmp_path / "a"))
+    b = run_scenario(SCENARIO, output_root=str(tmp_path / "b"))
+    assert a["rblock_id"] == b["rblock_id"]
+
+    # An explicit seq does not touch the counter
+    c = run_scenario(SCENARIO, output_root=str(tmp_path / "a"), seq=0)
+    assert c["execution_hash"] == a["execution_hash"]
+    assert SequenceAllocator(tmp_path / "a").peek("S-STABLE-SAFE") == 1
+
+
+def _reserve_many(root):
+    alloc = SequenceAllocator(root)
+    return [list(alloc.reserve("S-STABLE-SAFE", 10)) for _ in range(25)]
+
+
+def test_reserved_ranges_never_overlap_across_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        batches = list(pool.map(_reserve_many, [str(tmp_path)] * 4))
+
+    numbers = [n for ranges in batches for r in ranges for n in r]
+    assert sorted(numbers) == list(range(4 * 25 * 10))
+
+
+def test_unsafe_scenario_names_get_distinct_counter_files(tmp_path):
+    alloc = SequenceAllocator(tmp_path)
+    assert alloc.path("S/A") != alloc.path("S_A")
+    assert alloc.reserve("S/A", 5) == range(0, 5)
+    assert alloc.reserve("S_A", 2) == range(0, 2)
+    assert alloc.reserve("S/A", 1) == range(5, 6)
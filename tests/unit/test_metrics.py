@@ -0,0 +1,86 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from epgs.core import metrics
+from epgs.core.metrics import Counter, Histogram, _bucket_index, _bucket_upper, stage_clock
+from epgs.main import app
+from epgs.orchestrator.run import run_scenario
+
+
+def test_buckets_bound_their_values_within_precision():
+    for v in [0, 1, 31, 32, 33, 1000, 123_456, 10**9, 2**40 + 7]:
+        upper = _bucket_upper(_bucket_index(v))
+        assert v <= upper
+        assert upper - v <= max(1, v // 16)
+
+
+def test_histogram_percentiles_and_render():
+    h = Histogram("t_seconds", "test", ("stage",))
+    child = h.labels("load")
+    for us in range(1, 101):
+        child.observe_ns(us * 1000)
+
+    assert 48_000 <= child.percentile(0.5) <= 54_000
+    assert 97_000 <= child.percentile(0.99) <= 104_000
+
+    text = "\n".join(h.render())
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{stage="load",le="+Inf"} 100' in text
+    # Bucket edges are approximate (~6%): 10us itself may land above le=1e-05
+    assert ('t_seconds_bucket{stage="load",le="1e-05"} 9' in text
+            or 't_seconds_bucket{stage="load",le="1e-05"} 10' in text)
+    assert 't_seconds_count{stage="load"} 100' in text
+
+
+def test_disabled_metrics_record_nothing():
+    c = Counter("t_total", "test")
+    metrics.set_enabled(False)
+    try:
+        c.inc()
+    finally:
+        metrics.set_enabled(True)
+    c.inc()
+    assert c.value() == 1
+
+
+def test_run_scenario_updates_gate_metrics(tmp_path):
+    before = metrics.DECISIONS.value("ASSIST", "EXECUTED")
+    written = metrics.LEDGER_BYTES.value()
+
+    run_scenario("src/epgs/scenarios/S-CAUTION-ASSIST.json", output_root=str(tmp_path))
+
+    assert metrics.DECISIONS.value("ASSIST", "EXECUTED") == before + 1
+    assert metrics.LEDGER_BYTES.value() > written
+    assert metrics.STAGE_SECONDS.labels("ledger_write").count >= 1
+
+
+def test_metrics_endpoint_serves_prometheus_text(tmp_path):
+    run_scenario("src/epgs/scenarios/S-STABLE-SAFE.json", output_root=str(tmp_path))
+
+    r = TestClient(app).get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'epgs_decisions_total{permission="ALLOW",final_state="EXECUTED"}' in r.text
+    assert 'epgs_stage_seconds_bucket{stage="total",le="+Inf"}' in r.text
+
+
+def test_instrumentation_overhead_per_decision_is_small():
+    h = Histogram("o_seconds", "test", ("stage",))
+    marks = [h.labels(str(i)) for i in range(5)]
+    total = h.labels("total")
+    c = Counter("o_total", "test", ("permission", "final_state"))
+
+    n = 20_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        clock = stage_clock()
+        for child in marks:
+            clock.mark(child)
+        clock.total(total)
+        c.inc("ALLOW", "EXECUTED")
+    per_decision_us = (time.perf_counter() - t0) / n * 1e6
+
+    assert total.count == n
+    # A few microseconds on typical hardware; generous bound for slow CI
+    assert per_decision_us < 25
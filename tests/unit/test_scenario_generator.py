@@ -0,0 +1,85 @@
+import io
+
+import pytest
+
+from epgs.core.types import Readiness, StabilityClass
+from epgs.modules.neuropause import evaluate_temporal
+from epgs.modules.ube import classify
+from epgs.profiles.base import BaseProfile
+from epgs.scenarios.generate import (
+    GeneratorConfig,
+    generate,
+    generate_scenarios,
+    iter_stream,
+    write_stream,
+)
+
+
+MIXED = GeneratorConfig(
+    seed=7,
+    requests=3,
+    steps=12,
+    jitter_rate=0.2,
+    ube_profiles={"stable": 1, "caution": 1, "degrading": 1, "collapse": 1},
+    sector_mix={"ENERGY": 1, "ROBOTICS": 1},
+)
+
+
+def test_same_seed_same_corpus_and_slices_are_independent():
+    a = list(generate(MIXED, 20))
+    b = list(generate(MIXED, 20))
+    assert a == b
+    assert list(generate(MIXED, 5, start=10)) == a[10:15]
+
+    other = GeneratorConfig(seed=8, steps=12)
+    assert list(generate(other, 20)) != a
+
+
+def test_generated_scenarios_are_schema_valid():
+    scenarios = list(generate_scenarios(MIXED, 50))
+    assert len(scenarios) == 50
+    for s in scenarios:
+        assert len(s.requests) == 3
+        assert len(s.temporal) == len(s.ube_vectors) == 12
+        assert s.sector_label in ("ENERGY", "ROBOTICS")
+        assert all(r.sector_label == s.sector_label for r in s.requests)
+
+
+def test_governance_tag_matches_module_outcome():
+    profile = BaseProfile()
+    for s in generate_scenarios(MIXED, 200):
+        ready = evaluate_temporal(s.temporal).readiness == Readiness.READY
+        classes = [classify(v, profile).stability_class for v in s.ube_vectors]
+
+        if not ready:
+            assert s.scenario_id.endswith("FAST-NOTREADY")
+        elif s.scenario_id.endswith("STABLE-SAFE"):
+            assert set(classes) == {StabilityClass.SAFE}
+        elif s.scenario_id.endswith("CAUTION-ASSIST"):
+            assert set(classes) == {StabilityClass.CAUTION}
+        elif s.scenario_id.endswith("MIDSTOP-DEGRADE"):
+            assert classes[0] == StabilityClass.SAFE
+            assert classes[-1] == StabilityClass.UNSAFE
+        else:
+            assert s.scenario_id.endswith("NRRP-TERMINATE")
+            assert set(classes) == {StabilityClass.UNSAFE}
+
+
+def test_stream_roundtrip(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        assert write_stream(MIXED, 25, f) == 25
+    assert list(iter_stream(path)) == list(generate(MIXED, 25))
+
+    buf = io.StringIO()
+    write_stream(MIXED, 2, buf, start=3)
+    assert buf.getvalue().count("\n") == 2
+
+
+def test_invalid_config_rejected():
+    with pytest.raises(ValueError):
+        GeneratorConfig(ube_profiles={"wobbly": 1})
+    with pytest.raises(ValueError):
+        GeneratorConfig(sector_mix={"MARINE": 1})
+    with pytest.raises(ValueError):
+        GeneratorConfig(jitter_rate=1.5)
@@ -0,0 +1,165 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from epgs.main import app
+from epgs.scenarios import load
+from epgs.ledger.inputs import InputStore
+from epgs.orchestrator.run import run_scenario
+from epgs.scenarios.load import (
+    VALIDATED,
+    content_hash,
+    load_scenario,
+    load_source,
+    load_trusted,
+    validate_file,
+    validate_scenario,
+)
+from epgs.scenarios.schema import Scenario
+
+
+SCENARIO = "src/epgs/scenarios/S-CAUTION-ASSIST.json"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    VALIDATED.clear()
+    yield
+    VALIDATED.clear()
+
+
+def test_content_is_validated_once(monkeypatch):
+    calls = []
+    real = Scenario.model_validate_json
+    monkeypatch.setattr(
+        load.Scenario, "model_validate_json", lambda raw: calls.append(1) or real(raw)
+    )
+
+    a = load_scenario(SCENARIO)
+    b = load_scenario(SCENARIO)
+    assert a is b
+    assert len(calls) == 1
+    assert VALIDATED.hits == 1
+
+
+def test_invalid_content_is_rejected_and_not_cached(tmp_path):
+    bad = json.loads(open(SCENARIO).read())
+    bad["ube_vectors"][0]["phi"] = 1.5
+    raw = json.dumps(bad).encode()
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            validate_scenario(raw)
+    assert content_hash(raw) not in VALIDATED
+
+
+def test_trusted_hit_skips_reading_the_file(tmp_path):
+    path = tmp_path / "s.json"
+    path.write_bytes(open(SCENARIO, "rb").read())
+    sha = content_hash(path.read_bytes())
+
+    first = load_trusted(path, sha)
+    path.unlink()  # a hit must not touch the file
+    assert load_scenario(path, sha256=sha) is first
+
+
+def test_trusted_miss_checks_the_recorded_hash(tmp_path):
+    path = tmp_path / "s.json"
+    path.write_bytes(open(SCENARIO, "rb").read())
+
+    with pytest.raises(ValueError, match="does not match"):
+        load_trusted(path, "0" * 64)
+    assert len(VALIDATED) == 0
+
+
+def test_cache_is_bounded_lru():
+    cache = load.ValidationCache(maxsize=2)
+    s = load_scenario(SCENARIO)
+    cache.put("a", s)
+    cache.put("b", s)
+    cache.get("a")
+    cache.put("c", s)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+
+def test_validate_file_follows_path_indirection(tmp_path):
+    ref = tmp_path / "ref.json"
+    ref.write_text(json.dumps({"path": str((tmp_path / "..").resolve() / "missing.json")}))
+    with pytest.raises(FileNotFoundError):
+        validate_file(ref)
+
+    target = tmp_path / "target.json"
+    target.write_bytes(open(SCENARIO, "rb").read())
+    ref.write_text(json.dumps({"path": "target.json"}))
+    assert validate_file(ref).scenario_id == "S-CAUTION-ASSIST"
+
+
+def test_api_rejects_invalid_scenarios_with_422(tmp_path):
+    bad = json.loads(open(SCENARIO).read())
+    bad["sector_label"] = "MOON"
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps(bad))
+
+    r = TestClient(app).post(
+        "/run", json={"scenario_path": str(path), "output_root": str(tmp_path)}
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["sector_label"]
+    assert not (tmp_path / "ledger").exists()
+
+
+def test_api_rejects_undecodable_scenarios_with_422(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"scenario": ')
+
+    r = TestClient(app).post(
+        "/run", json={"scenario_path": str(path), "output_root": str(tmp_path)}
+    )
+    assert r.status_code == 422
+    assert not (tmp_path / "ledger").exists()
+
+
+def test_run_decides_on_the_validated_content(tmp_path):
+    path = tmp_path / "s.json"
+    path.write_bytes(open(SCENARIO, "rb").read())
+    loaded = load_source(path)
+
+    # Swapped after validation: the run must not pick this up
+    swapped = json.loads(path.read_text())
+    swapped["tampered"] = True
+    path.write_text(json.dumps(swapped))
+
+    result = run_scenario(str(path), output_root=str(tmp_path / "out"), source=loaded.source)
+    stored = InputStore(tmp_path / "out" / "inputs").get(result["input_hash"])
+    assert "tampered" not in stored
+    assert result["neuro_pause"] is False
+
+
+def test_api_validates_the_indirection_target(tmp_path):
+    bad = json.loads(open(SCENARIO).read())
+    bad["ube_vectors"][0]["phi"] = 1.5
+    (tmp_path / "target.json").write_text(json.dumps(bad))
+    (tmp_path / "ref.json").write_text(json.dumps({"path": "target.json"}))
+
+    r = TestClient(app).post(
+        "/run", json={"scenario_path": str(tmp_path / "ref.json"), "output_root": str(tmp_path)}
+    )
+    assert r.status_code == 422
+    assert not (tmp_path / "ledger").exists()
+
+
+def test_api_pinned_content_hash(tmp_path):
+    path = tmp_path / "s.json"
+    path.write_bytes(open(SCENARIO, "rb").read())
+    sha = content_hash(path.read_bytes())
+    client = TestClient(app)
+    body = {"scenario_path": str(path), "output_root": str(tmp_path / "out")}
+
+    r = client.post("/run", json={**body, "scenario_sha256": "0" * 64})
+    assert r.status_code == 409
+    assert not (tmp_path / "out" / "ledger").exists()
+
+    r = client.post("/run", json={**body, "scenario_sha256": sha})
+    assert r.status_code == 200 and r.json()["permission"] == "ASSIST"
@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from epgs.core.crypto import chained_hash
+from epgs.ledger.segments import (
+    archive_ledger,
+    read_block,
+    seal_segment,
+    train_dictionary,
+    verify_segments,
+)
+from epgs.orchestrator.replay import GENESIS_HASH, verify_chain
+
+
+def _write_ledger(ledger_dir, n):
+    ledger_dir.mkdir(parents=True)
+    prev = GENESIS_HASH
+    for i in range(n):
+        payload = {
+            "scenario": "S-STABLE-SAFE",
+            "rblock_id": f"{i:08x}-0000-0000-0000-000000000000",
+            "permission": "ALLOW",
+            "stop_issued": False,
+            "final_state": "EXECUTED",
+            "step": i,
+        }
+        h = chained_hash(payload, prev)
+        block = {**payload, "previous_hash": prev, "rblock_hash": h}
+        (ledger_dir / f"{payload['rblock_id']}.json").write_text(
+            json.dumps(block, sort_keys=True, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        prev = h
+    return prev
+
+
+@pytest.mark.parametrize("codec,train", [("zlib", False), ("zlib", True), ("lzma", False)])
+def test_archive_roundtrip_and_random_access(tmp_path, codec, train):
+    ledger = tmp_path / "ledger"
+    final = _write_ledger(ledger, 25)
+
+    res = archive_ledger(ledger, tmp_path / "archive", segment_size=10, codec=codec, train=train)
+    assert res["ok"] is True
+    assert res["segments"] == ["segment-000000", "segment-000001", "segment-000002"]
+
+    for deep in (False, True):
+        v = verify_segments(tmp_path / "archive", deep=deep)
+        assert v == {"ok": True, "final_hash": final, "count": 25, "segments": 3}
+
+    rb = read_block(tmp_path / "archive", "segment-000001", 3)
+    assert rb["step"] == 13
+    assert rb == json.loads(sorted(ledger.glob("*.json"))[13].read_text(encoding="utf-8"))
+
+
+def test_trained_dictionary_shrinks_segments(tmp_path):
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 50)
+    samples = [f.read_bytes() for f in sorted(ledger.glob("*.json"))]
+
+    zdict = train_dictionary(samples)
+    assert b'"permission":' in zdict
+
+    plain = archive_ledger(ledger, tmp_path / "plain")
+    trained = archive_ledger(ledger, tmp_path / "trained", zdict=zdict)
+    assert plain["ok"] and trained["ok"]
+
+    size = lambda d: sum(f.stat().st_size for f in d.glob("*.seg"))  # noqa: E731
+    assert size(tmp_path / "trained") < size(tmp_path / "plain")
+
+
+def test_remove_keeps_only_sealed_segments(tmp_path):
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 5)
+
+    res = archive_ledger(ledger, tmp_path / "archive", remove=True)
+    assert res["ok"] is True
+    assert not list(ledger.glob("*.json"))
+    assert verify_chain(str(ledger))["ok"] is False
+    assert verify_segments(tmp_path / "archive", deep=True)["ok"] is True
+
+
+def test_tampered_segment_fails_shallow_verify(tmp_path):
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 4)
+    archive = tmp_path / "archive"
+    archive_ledger(ledger, archive, segment_size=2)
+
+    seg = archive / "segment-000001.seg"
+    data = bytearray(seg.read_bytes())
+    data[0] ^= 0xFF
+    seg.write_bytes(bytes(data))
+
+    v = verify_segments(archive)
+    assert v["ok"] is False
+    assert "segment checksum mismatch" in v["reason"]
+
+
+def test_broken_manifest_link_detected(tmp_path):
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 4)
+    archive = tmp_path / "archive"
+    archive_ledger(ledger, archive, segment_size=2)
+
+    path = archive / "segment-000001.manifest.json"
+    m = json.loads(path.read_text(encoding="utf-8"))
+    m["first_previous_hash"] = GENESIS_HASH
+    path.write_text(json.dumps(m), encoding="utf-8")
+
+    v = verify_segments(archive)
+    assert v["ok"] is False
+    assert "previous_hash mismatch in segment-000001" in v["reason"]
+
+
+def test_broken_chain_seals_nothing(tmp_path):
+    ledger = tmp_path / "ledger"
+    _write_ledger(ledger, 4)
+    files = sorted(ledger.glob("*.json"))
+    block = json.loads(files[2].read_text(encoding="utf-8"))
+    block["permission"] = "BLOCK"
+    files[2].write_text(json.dumps(block), encoding="utf-8")
+
+    archive = tmp_path / "archive"
+    with pytest.raises(ValueError, match="broken chain"):
+        seal_segment(files, archive, name="segment-000000")
+    assert list(archive.iterdir()) == []
+
+    files[2].write_text("{truncated", encoding="utf-8")
+    with pytest.raises(ValueError, match="unreadable block"):
+        seal_segment(files, archive, name="segment-000000")
+    assert list(archive.iterdir()) == []